@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.config import get_settings
@@ -19,6 +19,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -99,6 +100,15 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_or_token_param(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    token: Optional[str] = Query(None, description="Access token, for URLs loaded without headers (<img src>)"),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get the current user from the Authorization header or a ?token= query parameter."""
+    return await get_current_user(header_token or token or "", db)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
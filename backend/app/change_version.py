@@ -0,0 +1,58 @@
+"""
+Per-match change versions and conditional GETs.
+
+Every write to a match's tracking, event or correction data increments
+matches.data_version in the same transaction, so the version a reader sees
+always matches the data it reads. Frame, track and event listings derive
+their ETag from the match, its version and the request (path, query and
+response format): a client that sends the ETag back in If-None-Match gets
+304 without the data being queried or serialized while nothing changed.
+
+Imports bump the version as well, in import_events and in
+scripts/track_aggregates.py, which every import runs last. Bodies served
+from the frame payload cache (app/payload_cache.py) are keyed on the same
+version, so a new ETag never comes with a body cached for an older one,
+whichever process made the write.
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+# Clients may keep responses but must revalidate them before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def bump_match_version(db: Session, *match_ids: int):
+    """
+    Increment the data version of matches, in the caller's transaction (call
+    before commit). Plain SQL so matches.updated_at is left alone.
+    """
+    if not match_ids:
+        return
+    db.execute(
+        text("UPDATE matches SET data_version = data_version + 1 WHERE id IN :match_ids")
+        .bindparams(bindparam("match_ids", expanding=True)),
+        {"match_ids": sorted(set(match_ids))}
+    )
+
+
+def match_etag(request: Request, match_id: int, version: int, variant: str = "") -> str:
+    """ETag of a response built from a match's data at a version; variant names the response format."""
+    key = f"{request.url.path}?{request.url.query}|{variant}"
+    return f'"m{match_id}-v{version}-{hashlib.sha1(key.encode()).hexdigest()[:16]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match names the ETag (or is *)."""
+    tags = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str, **headers) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**etag_headers(etag), **headers})
@@ -32,6 +32,39 @@ class Settings(BaseSettings):
     # File uploads
     max_upload_size: int = 100 * 1024 * 1024  # 100MB
 
+    # Match videos (Match.video_filename is relative to this directory)
+    video_dir: str = "/Users/Sean/Desktop/Football Tracker"
+
+    # Frame image exports: JPEG encode worker processes (0 = one per CPU core,
+    # 1 = encode in the request thread)
+    export_workers: int = 0
+
+    # Encoded frame images cached across exports (max bytes 0 = no cache)
+    frame_cache_dir: str = "/tmp/football_tracker_frame_cache"
+    frame_cache_max_bytes: int = 20 * 1024 * 1024 * 1024  # 20GB
+
+    # Open video handles kept per video (for at most video_pool_max_videos
+    # videos) and decoded frames kept in memory (max bytes, 0 = none)
+    video_pool_handles: int = 2
+    video_pool_max_videos: int = 8
+    frame_lru_max_bytes: int = 256 * 1024 * 1024  # 256MB
+
+    # Serialized frame / frame window responses kept in memory (max bytes,
+    # 0 = no cache)
+    frame_payload_cache_bytes: int = 64 * 1024 * 1024  # 64MB
+
+    # Background export jobs: archive directory and concurrent jobs
+    export_dir: str = "/tmp/football_tracker_exports"
+    export_job_workers: int = 2
+
+    # Timeline thumbnails: one tile every sprite_interval_seconds, tile width
+    # in pixels, tiles per sheet
+    sprite_dir: str = "/tmp/football_tracker_sprites"
+    sprite_interval_seconds: float = 2.0
+    sprite_tile_width: int = 160
+    sprite_columns: int = 10
+    sprite_rows: int = 10
+
     # Pagination defaults
     default_page_size: int = 50
     max_page_size: int = 500
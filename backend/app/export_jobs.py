@@ -0,0 +1,175 @@
+"""
+Background export jobs.
+
+Large exports are submitted as jobs instead of being built inside the HTTP
+request: a TrainingExport row records the job (status, frames done / total,
+error), a thread pool builds the archive to a file under settings.export_dir,
+and the finished file's path and size are stored on the row for download.
+
+Builders are registered by name (the export router registers "yolo", "all"
+and "yolo_dataset"); a job's export_config holds the builder name, match (or
+matches) and builder arguments, so jobs interrupted by a restart are
+requeued on startup.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.training import TrainingExport, ExportStatus
+
+# Minimum seconds between progress writes to the database
+PROGRESS_INTERVAL = 1.0
+
+# Builder name -> callable(db, match_id(s), **kwargs) returning an archive with
+# total_frames and chunks(progress); see app.routers.export.ExportArchive
+_builders: Dict[str, Callable[..., Any]] = {}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def register_builder(name: str, builder: Callable[..., Any]):
+    _builders[name] = builder
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_settings().export_job_workers,
+                thread_name_prefix="export-job",
+            )
+        return _executor
+
+
+def export_file_path(export_id: int) -> Path:
+    return Path(get_settings().export_dir) / f"training_export_{export_id}.zip"
+
+
+def submit_export_job(db: Session, export: TrainingExport, builder: str,
+                      match_id: Union[int, List[int]], **kwargs) -> TrainingExport:
+    """
+    Queue a job that builds export with the named builder.
+
+    export is a new TrainingExport (not yet added); its export_config is
+    set to the job description. match_id is the builder's first argument, a
+    list of match ids for multi-match builders. Commits and returns it in
+    PENDING state.
+    """
+    if builder not in _builders:
+        raise ValueError(f"Unknown export builder: {builder}")
+
+    export.export_config = {"builder": builder, "match_id": match_id, **kwargs}
+    export.status = ExportStatus.PENDING
+    export.progress_done = 0
+    export.progress_total = 0
+    db.add(export)
+    db.commit()
+    db.refresh(export)
+
+    _get_executor().submit(run_export_job, export.id)
+    return export
+
+
+def _claim(db: Session, export_id: int) -> bool:
+    """Move a job from PENDING to RUNNING; False if another worker has it."""
+    claimed = db.query(TrainingExport).filter(
+        TrainingExport.id == export_id,
+        TrainingExport.status == ExportStatus.PENDING,
+    ).update({TrainingExport.status: ExportStatus.RUNNING}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def run_export_job(export_id: int):
+    """Build one export job's archive to disk, recording progress and the result."""
+    db = SessionLocal()
+    part_path = None
+    try:
+        if not _claim(db, export_id):
+            return
+
+        export = db.query(TrainingExport).filter(TrainingExport.id == export_id).first()
+        config = dict(export.export_config)
+        builder = _builders[config.pop("builder")]
+        archive = builder(db, config.pop("match_id"), **config)
+
+        export.progress_total = archive.total_frames
+        export.frame_count = archive.total_frames
+        db.commit()
+
+        last_write = [time.monotonic()]
+
+        def progress(frames_done: int):
+            now = time.monotonic()
+            if now - last_write[0] >= PROGRESS_INTERVAL:
+                export.progress_done = frames_done
+                db.commit()
+                last_write[0] = now
+
+        path = export_file_path(export_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = path.with_name(path.name + ".part")
+        with open(part_path, "wb") as f:
+            for chunk in archive.chunks(progress):
+                f.write(chunk)
+        os.replace(part_path, path)
+        part_path = None
+
+        export.file_path = str(path)
+        export.file_size_bytes = path.stat().st_size
+        export.progress_done = archive.total_frames
+        export.status = ExportStatus.COMPLETED
+        export.completed_at = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        message = e.detail if isinstance(e, HTTPException) else f"{type(e).__name__}: {e}"
+        db.query(TrainingExport).filter(TrainingExport.id == export_id).update({
+            TrainingExport.status: ExportStatus.FAILED,
+            TrainingExport.error_message: str(message),
+            TrainingExport.completed_at: datetime.utcnow(),
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        if part_path is not None and part_path.exists():
+            part_path.unlink()
+        db.close()
+
+
+def resume_export_jobs():
+    """Requeue jobs left pending or running by a previous server process."""
+    db = SessionLocal()
+    try:
+        jobs = db.query(TrainingExport).filter(
+            TrainingExport.status.in_([ExportStatus.PENDING, ExportStatus.RUNNING])
+        ).order_by(TrainingExport.id).all()
+        for export in jobs:
+            export.status = ExportStatus.PENDING
+            export.progress_done = 0
+        db.commit()
+        for export in jobs:
+            _get_executor().submit(run_export_job, export.id)
+        if jobs:
+            print(f"Requeued {len(jobs)} export job(s)")
+    finally:
+        db.close()
+
+
+def shutdown_export_jobs():
+    """Stop the job threads; unfinished jobs are requeued on the next startup."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
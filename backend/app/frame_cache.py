@@ -0,0 +1,163 @@
+"""
+Persistent on-disk cache of encoded frame images, shared by all exports.
+
+Entries are content-addressed: the file name is a hash of the video's
+identity, the frame number and the encode settings (quality, size, crop),
+so a re-encoded or replaced video, or different settings, never hit stale
+images. Files are grouped in 256 subdirectories by hash prefix.
+
+The cache is bounded by settings.frame_cache_max_bytes. Reads refresh a
+file's mtime, and when the cache grows past the cap the least recently used
+files are deleted until it is back under 90% of it.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.config import get_settings
+
+# Bytes hashed from each end of a video to identify its content
+IDENTITY_SAMPLE_BYTES = 1024 * 1024
+
+# Eviction trims the cache to this fraction of its cap
+EVICT_TO_FRACTION = 0.9
+
+
+# (path, size, mtime) -> identity, so each video is hashed once per process
+_identities: Dict[Tuple[str, int, int], str] = {}
+_identity_lock = threading.Lock()
+
+
+def video_identity(video_path: Path) -> str:
+    """
+    Content identity of a video file: hash of its size and its first and last
+    IDENTITY_SAMPLE_BYTES. Stable across renames and copies, and changes when
+    the file is re-encoded, without reading multi-GB files in full.
+    """
+    video_path = Path(video_path)
+    stat = video_path.stat()
+    cache_key = (str(video_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _identity_lock:
+        if cache_key in _identities:
+            return _identities[cache_key]
+
+    digest = hashlib.sha256(str(stat.st_size).encode())
+    with open(video_path, "rb") as f:
+        digest.update(f.read(IDENTITY_SAMPLE_BYTES))
+        if stat.st_size > IDENTITY_SAMPLE_BYTES:
+            f.seek(max(IDENTITY_SAMPLE_BYTES, stat.st_size - IDENTITY_SAMPLE_BYTES))
+            digest.update(f.read())
+    identity = digest.hexdigest()
+
+    with _identity_lock:
+        _identities[cache_key] = identity
+    return identity
+
+
+class FrameCache:
+    """Size-capped LRU directory of encoded frame images."""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # Bytes on disk, scanned on first write
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(video_id: str, frame_number: int, quality: int,
+            max_size: Optional[int] = None,
+            crop: Optional[Tuple[int, int, int, int]] = None) -> str:
+        parts = f"{video_id}|{frame_number}|q={quality}|max={max_size}|crop={crop}"
+        return hashlib.sha256(parts.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.jpg"
+
+    def contains(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes, or None on a miss (including a file evicted meanwhile)."""
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store an entry atomically (concurrent readers never see partial files)."""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for subdir in self.root.iterdir():
+            if subdir.is_dir():
+                for entry in os.scandir(subdir):
+                    if entry.name.endswith(".jpg"):
+                        yield entry
+
+    def _stats(self):
+        """(mtime, size, path) of every entry; files removed meanwhile are skipped."""
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, stat.st_size, entry.path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._stats())
+
+    def _evict(self):
+        """Delete least recently used entries until under EVICT_TO_FRACTION of the cap."""
+        entries = sorted(self._stats())
+
+        size = sum(e[1] for e in entries)
+        target = self.max_bytes * EVICT_TO_FRACTION
+        for _, file_size, file_path in entries:
+            if size <= target:
+                break
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+        self._size = size
+
+
+_frame_cache: Optional[FrameCache] = None
+_frame_cache_lock = threading.Lock()
+
+
+def get_frame_cache() -> Optional[FrameCache]:
+    """The configured frame cache, or None if disabled (frame_cache_max_bytes = 0)."""
+    global _frame_cache
+    settings = get_settings()
+    if not settings.frame_cache_dir or settings.frame_cache_max_bytes <= 0:
+        return None
+    with _frame_cache_lock:
+        if _frame_cache is None:
+            _frame_cache = FrameCache(Path(settings.frame_cache_dir), settings.frame_cache_max_bytes)
+        return _frame_cache
@@ -0,0 +1,63 @@
+"""
+Frame records.
+
+Frames only exist in the frames table once something is attached to them
+(detections from an import, or a correction adding data to the frame).
+Reading a frame that has no record returns a virtual frame instead: no id,
+the timestamp computed from the match fps and no detections. Scrubbing
+through a video therefore never writes.
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.corrections import CorrectionType
+from app.models.team import Match
+from app.models.tracking import Frame
+
+# Used when a match has no fps
+DEFAULT_FPS = 30.0
+
+# Corrections that attach new data to the frame at their frame_number
+FRAME_DATA_CORRECTIONS = {
+    CorrectionType.DETECTION_ADD,
+    CorrectionType.BALL_ADD,
+    CorrectionType.BALL_POSITION,
+}
+
+
+def frame_timestamp_ms(match: Match, frame_number: int) -> int:
+    fps = float(match.fps) if match.fps else DEFAULT_FPS
+    return int(frame_number * 1000 / fps)
+
+
+def find_frame(db: Session, match_id: int, frame_number: int) -> Optional[Frame]:
+    return db.query(Frame).filter(
+        Frame.match_id == match_id,
+        Frame.frame_number == frame_number
+    ).first()
+
+
+def materialize_frame(db: Session, match: Match, frame_number: int) -> Frame:
+    """
+    The frame record of a match frame, added to the session (not committed)
+    if it does not exist yet.
+    """
+    frame = find_frame(db, match.id, frame_number)
+    if frame is None:
+        frame = Frame(
+            match_id=match.id,
+            frame_number=frame_number,
+            timestamp_ms=frame_timestamp_ms(match, frame_number)
+        )
+        db.add(frame)
+        db.flush()
+    return frame
+
+
+def materialize_correction_frame(db: Session, match: Match, correction_type: CorrectionType,
+                                 frame_number: Optional[int]) -> Optional[Frame]:
+    """Create the frame record a correction attaches data to, if it needs one."""
+    if frame_number is None or correction_type not in FRAME_DATA_CORRECTIONS:
+        return None
+    return materialize_frame(db, match, frame_number)
@@ -15,8 +15,17 @@ except Exception as e:
     EXPORT_ERROR = str(e)
     print(f"Export router not available: {e}")
     EXPORT_AVAILABLE = False
+# Frame image and thumbnail router needs OpenCV as well
+try:
+    from app.routers import frames as frames_router
+    FRAMES_AVAILABLE = True
+except Exception as e:
+    print(f"Frame image router not available: {e}")
+    FRAMES_AVAILABLE = False
 from app.models.user import User, UserRole
+from app.models.training import TrainingExport
 from app.auth import get_password_hash
+from app import export_jobs
 from sqlalchemy import text
 
 settings = get_settings()
@@ -49,6 +58,53 @@ def run_migrations():
             print("Added is_correct column to events table")
         else:
             print("is_correct column already exists")
+
+        # Per-match change version (app/change_version.py)
+        result = db.execute(text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'matches' AND column_name = 'data_version'
+        """))
+        if result.fetchone() is None:
+            db.execute(text("ALTER TABLE matches ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
+            db.commit()
+            print("Added data_version column to matches table")
+
+        # Background export job columns on training_exports
+        TrainingExport.__table__.c.status.type.create(db.connection(), checkfirst=True)
+        for column, ddl in [
+            ("status", "exportstatus"),
+            ("progress_done", "INTEGER NOT NULL DEFAULT 0"),
+            ("progress_total", "INTEGER NOT NULL DEFAULT 0"),
+            ("error_message", "TEXT"),
+            ("completed_at", "TIMESTAMP"),
+        ]:
+            result = db.execute(text("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = 'training_exports' AND column_name = :column
+            """), {"column": column})
+            if result.fetchone() is None:
+                db.execute(text(f"ALTER TABLE training_exports ADD COLUMN {column} {ddl}"))
+                db.commit()
+                print(f"Added {column} column to training_exports table")
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_training_exports_status ON training_exports (status)"))
+
+        # Covering index for detection stats (index-only scans per match)
+        db.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_detection_frame_stats ON detections (frame_id) "
+            "INCLUDE (track_id, ai_detection_class, confidence)"
+        ))
+        db.commit()
+
+        # Export archives can exceed 2GB
+        result = db.execute(text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'training_exports' AND column_name = 'file_size_bytes'
+        """))
+        row = result.fetchone()
+        if row and row[0] == "integer":
+            db.execute(text("ALTER TABLE training_exports ALTER COLUMN file_size_bytes TYPE BIGINT"))
+            print("Changed training_exports.file_size_bytes to BIGINT")
+        db.commit()
     except Exception as e:
         db.rollback()
         print(f"Migration error: {e}")
@@ -102,8 +158,20 @@ async def lifespan(app: FastAPI):
     run_migrations()
     # Create initial admin if needed
     create_initial_admin()
+    # Requeue export jobs interrupted by a restart
+    if EXPORT_AVAILABLE:
+        export_jobs.resume_export_jobs()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop export job and encode workers
+    export_jobs.shutdown_export_jobs()
+    if FRAMES_AVAILABLE:
+        from app.sprites import shutdown_sprite_jobs
+        frames_router.shutdown_prefetch()
+        shutdown_sprite_jobs()
+    if EXPORT_AVAILABLE:
+        from app.video import shutdown_encode_pool, shutdown_video_pool
+        shutdown_encode_pool()
+        shutdown_video_pool()
 
 
 app = FastAPI(
@@ -141,6 +209,9 @@ app.include_router(detections.router, prefix="/api/v1")  # Detection review endp
 if EXPORT_AVAILABLE:
     app.include_router(export_router.router, prefix="/api/v1/export")
 
+if FRAMES_AVAILABLE:
+    app.include_router(frames_router.router, prefix="/api/v1")  # Frame images for review
+
 
 @app.get("/")
 async def root():
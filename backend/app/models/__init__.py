@@ -6,6 +6,7 @@ from app.models.events import Event, EventType, EVENT_TYPES
 from app.models.calibration import PitchCalibration, CalibrationPoint
 from app.models.corrections import Correction, CorrectionType
 from app.models.training import TrainingExport, AccuracyMetric
+from app.models.imports import ImportCheckpoint, ImportTrackProgress
 
 __all__ = [
     "User",
@@ -26,4 +27,6 @@ __all__ = [
     "CorrectionType",
     "TrainingExport",
     "AccuracyMetric",
+    "ImportCheckpoint",
+    "ImportTrackProgress",
 ]
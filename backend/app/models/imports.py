@@ -0,0 +1,69 @@
+"""Import bookkeeping models - checkpoints for resumable tracker imports."""
+from datetime import datetime
+from sqlalchemy import (
+    Column, Integer, String, Float, Boolean, DateTime, BigInteger,
+    ForeignKey, JSON, Index
+)
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class ImportCheckpoint(Base):
+    """Progress of a tracker_v2 import, committed together with each batch of data."""
+    __tablename__ = "import_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    match_id = Column(Integer, ForeignKey("matches.id"), nullable=False, index=True)
+
+    # Source file identity
+    source_path = Column(String(1000), nullable=False, index=True)
+    source_size = Column(BigInteger, nullable=True)
+    source_mtime = Column(Float, nullable=True)
+
+    # Sections fully imported, e.g. ["tracks", "detections", "events", "ball_positions", "calibration"]
+    completed_sections = Column(JSON, nullable=False, default=list)
+
+    # Items of the flat arrays already committed
+    events_done = Column(Integer, default=0, nullable=False)
+    ball_positions_done = Column(Integer, default=0, nullable=False)
+
+    is_complete = Column(Boolean, default=False, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    match = relationship("Match", back_populates="import_checkpoints")
+    track_progress = relationship("ImportTrackProgress", back_populates="checkpoint", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<ImportCheckpoint {self.source_path} -> match {self.match_id}>"
+
+
+class ImportTrackProgress(Base):
+    """
+    Committed progress of one track of a checkpointed import. One row per
+    track, so recording a batch updates a single row whatever the match size.
+    """
+    __tablename__ = "import_track_progress"
+
+    id = Column(Integer, primary_key=True, index=True)
+    checkpoint_id = Column(Integer, ForeignKey("import_checkpoints.id"), nullable=False)
+    tracker_track_id = Column(String(100), nullable=False)  # tracker_v2 track_id, as a string
+    track_id = Column(Integer, ForeignKey("tracks.id"), nullable=False)
+
+    # The first `points` points of the track are in the database
+    points = Column(Integer, default=0, nullable=False)
+    last_frame = Column(Integer, nullable=True)
+    is_complete = Column(Boolean, default=False, nullable=False)
+
+    # Relationships
+    checkpoint = relationship("ImportCheckpoint", back_populates="track_progress")
+
+    __table_args__ = (
+        Index("idx_import_track_progress_track", "checkpoint_id", "tracker_track_id", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<ImportTrackProgress {self.tracker_track_id}: {self.points} points>"
@@ -112,6 +112,9 @@ class Match(Base):
     ai_accuracy_tracking = Column(Float, nullable=True)
     ai_accuracy_overall = Column(Float, nullable=True)
 
+    # Bumped on every write to tracking, event or correction data (see app/change_version.py)
+    data_version = Column(Integer, default=0, nullable=False)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -127,6 +130,7 @@ class Match(Base):
     calibration = relationship("PitchCalibration", back_populates="match", uselist=False, cascade="all, delete-orphan")
     corrections = relationship("Correction", back_populates="match", cascade="all, delete-orphan")
     accuracy_metrics = relationship("AccuracyMetric", back_populates="match", cascade="all, delete-orphan")
+    import_checkpoints = relationship("ImportCheckpoint", back_populates="match", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Match {self.home_team_id} vs {self.away_team_id} on {self.match_date}>"
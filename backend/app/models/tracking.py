@@ -170,9 +170,12 @@ class Detection(Base):
     frame = relationship("Frame", back_populates="detections")
     track = relationship("Track", back_populates="detections")
 
-    # Composite index for efficient queries
+    # Composite index for efficient queries; idx_detection_frame_stats covers
+    # the columns of the per-match stats, so they are counted by index-only scans
     __table_args__ = (
         Index("idx_detection_frame_track", "frame_id", "track_id"),
+        Index("idx_detection_frame_stats", "frame_id",
+              postgresql_include=["track_id", "ai_detection_class", "confidence"]),
     )
 
     def __repr__(self):
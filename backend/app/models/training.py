@@ -1,7 +1,7 @@
 """Training and accuracy tracking models."""
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Float, Boolean, DateTime,
+    Column, Integer, BigInteger, String, Float, Boolean, DateTime,
     ForeignKey, Enum, Text, JSON
 )
 from sqlalchemy.orm import relationship
@@ -29,6 +29,14 @@ class ExportType(str, enum.Enum):
     ALL = "all"  # Everything
 
 
+class ExportStatus(str, enum.Enum):
+    """State of a background export job."""
+    PENDING = "pending"  # Queued
+    RUNNING = "running"  # Archive being written
+    COMPLETED = "completed"  # File ready for download
+    FAILED = "failed"  # See error_message
+
+
 class TrainingExport(Base):
     """Record of a training data export."""
     __tablename__ = "training_exports"
@@ -51,7 +59,14 @@ class TrainingExport(Base):
 
     # Export file info
     file_path = Column(String(500), nullable=True)
-    file_size_bytes = Column(Integer, nullable=True)
+    file_size_bytes = Column(BigInteger, nullable=True)
+
+    # Background job state (None for exports not built by an export job)
+    status = Column(Enum(ExportStatus), nullable=True, index=True)
+    progress_done = Column(Integer, default=0, nullable=False)  # Frames written
+    progress_total = Column(Integer, default=0, nullable=False)  # Frames to write
+    error_message = Column(Text, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
 
     # Export metadata
     export_config = Column(JSON, nullable=True)  # Full config used
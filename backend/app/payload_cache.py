@@ -0,0 +1,151 @@
+"""
+In-process cache of serialized frame payloads.
+
+Frame and frame window responses (JSON or MessagePack bytes) are kept in an
+LRU bounded by settings.frame_payload_cache_bytes, so frames analysts revisit
+are served without querying or serializing again. Each entry records the
+match and the frame range it covers.
+
+Keys include the match's data_version (app/change_version.py), which every
+write to its tracking, event or correction data increments, so an entry is
+never served for a later version of the match. That holds whichever process
+made the write: imports, scripts/track_aggregates.py, or another worker.
+Entries of older versions are simply no longer requested and age out.
+
+Writes made by this process also invalidate the overlapping entries once
+they are committed (track updates, corrections, detection edits), freeing
+them early. Each match has a generation that every invalidation bumps; a
+payload computed while a write was committed carries the older generation
+and is not stored, so a concurrent reader cannot put stale data back.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.corrections import Correction
+from app.models.tracking import Detection, Frame, Track
+
+CacheKey = Tuple[int, Hashable]  # (match_id, request key)
+
+
+class FramePayloadCache:
+    """Byte-bounded LRU of payloads, invalidated by match and frame range."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[bytes, int, int]]" = OrderedDict()  # payload, first, last frame
+        self._match_keys: Dict[int, Set[CacheKey]] = {}
+        self._generations: Dict[int, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, match_id: int) -> int:
+        """Current generation of a match; pass it to put() with the payload built after reading it."""
+        return self._generations.get(match_id, 0)
+
+    def get(self, match_id: int, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get((match_id, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((match_id, key))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, match_id: int, key: Hashable, payload: bytes, first_frame: int, last_frame: int,
+            generation: int):
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if self._generations.get(match_id, 0) != generation:
+                return
+            cache_key = (match_id, key)
+            self._remove(cache_key)
+            self._entries[cache_key] = (payload, first_frame, last_frame)
+            self._match_keys.setdefault(match_id, set()).add(cache_key)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, cache_key: CacheKey):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+            keys = self._match_keys.get(cache_key[0])
+            keys.discard(cache_key)
+            if not keys:
+                del self._match_keys[cache_key[0]]
+
+    def invalidate(self, match_id: int, first_frame: Optional[int] = None, last_frame: Optional[int] = None):
+        """Drop a match's entries overlapping first_frame..last_frame (all of them if not given)."""
+        with self._lock:
+            self._generations[match_id] = self._generations.get(match_id, 0) + 1
+            for cache_key in list(self._match_keys.get(match_id, ())):
+                _, first, last = self._entries[cache_key]
+                if (first_frame is None or last >= first_frame) and (last_frame is None or first <= last_frame):
+                    self._remove(cache_key)
+
+    def clear(self):
+        with self._lock:
+            for match_id in list(self._match_keys):
+                self._generations[match_id] = self._generations.get(match_id, 0) + 1
+            self._entries.clear()
+            self._match_keys.clear()
+            self._bytes = 0
+
+
+_payload_cache: Optional[FramePayloadCache] = None
+_payload_cache_lock = threading.Lock()
+
+
+def get_payload_cache() -> Optional[FramePayloadCache]:
+    """The process's payload cache, or None if disabled (frame_payload_cache_bytes = 0)."""
+    global _payload_cache
+    max_bytes = get_settings().frame_payload_cache_bytes
+    if max_bytes <= 0:
+        return None
+    with _payload_cache_lock:
+        if _payload_cache is None:
+            _payload_cache = FramePayloadCache(max_bytes)
+        return _payload_cache
+
+
+def invalidate_frames(match_id: int, first_frame: Optional[int] = None, last_frame: Optional[int] = None):
+    """Invalidate cached payloads of a match's frames (all of them if no range is given)."""
+    cache = get_payload_cache()
+    if cache is not None:
+        cache.invalidate(match_id, first_frame, last_frame)
+
+
+def invalidate_track(track: Track):
+    """Invalidate the frames a track has detections in."""
+    invalidate_frames(track.match_id, track.first_frame, track.last_frame)
+
+
+def invalidate_detection(db: Session, detection_id: int):
+    """Invalidate the frame of an edited detection."""
+    frame = db.query(Frame.match_id, Frame.frame_number).join(
+        Detection, Detection.frame_id == Frame.id
+    ).filter(Detection.id == detection_id).first()
+    if frame is not None:
+        invalidate_frames(frame.match_id, frame.frame_number, frame.frame_number)
+
+
+def invalidate_correction(db: Session, correction: Correction):
+    """Invalidate the frames a committed correction touches (its frame, track or detection)."""
+    if get_payload_cache() is None:
+        return
+    if correction.frame_number is not None:
+        invalidate_frames(correction.match_id, correction.frame_number, correction.frame_number)
+    if correction.track_id is not None:
+        track = db.query(Track).filter(Track.id == correction.track_id).first()
+        if track is not None:
+            invalidate_track(track)
+    if correction.detection_id is not None:
+        invalidate_detection(db, correction.detection_id)
@@ -9,6 +9,9 @@ from app.models.team import Match
 from app.models.user import User
 from app.schemas.corrections import CorrectionCreate, CorrectionResponse, CorrectionSummary, CorrectionBatch
 from app.auth import get_current_user, require_analyst
+from app.change_version import bump_match_version
+from app.frame_store import materialize_correction_frame
+from app.payload_cache import invalidate_correction
 
 router = APIRouter(prefix="/corrections", tags=["Corrections"])
 
@@ -94,20 +97,29 @@ async def create_correction(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_analyst)
 ):
-    """Create a new correction."""
+    """
+    Create a new correction.
+
+    Corrections adding data to a frame (detection / ball add, ball position)
+    create that frame's record if it only existed virtually.
+    """
     # Verify match exists
     match = db.query(Match).filter(Match.id == correction_data.match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
+    materialize_correction_frame(db, match, correction_data.correction_type, correction_data.frame_number)
+
     correction = Correction(
         user_id=current_user.id,
         **correction_data.model_dump()
     )
 
     db.add(correction)
+    bump_match_version(db, match.id)
     db.commit()
     db.refresh(correction)
+    invalidate_correction(db, correction)
 
     return correction
 
@@ -120,8 +132,15 @@ async def create_corrections_batch(
 ):
     """Create multiple corrections at once."""
     corrections = []
+    matches: Dict[int, Optional[Match]] = {}
 
     for correction_data in batch_data.corrections:
+        if correction_data.match_id not in matches:
+            matches[correction_data.match_id] = db.query(Match).filter(Match.id == correction_data.match_id).first()
+        match = matches[correction_data.match_id]
+        if match is not None:
+            materialize_correction_frame(db, match, correction_data.correction_type, correction_data.frame_number)
+
         correction = Correction(
             user_id=current_user.id,
             **correction_data.model_dump()
@@ -129,10 +148,12 @@ async def create_corrections_batch(
         db.add(correction)
         corrections.append(correction)
 
+    bump_match_version(db, *[match_id for match_id, match in matches.items() if match is not None])
     db.commit()
 
     for correction in corrections:
         db.refresh(correction)
+        invalidate_correction(db, correction)
 
     return corrections
 
@@ -172,6 +193,7 @@ async def delete_correction(
         )
 
     db.delete(correction)
+    bump_match_version(db, correction.match_id)
     db.commit()
 
     return {"message": "Correction deleted"}
@@ -4,21 +4,26 @@ CRUD operations for reviewing and correcting AI detections.
 Compatible with the tracked model structure.
 """
 
+import json
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional, Union
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy import func, Integer
 
 from app.database import get_db
-from app.models.tracking import Detection, Frame, DetectionClass, TeamSide
+from app.models.tracking import Detection, Frame, Track, DetectionClass, TeamSide
 from app.models.team import Match
 from app.models.user import User
 from app.auth import get_current_user, require_analyst
+from app.change_version import etag_headers, etag_matches, match_etag, not_modified
+from app.frame_store import frame_timestamp_ms
+from app.payload_cache import get_payload_cache
+from app.wire_format import MSGPACK_MEDIA_TYPE, accepts_msgpack, pack_frames
 
 router = APIRouter()
 
@@ -52,43 +57,60 @@ class DetectionResponse(BaseModel):
     @classmethod
     def from_orm_detection(cls, det: Detection) -> "DetectionResponse":
         """Convert a Detection ORM object to a response."""
-        # Map detection class + team to friendly display name
-        def get_display_class(detection_class, team):
-            if detection_class == DetectionClass.BALL:
-                return 'ball'
-            elif detection_class == DetectionClass.REFEREE:
-                return 'referee'
-            elif detection_class == DetectionClass.LINESMAN:
-                return 'linesman'
-            elif detection_class in (DetectionClass.PLAYER, DetectionClass.GOALKEEPER):
-                if team == TeamSide.HOME:
-                    return 'team_a'
-                elif team == TeamSide.AWAY:
-                    return 'team_b'
-                else:
-                    return 'team_a'  # Default
-            else:
-                return 'team_a'  # Default for unknown
-
-        display_class = get_display_class(det.ai_detection_class, det.ai_team)
-
-        return cls(
-            id=det.id,
-            frame_id=det.frame_id,
-            track_id=det.track_id,
-            bbox=BoundingBox(
-                x1=float(det.bbox_x1 or 0),
-                y1=float(det.bbox_y1 or 0),
-                x2=float(det.bbox_x2 or 0),
-                y2=float(det.bbox_y2 or 0)
-            ),
-            center_x=float(det.center_x) if det.center_x else None,
-            center_y=float(det.center_y) if det.center_y else None,
-            confidence=float(det.confidence) if det.confidence else None,
-            class_name=display_class,
-            team=det.ai_team.value if det.ai_team else None,
-            is_corrected=False  # Simplified for now
-        )
+        return cls(**detection_payload(*(getattr(det, column.key) for column in DETECTION_COLUMNS)))
+
+
+def display_class(detection_class, team) -> str:
+    """Map detection class + team to friendly display name."""
+    if detection_class == DetectionClass.BALL:
+        return 'ball'
+    elif detection_class == DetectionClass.REFEREE:
+        return 'referee'
+    elif detection_class == DetectionClass.LINESMAN:
+        return 'linesman'
+    elif detection_class in (DetectionClass.PLAYER, DetectionClass.GOALKEEPER):
+        if team == TeamSide.HOME:
+            return 'team_a'
+        elif team == TeamSide.AWAY:
+            return 'team_b'
+        else:
+            return 'team_a'  # Default
+    else:
+        return 'team_a'  # Default for unknown
+
+
+# Detection columns of a DetectionResponse, in detection_payload order
+DETECTION_COLUMNS = (
+    Detection.id, Detection.frame_id, Detection.track_id,
+    Detection.bbox_x1, Detection.bbox_y1, Detection.bbox_x2, Detection.bbox_y2,
+    Detection.center_x, Detection.center_y, Detection.confidence,
+    Detection.ai_detection_class, Detection.ai_team,
+)
+
+
+def detection_payload(id, frame_id, track_id, bbox_x1, bbox_y1, bbox_x2, bbox_y2,
+                      center_x, center_y, confidence, ai_detection_class, ai_team) -> dict:
+    """
+    DetectionResponse fields as a plain dict. Takes the DETECTION_COLUMNS
+    values positionally, so query rows can be passed as detection_payload(*row).
+    """
+    return {
+        "id": id,
+        "frame_id": frame_id,
+        "track_id": track_id,
+        "bbox": {
+            "x1": float(bbox_x1 or 0),
+            "y1": float(bbox_y1 or 0),
+            "x2": float(bbox_x2 or 0),
+            "y2": float(bbox_y2 or 0),
+        },
+        "center_x": float(center_x) if center_x else None,
+        "center_y": float(center_y) if center_y else None,
+        "confidence": float(confidence) if confidence else None,
+        "class_name": display_class(ai_detection_class, ai_team),
+        "team": ai_team.value if ai_team else None,
+        "is_corrected": False,  # Simplified for now
+    }
 
 
 class FrameResponse(BaseModel):
@@ -110,20 +132,168 @@ class FrameListResponse(BaseModel):
     corrected_count: int
 
 
+class FrameWindowResponse(BaseModel):
+    match_id: int
+    from_frame: int
+    to_frame: int
+    total_frames: int
+    frames: List[FrameResponse]
+
+
+# Longest frame window returned by one request (20 s at 25 fps)
+MAX_WINDOW_FRAMES = 500
+
+
+def frame_detection_rows(db: Session, *criteria) -> list:
+    """
+    (frame id, frame number, timestamp_ms, *DETECTION_COLUMNS) rows of the
+    frames matching criteria, from one query joining frames to detections,
+    ordered by frame. Frames without detections give one row of None
+    detection columns.
+    """
+    return db.query(
+        Frame.id,
+        Frame.frame_number,
+        Frame.timestamp_ms,
+        *DETECTION_COLUMNS,
+    ).outerjoin(
+        Detection, Detection.frame_id == Frame.id
+    ).filter(
+        *criteria
+    ).order_by(
+        Frame.frame_number, Frame.id, Detection.id
+    ).all()
+
+
+def window_criteria(match_id: int, from_frame: int, to_frame: int) -> tuple:
+    return Frame.match_id == match_id, Frame.frame_number.between(from_frame, to_frame)
+
+
+def virtual_frame_row(match: Match, frame_number: int) -> tuple:
+    """frame_detection_rows row of a frame without a record (id -1)."""
+    return (-1, frame_number, frame_timestamp_ms(match, frame_number)) + (None,) * len(DETECTION_COLUMNS)
+
+
+def frames_from_rows(match_id: int, rows: list) -> List[dict]:
+    """FrameResponse dicts of frame_detection_rows rows."""
+    frames: List[dict] = []
+    for row in rows:
+        frame_id, frame_number, timestamp_ms, detection_id = row[:4]
+        if not frames or frames[-1]["id"] != frame_id:
+            frames.append({
+                "id": frame_id,
+                "match_id": match_id,
+                "frame_number": frame_number,
+                "timestamp_ms": timestamp_ms or 0,
+                "detections": [],
+            })
+        if detection_id is not None:
+            frames[-1]["detections"].append(detection_payload(*row[3:]))
+    return frames
+
+
+def load_frame_window(db: Session, match_id: int, from_frame: int, to_frame: int) -> List[dict]:
+    """
+    Frames from_frame..to_frame (inclusive) of a match with their detections,
+    as FrameResponse dicts, from one query joining frames to detections.
+    Frame numbers without a frame record are left out.
+    """
+    return frames_from_rows(match_id, frame_detection_rows(db, *window_criteria(match_id, from_frame, to_frame)))
+
+
+def json_bytes(content) -> bytes:
+    """Serialize like JSONResponse, for payloads kept in the payload cache."""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def window_payload(db: Session, match: Match, from_frame: int, to_frame: int, msgpack: bool) -> bytes:
+    """Serialized frame window response."""
+    window = {
+        "match_id": match.id,
+        "from_frame": from_frame,
+        "to_frame": to_frame,
+        "total_frames": match.total_frames or 0,
+    }
+    rows = frame_detection_rows(db, *window_criteria(match.id, from_frame, to_frame))
+    if msgpack:
+        return pack_frames(rows, display_class, **window)
+    return json_bytes({**window, "frames": frames_from_rows(match.id, rows)})
+
+
+def frame_payload(db: Session, match: Match, frame_number: int, msgpack: bool) -> bytes:
+    """Serialized get_frame_by_number response; a virtual frame if the frame has no record."""
+    total_frames = match.total_frames or 0
+    rows = frame_detection_rows(db, Frame.match_id == match.id, Frame.frame_number == frame_number)
+    if msgpack:
+        return pack_frames(rows or [virtual_frame_row(match, frame_number)], display_class,
+                           match_id=match.id, total_frames=total_frames)
+
+    frames = frames_from_rows(match.id, rows)
+    frame = frames[0] if frames else None
+    return json_bytes({
+        "id": frame["id"] if frame else None,
+        "match_id": match.id,
+        "frame_number": frame_number,
+        "timestamp_ms": frame["timestamp_ms"] if frame else frame_timestamp_ms(match, frame_number),
+        "total_frames": total_frames,
+        "detections": frame["detections"] if frame else [],
+    })
+
+
+def cached_payload(match: Match, key: tuple, first_frame: int, last_frame: int,
+                   build: Callable[[], bytes]) -> bytes:
+    """
+    A payload from the payload cache, built and stored on a miss. Entries are
+    keyed on the match's data_version as read with match, so a write made by
+    another process is never answered from an entry built before it.
+    """
+    cache = get_payload_cache()
+    if cache is None:
+        return build()
+    key = (match.data_version, *key)
+    payload = cache.get(match.id, key)
+    if payload is None:
+        generation = cache.generation(match.id)
+        payload = build()
+        cache.put(match.id, key, payload, first_frame, last_frame, generation)
+    return payload
+
+
+def payload_response(payload: bytes, msgpack: bool, etag: Optional[str] = None) -> Response:
+    headers = {"Vary": "Accept", **(etag_headers(etag) if etag else {})}
+    return Response(content=payload, media_type=MSGPACK_MEDIA_TYPE if msgpack else "application/json",
+                    headers=headers)
+
+
+def format_variant(msgpack: bool) -> str:
+    return "msgpack" if msgpack else "json"
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
 
-@router.get("/matches/{match_id}/frames", response_model=List[FrameListResponse])
+@router.get("/matches/{match_id}/frames", response_model=Union[FrameWindowResponse, List[FrameListResponse]])
 async def list_frames(
+    request: Request,
+    response: Response,
     match_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    from_frame: Optional[int] = Query(None, alias="from", ge=0, description="First frame number of a window"),
+    to_frame: Optional[int] = Query(None, alias="to", ge=0, description="Last frame number of a window (inclusive)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     List frames for a match with detection counts.
+
+    With from and to, returns the frames in that window with all their
+    detections instead (at most MAX_WINDOW_FRAMES frames), so playback can
+    prefetch seconds of detections in one request. Windows are sent in the
+    compact format of app/wire_format.py if the client accepts MessagePack,
+    and served from the payload cache (app/payload_cache.py) when possible.
+    Both carry an ETag from the match's change version (app/change_version.py).
     """
     # Verify match exists
     match = db.query(Match).filter(Match.id == match_id).first()
@@ -133,6 +303,32 @@ async def list_frames(
             detail="Match not found"
         )
 
+    if from_frame is not None or to_frame is not None:
+        if from_frame is None or to_frame is None or to_frame < from_frame:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A frame window needs both from and to, with from <= to"
+            )
+        if to_frame - from_frame + 1 > MAX_WINDOW_FRAMES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Frame windows are limited to {MAX_WINDOW_FRAMES} frames"
+            )
+        msgpack = accepts_msgpack(request)
+        etag = match_etag(request, match_id, match.data_version, format_variant(msgpack))
+        if etag_matches(request, etag):
+            return not_modified(etag, Vary="Accept")
+        payload = cached_payload(
+            match, ("window", from_frame, to_frame, msgpack), from_frame, to_frame,
+            lambda: window_payload(db, match, from_frame, to_frame, msgpack),
+        )
+        return payload_response(payload, msgpack, etag)
+
+    etag = match_etag(request, match_id, match.data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+
     # Single query with aggregation
     frames_with_counts = db.query(
         Frame.id,
@@ -163,13 +359,34 @@ async def list_frames(
 
 @router.get("/frames/{frame_id}", response_model=FrameResponse)
 async def get_frame(
+    request: Request,
+    response: Response,
     frame_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get a single frame with all its detections.
+    Get a single frame with all its detections (MessagePack if accepted).
     """
+    owner = db.query(Match.id, Match.data_version).join(
+        Frame, Frame.match_id == Match.id
+    ).filter(Frame.id == frame_id).first()
+    if not owner:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Frame not found"
+        )
+    msgpack = accepts_msgpack(request)
+    etag = match_etag(request, owner.id, owner.data_version, format_variant(msgpack))
+    if etag_matches(request, etag):
+        return not_modified(etag, Vary="Accept")
+
+    if msgpack:
+        rows = frame_detection_rows(db, Frame.id == frame_id)
+        return payload_response(pack_frames(rows, display_class), msgpack=True, etag=etag)
+
+    response.headers.update({"Vary": "Accept", **etag_headers(etag)})
+
     frame = db.query(Frame).filter(Frame.id == frame_id).first()
     if not frame:
         raise HTTPException(
@@ -188,14 +405,19 @@ async def get_frame(
 
 @router.get("/matches/{match_id}/frames/{frame_number}")
 async def get_frame_by_number(
+    request: Request,
     match_id: int,
     frame_number: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get frame data by match ID and frame number.
-    Creates the frame record if it doesn't exist.
+    Get frame data by match ID and frame number (MessagePack if accepted).
+
+    Read-only: a frame without a record is returned as a virtual frame (id
+    null, timestamp from the match fps, no detections) without writing it;
+    see app/frame_store.py. Served from the payload cache when possible,
+    with an ETag from the match's change version.
     """
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
@@ -204,35 +426,15 @@ async def get_frame_by_number(
             detail="Match not found"
         )
 
-    # Try to find existing frame
-    frame = db.query(Frame).filter(
-        Frame.match_id == match_id,
-        Frame.frame_number == frame_number
-    ).first()
-
-    # If no frame exists, create one (for on-the-fly detection review)
-    if not frame:
-        fps = float(match.fps) if match.fps else 30.0
-        frame = Frame(
-            match_id=match_id,
-            frame_number=frame_number,
-            timestamp_ms=int(frame_number * 1000 / fps)
-        )
-        db.add(frame)
-        db.commit()
-        db.refresh(frame)
-
-    # Get total frames for navigation
-    total_frames = match.total_frames or 0
-
-    return {
-        "id": frame.id,
-        "match_id": frame.match_id,
-        "frame_number": frame.frame_number,
-        "timestamp_ms": frame.timestamp_ms or 0,
-        "total_frames": total_frames,
-        "detections": [DetectionResponse.from_orm_detection(d) for d in frame.detections]
-    }
+    msgpack = accepts_msgpack(request)
+    etag = match_etag(request, match_id, match.data_version, format_variant(msgpack))
+    if etag_matches(request, etag):
+        return not_modified(etag, Vary="Accept")
+    payload = cached_payload(
+        match, ("frame", frame_number, msgpack), frame_number, frame_number,
+        lambda: frame_payload(db, match, frame_number, msgpack),
+    )
+    return payload_response(payload, msgpack, etag)
 
 
 @router.get("/matches/{match_id}/detection-stats")
@@ -243,6 +445,11 @@ async def get_detection_stats(
 ):
     """
     Get detection statistics for a match.
+
+    Counted with GROUP BY aggregates that read only the columns of the
+    idx_detection_frame_stats index: detections are grouped by track and
+    class, and the few resulting rows are combined with their tracks'
+    correction state. A detection counts as corrected when its track is.
     """
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
@@ -252,28 +459,37 @@ async def get_detection_stats(
         )
 
     # Count frames
-    frame_count = db.query(Frame).filter(Frame.match_id == match_id).count()
+    frame_count = db.query(func.count(Frame.id)).filter(Frame.match_id == match_id).scalar()
 
-    # Count detections
-    total_detections = db.query(Detection).join(Frame).filter(
+    # Count detections by track and AI class
+    groups = db.query(
+        Detection.track_id, Detection.ai_detection_class, func.count()
+    ).join(
+        Frame, Frame.id == Detection.frame_id
+    ).filter(
         Frame.match_id == match_id
-    ).count()
+    ).group_by(Detection.track_id, Detection.ai_detection_class).all()
 
-    # Count by class
-    class_counts = {}
-    detections = db.query(Detection).join(Frame).filter(
-        Frame.match_id == match_id
-    ).all()
+    corrected_tracks = {
+        track_id for (track_id,) in
+        db.query(Track.id).filter(Track.match_id == match_id, Track.is_corrected == True)
+    }
 
-    for det in detections:
-        cls = det.ai_detection_class.value if det.ai_detection_class else 'unknown'
-        class_counts[cls] = class_counts.get(cls, 0) + 1
+    class_counts = {}
+    total_detections = 0
+    corrected_detections = 0
+    for track_id, cls, count in groups:
+        cls = cls.value if cls else 'unknown'
+        class_counts[cls] = class_counts.get(cls, 0) + count
+        total_detections += count
+        if track_id in corrected_tracks:
+            corrected_detections += count
 
     return {
         "match_id": match_id,
         "frame_count": frame_count,
         "total_detections": total_detections,
-        "corrected_detections": 0,  # Simplified
-        "correction_rate": 0,
+        "corrected_detections": corrected_detections,
+        "correction_rate": round(corrected_detections / total_detections * 100, 1) if total_detections else 0,
         "by_class": class_counts
     }
@@ -1,6 +1,6 @@
 """Events router."""
 from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, text
 from pydantic import BaseModel
@@ -11,12 +11,15 @@ from app.models.user import User
 from app.models.corrections import Correction, CorrectionType
 from app.schemas.events import EventCreate, EventUpdate, EventResponse, EventListResponse, EventSummary
 from app.auth import get_current_user, require_analyst
+from app.change_version import bump_match_version, etag_headers, etag_matches, match_etag, not_modified
 
 router = APIRouter(prefix="/matches/{match_id}/events", tags=["Events"])
 
 
 @router.get("", response_model=List[EventListResponse])
 async def list_events(
+    request: Request,
+    response: Response,
     match_id: int,
     event_type: Optional[EventType] = Query(None, description="Filter by event type"),
     event_category: Optional[EventCategory] = Query(None, description="Filter by category"),
@@ -30,12 +33,17 @@ async def list_events(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List events in a match."""
+    """List events in a match (with an ETag from the match's change version)."""
     # Verify match exists
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
+    etag = match_etag(request, match_id, match.data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+
     query = db.query(Event).filter(Event.match_id == match_id)
 
     if not include_deleted:
@@ -222,6 +230,7 @@ async def create_kickoff_event(
         if kickoff.team:
             existing.metadata = existing.metadata or {}
             existing.metadata['team'] = kickoff.team
+        bump_match_version(db, match_id)
         db.commit()
         return {
             "message": f"Kick-off for half {kickoff.half} updated",
@@ -247,6 +256,7 @@ async def create_kickoff_event(
             metadata={'team': kickoff.team} if kickoff.team else {}
         )
         db.add(new_kickoff)
+        bump_match_version(db, match_id)
         db.commit()
         return {
             "message": f"Kick-off for half {kickoff.half} created",
@@ -303,6 +313,7 @@ async def apply_timestamp_offset(
             "match_id": match_id
         })
 
+    bump_match_version(db, match_id)
     db.commit()
 
     # Get count of affected events
@@ -341,6 +352,7 @@ async def create_event(
 
     event = Event(**event_data_dict)
     db.add(event)
+    bump_match_version(db, match_id)
     db.commit()
     db.refresh(event)
 
@@ -354,6 +366,7 @@ async def create_event(
         corrected_value={"event_type": event.event_type.value},
     )
     db.add(correction)
+    bump_match_version(db, match_id)
     db.commit()
 
     return event
@@ -413,6 +426,7 @@ async def update_event(
     if event.is_ai_generated and corrected_values:
         event.is_corrected = True
 
+    bump_match_version(db, match_id)
     db.commit()
 
     # Create correction record
@@ -445,6 +459,7 @@ async def update_event(
             corrected_value=corrected_values,
         )
         db.add(correction)
+        bump_match_version(db, match_id)
         db.commit()
 
     db.refresh(event)
@@ -487,5 +502,6 @@ async def delete_event(
         )
         db.add(correction)
 
+    bump_match_version(db, match_id)
     db.commit()
     return {"message": "Event deleted"}
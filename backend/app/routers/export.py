@@ -10,26 +10,38 @@ Based on industry standards from:
 
 import os
 import io
+import json
+import hashlib
 import zipfile
 import yaml
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
 
-import cv2
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Query as SAQuery, Session
+from sqlalchemy import and_, func, select
 
-from app.database import get_db
-from app.models.tracking import Detection, Frame
+from app.config import get_settings
+from app.database import SessionLocal, get_db
+from app.models.tracking import Detection, Frame, Track, DetectionClass, TeamSide
 from app.models.team import Match
+from app.models.training import TrainingExport, ExportType, ExportFormat, ExportStatus
 from app.models.user import User
+from app.schemas.training import TrainingExportResponse
 from app.auth import get_current_user
+from app.export_jobs import register_builder, submit_export_job
+from app.training_delta import MANIFEST_FILE, DeltaChanges, get_base_export, collect_delta_changes, delta_manifest
+from app.video import match_video_metadata, read_frame_images
 
 # Video directory
-VIDEO_DIR = Path("/Users/Sean/Desktop/Football Tracker")
+VIDEO_DIR = Path(get_settings().video_dir)
+
+# Image size assumed for matches whose video dimensions are unknown
+DEFAULT_IMAGE_SIZE = (1920, 1080)
 
 router = APIRouter()
 
@@ -48,6 +60,69 @@ CLASS_MAPPING = {
 CLASS_NAMES = {v: k for k, v in CLASS_MAPPING.items()}
 
 
+def yolo_class_name(detection_class: DetectionClass, team: TeamSide) -> Optional[str]:
+    """
+    CLASS_MAPPING key for a detection class and team, or None if unmapped.
+
+    Players and goalkeepers without a known team default to side A, as in the
+    detection review UI.
+    """
+    if detection_class == DetectionClass.BALL:
+        return "ball"
+    elif detection_class == DetectionClass.REFEREE:
+        return "referee"
+    elif detection_class == DetectionClass.LINESMAN:
+        return "linesman"
+    elif detection_class == DetectionClass.GOALKEEPER:
+        return "goalkeeper_b" if team == TeamSide.AWAY else "goalkeeper_a"
+    elif detection_class == DetectionClass.PLAYER:
+        return "team_b" if team == TeamSide.AWAY else "team_a"
+    return None
+
+
+# (detection class, team) -> YOLO class id; -1 for classes that are not exported
+YOLO_CLASS_IDS = {
+    (detection_class, team): CLASS_MAPPING.get(yolo_class_name(detection_class, team), -1)
+    for detection_class in DetectionClass
+    for team in TeamSide
+}
+
+# One YOLO label line: <class_id> <x_center> <y_center> <width> <height>
+LABEL_LINE = "%d %.6f %.6f %.6f %.6f"
+
+
+def frame_split(match_id: int, frame_number: int, train_split: float) -> str:
+    """
+    Deterministic "train" / "val" assignment of a frame.
+
+    Hashing (match, frame) instead of shuffling keeps every frame in the same
+    split across exports with the same ratio, so incremental exports can
+    replace files in a previous dataset.
+    """
+    return _hash_split(f"{match_id}:{frame_number}", train_split)
+
+
+def match_split(match_id: int, train_split: float) -> str:
+    """
+    Deterministic "train" / "val" assignment of a whole match, for datasets
+    split by match. A match keeps its split when matches are added, so the
+    realized ratio only approaches train_split over many matches.
+    """
+    return _hash_split(f"match:{match_id}", train_split)
+
+
+def _hash_split(key: str, train_split: float) -> str:
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return "train" if int.from_bytes(digest, "big") / 2 ** 64 < train_split else "val"
+
+
+def match_display_name(match: Match) -> str:
+    """Human-readable "Home vs Away" name of a match."""
+    home = match.home_team.name if match.home_team else "Home"
+    away = match.away_team.name if match.away_team else "Away"
+    return f"{home} vs {away}"
+
+
 def normalize_bbox(bbox_x1: float, bbox_y1: float, bbox_x2: float, bbox_y2: float,
                    img_width: int, img_height: int) -> tuple:
     """
@@ -79,55 +154,233 @@ def normalize_bbox(bbox_x1: float, bbox_y1: float, bbox_x2: float, bbox_y2: floa
     return x_center, y_center, width, height
 
 
-def get_video_dimensions(video_path: Path) -> tuple:
-    """Get video width and height."""
-    cap = cv2.VideoCapture(str(video_path))
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    cap.release()
-    return width, height
+def yolo_label_query(db: Session, match_id: int) -> SAQuery:
+    """
+    Projected query of the columns YOLO labels need, one row per detection:
+    (frame_id, frame_number, class, team, is_corrected, x1, y1, x2, y2).
 
+    Class and team are the track's corrections if any, else the AI values.
+    Callers add filters; rows must be ordered by frame (see group_yolo_labels).
+    """
+    return db.query(
+        Frame.id,
+        Frame.frame_number,
+        func.coalesce(Track.corrected_detection_class, Detection.ai_detection_class),
+        func.coalesce(Track.corrected_team, Detection.ai_team),
+        func.coalesce(Track.is_corrected, False),
+        Detection.bbox_x1, Detection.bbox_y1, Detection.bbox_x2, Detection.bbox_y2,
+    ).join(
+        Frame, Frame.id == Detection.frame_id
+    ).outerjoin(
+        Track, Track.id == Detection.track_id
+    ).filter(Frame.match_id == match_id)
+
+
+@dataclass
+class YoloLabels:
+    """YOLO labels of a match, grouped by frame."""
+    frames: Dict[int, dict]  # frame_id -> {"frame_number", "labels": label file text}
+    frame_ids: np.ndarray  # Per exported box
+    class_ids: np.ndarray
+    corrected: np.ndarray
+
+
+def export_detection_filters(corrected_only: bool, min_confidence: float) -> list:
+    """WHERE clauses selecting the detections of an export (with Track outer-joined)."""
+    filters = []
+    if corrected_only:
+        filters.append(Track.is_corrected == True)
+    if min_confidence > 0:
+        filters.append(Detection.confidence >= min_confidence)
+    return filters
 
-def extract_frame_image(video_path: Path, frame_number: int) -> bytes:
-    """Extract a single frame from video as JPEG bytes."""
-    cap = cv2.VideoCapture(str(video_path))
-    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-    ret, img = cap.read()
-    cap.release()
 
-    if not ret or img is None:
-        return None
+def group_yolo_labels(rows: List[tuple], img_width: int, img_height: int) -> YoloLabels:
+    """
+    Turn yolo_label_query rows, ordered by frame, into YOLO labels.
 
-    _, buffer = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 95])
-    return buffer.tobytes()
+    Every frame with rows gets a (possibly empty) label file; boxes of
+    classes that are not exported are dropped. Boxes are normalized and
+    clamped like normalize_bbox, as array operations over all rows; each
+    frame's text is formatted with a single % on a repeated LABEL_LINE.
+    """
+    if not rows:
+        return YoloLabels({}, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=bool))
+
+    frame_ids, frame_numbers, classes, teams, corrected, x1, y1, x2, y2 = zip(*rows)
+    class_ids = np.fromiter((YOLO_CLASS_IDS[key] for key in zip(classes, teams)),
+                            dtype=np.int64, count=len(rows))
+    x1, y1, x2, y2 = (np.array(v, dtype=np.float64) for v in (x1, y1, x2, y2))
+
+    labels = np.empty((len(rows), 5), dtype=np.float64)
+    labels[:, 0] = class_ids
+    labels[:, 1] = (x1 + x2) / 2 / img_width
+    labels[:, 2] = (y1 + y2) / 2 / img_height
+    labels[:, 3] = (x2 - x1) / img_width
+    labels[:, 4] = (y2 - y1) / img_height
+    np.clip(labels[:, 1:], 0.0, 1.0, out=labels[:, 1:])
+
+    frames_data = {
+        frame_id: {"frame_number": frame_number, "labels": ""}
+        for frame_id, frame_number in zip(frame_ids, frame_numbers)
+    }
 
+    exported = class_ids >= 0
+    labels = labels[exported]
+    label_frames = np.array(frame_ids, dtype=np.int64)[exported]
+    if len(label_frames):
+        starts = np.flatnonzero(np.r_[True, label_frames[1:] != label_frames[:-1]])
+        ends = np.r_[starts[1:], len(label_frames)]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            template = "\n".join([LABEL_LINE] * (end - start))
+            frames_data[int(label_frames[start])]["labels"] = template % tuple(labels[start:end].ravel().tolist())
 
-@router.get("/matches/{match_id}/export/yolo")
-async def export_yolo_dataset(
-    match_id: int,
-    corrected_only: bool = Query(True, description="Export only human-corrected detections"),
-    min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
-    train_split: float = Query(0.8, ge=0.5, le=0.95, description="Training set ratio (remainder is validation)"),
-    include_images: bool = Query(True, description="Include frame images in export"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+    return YoloLabels(frames_data, label_frames, class_ids[exported], np.array(corrected, dtype=bool)[exported])
+
+
+def load_yolo_labels(db: Session, match_id: int, img_width: int, img_height: int,
+                     corrected_only: bool = True, min_confidence: float = 0.0,
+                     frame_numbers: Optional[Iterable[int]] = None) -> YoloLabels:
+    """YOLO labels of a match's selected detections, optionally restricted to frame_numbers."""
+    # Label columns only; corrections are made on their tracks
+    query = yolo_label_query(db, match_id).filter(*export_detection_filters(corrected_only, min_confidence))
+
+    if frame_numbers is not None:
+        query = query.filter(Frame.frame_number.in_(frame_numbers))
+
+    rows = query.order_by(Frame.frame_number, Frame.id, Detection.id).all()
+    return group_yolo_labels(rows, img_width, img_height)
+
+
+def class_counts(class_ids: np.ndarray) -> Dict[str, int]:
+    """Number of boxes per YOLO class name, for classes that occur."""
+    counts = np.bincount(class_ids, minlength=len(CLASS_NAMES)).tolist()
+    return {CLASS_NAMES[class_id]: count for class_id, count in enumerate(counts) if count}
+
+
+def get_video_dimensions(db: Session, match: Match) -> Optional[Tuple[int, int]]:
     """
-    Export match detections in YOLO format for training.
+    Width and height of a match's video, None if it has no readable video.
+    Probed from the file (cached per file, see app.video.match_video_metadata).
+    """
+    metadata = match_video_metadata(db, match)
+    if metadata and metadata.width and metadata.height:
+        return metadata.width, metadata.height
+    return None
 
-    Creates a ZIP file with:
-    - images/train/*.jpg
-    - images/val/*.jpg
-    - labels/train/*.txt
-    - labels/val/*.txt
-    - data.yaml (dataset config)
-    - export_info.yaml (metadata about the export)
 
-    YOLO label format: <class_id> <x_center> <y_center> <width> <height>
-    All coordinates normalized to 0-1 range.
+class _ZipChunkWriter:
+    """
+    Write-only sink for zipfile that hands out what was written so far.
 
-    Based on Ultralytics dataset structure:
-    https://docs.ultralytics.com/datasets/detect/
+    It has no seek/tell, so zipfile writes entries sequentially with data
+    descriptors instead of seeking back to patch headers; the archive can
+    be sent while it is being built.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, bytes, int]]) -> Iterator[bytes]:
+    """
+    Build a ZIP archive from (name, data, compress_type) entries and yield it
+    in chunks as each entry is written.
+
+    Only one entry is held in memory at a time, so the archive size is not
+    limited by RAM and the first bytes go out as soon as the first entry is
+    ready. Entries are produced lazily, so expensive ones (frame images)
+    are generated while the response is streaming.
+    """
+    sink = _ZipChunkWriter()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, data, compress_type in entries:
+            zf.writestr(name, data, compress_type=compress_type)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Central directory
+    yield sink.drain()
+
+
+class ExportArchive:
+    """
+    A ZIP export whose entries are produced on demand, so the same archive can
+    be streamed as a response or written to disk by an export job.
+
+    entries(progress) yields (name, data, compress_type) and calls
+    progress(frames_done) after each frame; total_frames is known upfront.
+    """
+
+    def __init__(self, filename: str, total_frames: int,
+                 entries: Callable[[Optional[Callable[[int], None]]], Iterator[Tuple[str, bytes, int]]]):
+        self.filename = filename
+        self.total_frames = total_frames
+        self._entries = entries
+
+    def chunks(self, progress: Optional[Callable[[int], None]] = None) -> Iterator[bytes]:
+        return stream_zip(self._entries(progress))
+
+    def response(self) -> StreamingResponse:
+        # The archive is built while it is sent, one entry at a time
+        return StreamingResponse(
+            self.chunks(),
+            media_type="application/zip",
+            headers={"Content-Disposition": f"attachment; filename={self.filename}"}
+        )
+
+
+def frame_images(video_path: Optional[Path], frames_data: Dict[int, dict],
+                 include_images: bool, image_size: Optional[int] = None
+                 ) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+    """
+    Yield (frame_number, frame_id, JPEG bytes or None) for every frame of
+    frames_data, in ascending frame number.
+
+    With include_images the video is decoded once, front to back, instead of
+    seeking for each frame, and images are encoded (and downscaled to
+    image_size, if given) on the encode worker pool; otherwise no image is
+    read.
+    """
+    frame_ids_by_number: Dict[int, List[int]] = {}
+    for frame_id, data in frames_data.items():
+        frame_ids_by_number.setdefault(data["frame_number"], []).append(frame_id)
+
+    if include_images and video_path is not None:
+        images = read_frame_images(video_path, frame_ids_by_number, max_size=image_size)
+    else:
+        images = ((frame_number, None) for frame_number in sorted(frame_ids_by_number))
+
+    for frame_number, img_bytes in images:
+        for frame_id in frame_ids_by_number[frame_number]:
+            yield frame_number, frame_id, img_bytes
+
+
+def build_yolo_archive(db: Session, match_id: int, corrected_only: bool = True,
+                       min_confidence: float = 0.0, train_split: float = 0.8,
+                       include_images: bool = True, image_size: Optional[int] = None,
+                       since_export_id: Optional[int] = None) -> ExportArchive:
+    """
+    Load the detections of a YOLO export and return its archive.
+
+    With since_export_id, only frames touched by corrections made after that
+    TrainingExport are exported, plus a delta_manifest.json listing updated
+    frames and touched frames that no longer have labels (removed).
+
+    Raises HTTPException if the match, its video or matching detections are
+    missing. See export_yolo_dataset for the archive layout.
     """
     # Get match
     match = db.query(Match).filter(Match.id == match_id).first()
@@ -151,115 +404,107 @@ async def export_yolo_dataset(
         )
 
     # Get video dimensions for normalization
-    img_width, img_height = get_video_dimensions(video_path)
-
-    # Build query for detections
-    query = db.query(Detection).join(Frame).filter(Frame.match_id == match_id)
-
-    if corrected_only:
-        query = query.filter(Detection.is_corrected == True)
+    dimensions = get_video_dimensions(db, match)
+    if dimensions is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read video dimensions: {match.video_filename}"
+        )
+    img_width, img_height = dimensions
 
-    if min_confidence > 0:
-        query = query.filter(Detection.confidence >= min_confidence)
+    # Delta: only frames touched since the base export
+    base_export = changes = frame_numbers = None
+    if since_export_id is not None:
+        base_export = get_base_export(db, since_export_id)
+        changes = collect_delta_changes(db, base_export, [match_id])
+        frame_numbers = changes.match_frames(match_id)
 
-    detections = query.all()
+    labels = load_yolo_labels(db, match_id, img_width, img_height, corrected_only=corrected_only,
+                              min_confidence=min_confidence, frame_numbers=frame_numbers)
+    frames_data = labels.frames
 
-    if not detections:
+    # An empty delta is valid (nothing changed); an empty full export is not
+    if not frames_data and changes is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No detections found matching criteria"
         )
 
-    # Group detections by frame
-    frames_data = {}
-    for det in detections:
-        frame = det.frame
-        if frame.id not in frames_data:
-            frames_data[frame.id] = {
-                "frame_number": frame.frame_number,
-                "detections": []
-            }
+    # Split into train/val; deterministic, so a frame stays in its split across
+    # exports and delta frames replace the right files
+    train_frames = []
+    val_frames = []
+    for frame_id, frame_data in frames_data.items():
+        if frame_split(match_id, frame_data["frame_number"], train_split) == "train":
+            train_frames.append(frame_id)
+        else:
+            val_frames.append(frame_id)
 
-        # Get class name (corrected if available, otherwise AI prediction)
-        class_name = det.corrected_class if det.is_corrected and det.corrected_class else det.ai_detection_class
+    # Statistics for export info
+    stats = {
+        "total_frames": len(frames_data),
+        "train_frames": len(train_frames),
+        "val_frames": len(val_frames),
+        "total_detections": len(labels.class_ids),
+        "corrected_detections": int(labels.corrected.sum()),
+        "classes_count": class_counts(labels.class_ids),
+    }
 
-        if class_name and class_name in CLASS_MAPPING:
-            class_id = CLASS_MAPPING[class_name]
+    # Entries are produced after the session is closed (streamed responses,
+    # export jobs), so read what the archive needs from the match now
+    match_name = match_display_name(match)
+    video_filename = match.video_filename
+
+    delta_manifest_data = None
+    if changes is not None:
+        exported_numbers = {data["frame_number"] for data in frames_data.values()}
+
+        def frame_entry(frame_number):
+            split_name = frame_split(match_id, frame_number, train_split)
+            base_name = f"match{match_id}_frame{frame_number:06d}"
+            return {
+                "frame_number": frame_number,
+                "split": split_name,
+                "label": f"labels/{split_name}/{base_name}.txt",
+                "image": f"images/{split_name}/{base_name}.jpg",
+            }
 
-            # Normalize bounding box
-            x_center, y_center, width, height = normalize_bbox(
-                det.bbox_x1, det.bbox_y1, det.bbox_x2, det.bbox_y2,
-                img_width, img_height
-            )
+        delta_manifest_data = delta_manifest(
+            base_export, changes,
+            match_id=match_id,
+            export_settings={
+                "corrected_only": corrected_only,
+                "min_confidence": min_confidence,
+                "train_split": train_split,
+            },
+            # Replace these files in the base dataset
+            updated_frames=[frame_entry(n) for n in sorted(exported_numbers)],
+            # Touched frames without labels any more: delete their files
+            removed_frames=[frame_entry(n) for n in sorted(changes.match_frames(match_id) - exported_numbers)],
+        )
 
-            frames_data[frame.id]["detections"].append({
-                "class_id": class_id,
-                "x_center": x_center,
-                "y_center": y_center,
-                "width": width,
-                "height": height,
-                "original_class": det.ai_detection_class,
-                "corrected_class": det.corrected_class,
-                "is_corrected": det.is_corrected,
-                "confidence": det.confidence
-            })
+    def archive_entries(progress=None):
+        # Process frames in video order so the video is decoded once
+        split_of = dict.fromkeys(train_frames, "train")
+        split_of.update(dict.fromkeys(val_frames, "val"))
 
-    # Split into train/val
-    frame_ids = list(frames_data.keys())
-    import random
-    random.shuffle(frame_ids)
+        frame_items = frame_images(video_path, frames_data, include_images, image_size)
+        for frames_done, (frame_num, frame_id, img_bytes) in enumerate(frame_items, 1):
+            split_name = split_of[frame_id]
 
-    split_idx = int(len(frame_ids) * train_split)
-    train_frames = frame_ids[:split_idx]
-    val_frames = frame_ids[split_idx:]
+            # Generate filename (match_id_frame_number)
+            base_name = f"match{match_id}_frame{frame_num:06d}"
 
-    # Create ZIP file in memory
-    zip_buffer = io.BytesIO()
+            # Write label file (YOLO format)
+            label_content = frames_data[frame_id]["labels"]
+            yield f"labels/{split_name}/{base_name}.txt", label_content.encode(), zipfile.ZIP_DEFLATED
 
-    # Statistics for export info
-    stats = {
-        "total_frames": len(frames_data),
-        "train_frames": len(train_frames),
-        "val_frames": len(val_frames),
-        "total_detections": sum(len(f["detections"]) for f in frames_data.values()),
-        "corrected_detections": sum(
-            sum(1 for d in f["detections"] if d["is_corrected"])
-            for f in frames_data.values()
-        ),
-        "classes_count": {},
-    }
+            # Write image file (if requested); JPEGs do not deflate, store them as-is
+            if img_bytes:
+                yield f"images/{split_name}/{base_name}.jpg", img_bytes, zipfile.ZIP_STORED
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        # Process each frame
-        for split_name, frame_list in [("train", train_frames), ("val", val_frames)]:
-            for frame_id in frame_list:
-                frame_data = frames_data[frame_id]
-                frame_num = frame_data["frame_number"]
-
-                # Generate filename (match_id_frame_number)
-                base_name = f"match{match_id}_frame{frame_num:06d}"
-
-                # Write label file (YOLO format)
-                label_lines = []
-                for det in frame_data["detections"]:
-                    # YOLO format: class_id x_center y_center width height
-                    label_lines.append(
-                        f"{det['class_id']} {det['x_center']:.6f} {det['y_center']:.6f} "
-                        f"{det['width']:.6f} {det['height']:.6f}"
-                    )
-
-                    # Track class statistics
-                    class_name = CLASS_NAMES[det['class_id']]
-                    stats["classes_count"][class_name] = stats["classes_count"].get(class_name, 0) + 1
-
-                label_content = "\n".join(label_lines)
-                zf.writestr(f"labels/{split_name}/{base_name}.txt", label_content)
-
-                # Write image file (if requested)
-                if include_images:
-                    img_bytes = extract_frame_image(video_path, frame_num)
-                    if img_bytes:
-                        zf.writestr(f"images/{split_name}/{base_name}.jpg", img_bytes)
+            if progress:
+                progress(frames_done)
 
         # Write data.yaml (Ultralytics format)
         data_yaml = {
@@ -268,20 +513,22 @@ async def export_yolo_dataset(
             "val": "images/val",
             "names": CLASS_NAMES
         }
-        zf.writestr("data.yaml", yaml.dump(data_yaml, default_flow_style=False))
+        yield "data.yaml", yaml.dump(data_yaml, default_flow_style=False).encode(), zipfile.ZIP_DEFLATED
 
         # Write export info
         export_info = {
             "export_date": datetime.utcnow().isoformat(),
             "match_id": match_id,
-            "match_name": f"{match.home_team_name} vs {match.away_team_name}",
-            "video_file": match.video_filename,
+            "match_name": match_name,
+            "video_file": video_filename,
             "image_dimensions": {"width": img_width, "height": img_height},
             "export_settings": {
                 "corrected_only": corrected_only,
                 "min_confidence": min_confidence,
                 "train_split": train_split,
-                "include_images": include_images
+                "include_images": include_images,
+                "image_size": image_size,
+                "since_export_id": since_export_id
             },
             "statistics": stats,
             "format_info": {
@@ -290,23 +537,264 @@ async def export_yolo_dataset(
                 "structure": "<class_id> <x_center> <y_center> <width> <height>"
             }
         }
-        zf.writestr("export_info.yaml", yaml.dump(export_info, default_flow_style=False))
+        yield "export_info.yaml", yaml.dump(export_info, default_flow_style=False).encode(), zipfile.ZIP_DEFLATED
 
         # Write classes.txt (some tools expect this)
         classes_txt = "\n".join(CLASS_NAMES[i] for i in sorted(CLASS_NAMES.keys()))
-        zf.writestr("classes.txt", classes_txt)
+        yield "classes.txt", classes_txt.encode(), zipfile.ZIP_DEFLATED
 
-    zip_buffer.seek(0)
+        if delta_manifest_data is not None:
+            yield MANIFEST_FILE, json.dumps(delta_manifest_data, indent=2).encode(), zipfile.ZIP_DEFLATED
 
-    # Generate filename
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    filename = f"football_tracker_match{match_id}_{timestamp}.zip"
+    kind = f"delta{since_export_id}_" if changes is not None else ""
+    return ExportArchive(f"football_tracker_match{match_id}_{kind}{timestamp}.zip", len(frames_data), archive_entries)
 
-    return StreamingResponse(
-        zip_buffer,
-        media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+
+@router.get("/matches/{match_id}/export/yolo")
+async def export_yolo_dataset(
+    match_id: int,
+    corrected_only: bool = Query(True, description="Export only human-corrected detections"),
+    min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    train_split: float = Query(0.8, ge=0.5, le=0.95, description="Training set ratio (remainder is validation)"),
+    include_images: bool = Query(True, description="Include frame images in export"),
+    image_size: Optional[int] = Query(None, ge=32, le=8192, description="Downscale images so the longest side is at most this many pixels"),
+    since_export_id: Optional[int] = Query(None, description="Delta: only frames touched by corrections since this TrainingExport"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export match detections in YOLO format for training.
+
+    Creates a ZIP file with:
+    - images/train/*.jpg
+    - images/val/*.jpg
+    - labels/train/*.txt
+    - labels/val/*.txt
+    - data.yaml (dataset config)
+    - export_info.yaml (metadata about the export)
+    - delta_manifest.json (with since_export_id: updated and removed frames)
+
+    Frames are assigned to train/val by a hash of (match, frame), so they keep
+    their split across exports.
+
+    YOLO label format: <class_id> <x_center> <y_center> <width> <height>
+    All coordinates normalized to 0-1 range.
+
+    Based on Ultralytics dataset structure:
+    https://docs.ultralytics.com/datasets/detect/
+    """
+    return build_yolo_archive(
+        db, match_id, corrected_only=corrected_only, min_confidence=min_confidence,
+        train_split=train_split, include_images=include_images, image_size=image_size,
+        since_export_id=since_export_id,
+    ).response()
+
+
+def build_yolo_dataset_archive(db: Session, match_ids: List[int], corrected_only: bool = True,
+                               min_confidence: float = 0.0, train_split: float = 0.8,
+                               split_by: str = "frame", include_images: bool = True,
+                               image_size: Optional[int] = None) -> ExportArchive:
+    """
+    Validate the matches of a multi-match YOLO dataset and return its archive.
+
+    Frames are split by frame_split, or with split_by="match" whole matches
+    by match_split so no match contributes to both splits. Matches are
+    processed one after another in a single pass while the archive is
+    written, each with its labels in memory only while its frames are
+    written; export_info.yaml (last) holds per-split frame, box and class
+    statistics. Raises HTTPException if a match or its video is missing or
+    nothing matches the criteria.
+    """
+    match_ids = list(dict.fromkeys(match_ids))
+    matches = {m.id: m for m in db.query(Match).filter(Match.id.in_(match_ids)).all()}
+    missing = [match_id for match_id in match_ids if match_id not in matches]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Matches not found: {missing}"
+        )
+
+    # Video and frame size of every match, read now: entries are produced
+    # after the request's session is closed
+    sources = {}
+    no_video = []
+    for match_id in match_ids:
+        match = matches[match_id]
+        video_path = VIDEO_DIR / match.video_filename if match.video_filename else None
+        dimensions = get_video_dimensions(db, match) if video_path and video_path.exists() else None
+        if dimensions is None:
+            no_video.append(match_id)
+            continue
+        sources[match_id] = {
+            "match_name": match_display_name(match),
+            "video_file": match.video_filename,
+            "video_path": video_path,
+            "image_dimensions": dimensions,
+        }
+    if no_video:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Matches without video file: {no_video}"
+        )
+
+    filters = export_detection_filters(corrected_only, min_confidence)
+    total_frames = db.query(func.count(func.distinct(Frame.id))).select_from(Detection).join(
+        Frame, Frame.id == Detection.frame_id
+    ).outerjoin(
+        Track, Track.id == Detection.track_id
+    ).filter(Frame.match_id.in_(match_ids), *filters).scalar()
+
+    if not total_frames:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No detections found matching criteria"
+        )
+
+    def archive_entries(progress=None):
+        split_stats = {
+            name: {"frames": 0, "detections": 0, "corrected_detections": 0,
+                   "class_ids": np.zeros(len(CLASS_NAMES), dtype=np.int64)}
+            for name in ("train", "val")
+        }
+        match_stats = []
+        frames_done = 0
+
+        session = SessionLocal()
+        try:
+            for match_id in match_ids:
+                source = sources[match_id]
+                img_width, img_height = source["image_dimensions"]
+                labels = load_yolo_labels(session, match_id, img_width, img_height,
+                                          corrected_only=corrected_only, min_confidence=min_confidence)
+
+                if split_by == "match":
+                    whole_match = match_split(match_id, train_split)
+                    split_of = dict.fromkeys(labels.frames, whole_match)
+                else:
+                    split_of = {
+                        frame_id: frame_split(match_id, data["frame_number"], train_split)
+                        for frame_id, data in labels.frames.items()
+                    }
+
+                # Split of every box, through its frame
+                frame_keys = np.fromiter(split_of, dtype=np.int64, count=len(split_of))
+                frame_train = np.array([split_of[f] == "train" for f in frame_keys.tolist()], dtype=bool)
+                order = np.argsort(frame_keys)
+                box_train = frame_train[order][np.searchsorted(frame_keys[order], labels.frame_ids)]
+
+                match_frames = {"train": 0, "val": 0}
+                for split_name in split_of.values():
+                    match_frames[split_name] += 1
+                for split_name, in_split in (("train", box_train), ("val", ~box_train)):
+                    stats = split_stats[split_name]
+                    stats["frames"] += match_frames[split_name]
+                    stats["detections"] += int(in_split.sum())
+                    stats["corrected_detections"] += int(labels.corrected[in_split].sum())
+                    stats["class_ids"] += np.bincount(labels.class_ids[in_split], minlength=len(CLASS_NAMES))
+
+                match_stats.append({
+                    "match_id": match_id,
+                    "match_name": source["match_name"],
+                    "video_file": source["video_file"],
+                    "image_dimensions": {"width": img_width, "height": img_height},
+                    "train_frames": match_frames["train"],
+                    "val_frames": match_frames["val"],
+                    "detections": len(labels.class_ids),
+                })
+
+                frame_items = frame_images(source["video_path"], labels.frames, include_images, image_size)
+                for frame_num, frame_id, img_bytes in frame_items:
+                    split_name = split_of[frame_id]
+                    base_name = f"match{match_id}_frame{frame_num:06d}"
+                    label_content = labels.frames[frame_id]["labels"]
+                    yield f"labels/{split_name}/{base_name}.txt", label_content.encode(), zipfile.ZIP_DEFLATED
+                    if img_bytes:
+                        yield f"images/{split_name}/{base_name}.jpg", img_bytes, zipfile.ZIP_STORED
+                    frames_done += 1
+                    if progress:
+                        progress(frames_done)
+                del labels
+        finally:
+            session.close()
+
+        data_yaml = {
+            "path": ".",
+            "train": "images/train",
+            "val": "images/val",
+            "names": CLASS_NAMES
+        }
+        yield "data.yaml", yaml.dump(data_yaml, default_flow_style=False).encode(), zipfile.ZIP_DEFLATED
+
+        splits = {}
+        for split_name, stats in split_stats.items():
+            counts = dict(enumerate(stats.pop("class_ids").tolist()))
+            total = sum(counts.values())
+            splits[split_name] = {
+                **stats,
+                "classes_count": {CLASS_NAMES[c]: n for c, n in counts.items() if n},
+                # Share of each class among the split's boxes
+                "class_balance": {CLASS_NAMES[c]: round(n / total, 4) for c, n in counts.items() if n},
+            }
+
+        export_info = {
+            "export_date": datetime.utcnow().isoformat(),
+            "match_ids": match_ids,
+            "matches": match_stats,
+            "export_settings": {
+                "corrected_only": corrected_only,
+                "min_confidence": min_confidence,
+                "train_split": train_split,
+                "split_by": split_by,
+                "include_images": include_images,
+                "image_size": image_size,
+            },
+            "statistics": {
+                "total_frames": frames_done,
+                "total_detections": sum(stats["detections"] for stats in splits.values()),
+                "splits": splits,
+            },
+            "format_info": {
+                "label_format": "YOLO (Ultralytics)",
+                "coordinates": "normalized (0-1)",
+                "structure": "<class_id> <x_center> <y_center> <width> <height>"
+            }
+        }
+        yield "export_info.yaml", yaml.dump(export_info, default_flow_style=False, sort_keys=False).encode(), zipfile.ZIP_DEFLATED
+
+        classes_txt = "\n".join(CLASS_NAMES[i] for i in sorted(CLASS_NAMES.keys()))
+        yield "classes.txt", classes_txt.encode(), zipfile.ZIP_DEFLATED
+
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    return ExportArchive(f"football_tracker_{len(match_ids)}matches_yolo_{timestamp}.zip", total_frames, archive_entries)
+
+
+@router.get("/export/yolo")
+async def export_yolo_multi_match_dataset(
+    match_ids: List[int] = Query(..., description="Matches to include"),
+    corrected_only: bool = Query(True, description="Export only human-corrected detections"),
+    min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    train_split: float = Query(0.8, ge=0.5, le=0.95, description="Training set ratio (remainder is validation)"),
+    split_by: Literal["frame", "match"] = Query("frame", description="Split individual frames, or whole matches to avoid leakage"),
+    include_images: bool = Query(True, description="Include frame images in export"),
+    image_size: Optional[int] = Query(None, ge=32, le=8192, description="Downscale images so the longest side is at most this many pixels"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export the detections of several matches as one YOLO dataset.
+
+    Same layout and label format as the single-match YOLO export. Frames are
+    assigned to train/val by a hash of (match, frame), or with
+    split_by=match whole matches by a hash of the match, so rebuilding the
+    dataset never moves data between splits. export_info.yaml holds class
+    counts and class balance per split, and frame counts per match.
+    """
+    return build_yolo_dataset_archive(
+        db, match_ids, corrected_only=corrected_only, min_confidence=min_confidence,
+        train_split=train_split, split_by=split_by, include_images=include_images,
+        image_size=image_size,
+    ).response()
 
 
 @router.get("/matches/{match_id}/export/stats")
@@ -319,6 +807,11 @@ async def get_export_stats(
 ):
     """
     Get statistics about what would be exported (preview before download).
+
+    Computed with GROUP BY aggregates over the columns of the
+    idx_detection_frame_stats index, without loading detections: detections
+    are grouped by track and AI class, then each group takes its track's
+    corrected class (if any) and correction state.
     """
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
@@ -327,40 +820,49 @@ async def get_export_stats(
             detail="Match not found"
         )
 
-    # Build query
-    query = db.query(Detection).join(Frame).filter(Frame.match_id == match_id)
+    # Correction state lives on tracks
+    tracks = {
+        track_id: (is_corrected, corrected_class)
+        for track_id, is_corrected, corrected_class in db.query(
+            Track.id, Track.is_corrected, Track.corrected_detection_class
+        ).filter(Track.match_id == match_id)
+    }
 
+    filters = [Frame.match_id == match_id]
     if corrected_only:
-        query = query.filter(Detection.is_corrected == True)
-
+        filters.append(Detection.track_id.in_(
+            select(Track.id).where(Track.match_id == match_id, Track.is_corrected == True)
+        ))
     if min_confidence > 0:
-        query = query.filter(Detection.confidence >= min_confidence)
+        filters.append(Detection.confidence >= min_confidence)
 
-    detections = query.all()
+    def selected(*columns):
+        return db.query(*columns).join(Frame, Frame.id == Detection.frame_id).filter(*filters)
+
+    groups = selected(
+        Detection.track_id, Detection.ai_detection_class, func.count()
+    ).group_by(Detection.track_id, Detection.ai_detection_class).all()
+    frames_with_detections = selected(func.count(func.distinct(Detection.frame_id))).scalar()
 
-    # Calculate stats
-    frames_with_detections = set()
     class_counts = {}
+    total_detections = 0
     corrected_count = 0
-
-    for det in detections:
-        frames_with_detections.add(det.frame_id)
-
-        class_name = det.corrected_class if det.is_corrected and det.corrected_class else det.ai_detection_class
-        if class_name:
-            class_counts[class_name] = class_counts.get(class_name, 0) + 1
-
-        if det.is_corrected:
-            corrected_count += 1
+    for track_id, ai_class, count in groups:
+        is_corrected, corrected_class = tracks.get(track_id, (False, None))
+        class_name = (corrected_class or ai_class).value
+        class_counts[class_name] = class_counts.get(class_name, 0) + count
+        total_detections += count
+        if is_corrected:
+            corrected_count += count
 
     return {
         "match_id": match_id,
-        "match_name": f"{match.home_team_name} vs {match.away_team_name}",
-        "total_detections": len(detections),
+        "match_name": match_display_name(match),
+        "total_detections": total_detections,
         "corrected_detections": corrected_count,
-        "frames_with_detections": len(frames_with_detections),
+        "frames_with_detections": frames_with_detections,
         "by_class": class_counts,
-        "export_ready": len(detections) > 0,
+        "export_ready": total_detections > 0,
         "settings": {
             "corrected_only": corrected_only,
             "min_confidence": min_confidence
@@ -368,6 +870,238 @@ async def get_export_stats(
     }
 
 
+# ============ COCO Export ============
+
+# Rows per server-side cursor fetch when streaming COCO images / annotations
+COCO_FETCH_SIZE = 50000
+
+COCO_IMAGE = (
+    '{"id":%d,"file_name":"match%d_frame%06d.jpg","width":%d,"height":%d,'
+    '"match_id":%d,"frame_number":%d}'
+)
+COCO_ANNOTATION = (
+    '{"id":%d,"image_id":%d,"category_id":%d,"bbox":[%.2f,%.2f,%.2f,%.2f],'
+    '"area":%.2f,"iscrowd":0,"score":%.4f,"is_corrected":%s}'
+)
+
+
+def coco_categories() -> List[dict]:
+    """COCO categories: the YOLO classes, with ids starting at 1."""
+    return [
+        {"id": class_id + 1, "name": name, "supercategory": "ball" if name == "ball" else "person"}
+        for class_id, name in sorted(CLASS_NAMES.items())
+    ]
+
+
+def coco_image_size(db: Session, match: Match) -> Tuple[int, int]:
+    """Frame size of a match: probed from its video, else the stored video dimensions."""
+    dimensions = get_video_dimensions(db, match)
+    if dimensions:
+        return dimensions
+    if match.video_width and match.video_height:
+        return match.video_width, match.video_height
+    return DEFAULT_IMAGE_SIZE
+
+
+def _coco_annotations(partition, img_width: int, img_height: int) -> List[str]:
+    """Format one fetched partition of annotation rows, dropping unmapped classes."""
+    det_ids, frame_ids, classes, teams, corrected, x1, y1, x2, y2, confidence = zip(*partition)
+    category_ids = np.fromiter((YOLO_CLASS_IDS[key] for key in zip(classes, teams)),
+                               dtype=np.int64, count=len(partition)) + 1
+
+    # Clamp boxes to the image, then convert to COCO [x, y, width, height]
+    x1, x2 = (np.clip(np.array(v, dtype=np.float64), 0, img_width) for v in (x1, x2))
+    y1, y2 = (np.clip(np.array(v, dtype=np.float64), 0, img_height) for v in (y1, y2))
+    widths = x2 - x1
+    heights = y2 - y1
+
+    keep = category_ids > 0
+    columns = [
+        np.array(det_ids)[keep].tolist(), np.array(frame_ids)[keep].tolist(), category_ids[keep].tolist(),
+        x1[keep].tolist(), y1[keep].tolist(), widths[keep].tolist(), heights[keep].tolist(),
+        (widths * heights)[keep].tolist(), np.array(confidence, dtype=np.float64)[keep].tolist(),
+        ["true" if c else "false" for c, k in zip(corrected, keep.tolist()) if k],
+    ]
+    return [COCO_ANNOTATION % row for row in zip(*columns)]
+
+
+def stream_coco(image_sizes: Dict[int, Tuple[int, int]], corrected_only: bool,
+                min_confidence: float, info: dict, frames: Optional[Dict[int, List[int]]] = None,
+                delta: Optional[dict] = None) -> Iterator[bytes]:
+    """
+    Yield a COCO detection dataset for the matches of image_sizes
+    ({match_id: (width, height)}) as JSON chunks. frames, if given, restricts
+    each match to those frame numbers; delta is written as a top-level
+    "delta" manifest.
+
+    "images" (frames with at least one selected detection) and "annotations"
+    are each read with a server-side cursor, COCO_FETCH_SIZE rows at a time,
+    and written as they are fetched, so memory does not grow with the number
+    of matches. Image ids are frame ids and annotation ids detection ids, so
+    both are unique across matches. Uses its own session, since the body of
+    a streamed response runs after the request's session is closed.
+    """
+    filters = export_detection_filters(corrected_only, min_confidence)
+
+    def frame_filters(match_id: int) -> list:
+        return [Frame.frame_number.in_(frames[match_id])] if frames is not None else []
+
+    if frames is not None:
+        image_sizes = {match_id: size for match_id, size in image_sizes.items() if frames.get(match_id)}
+
+    db = SessionLocal()
+    try:
+        header = {"info": info, "licenses": [], "categories": coco_categories()}
+        if delta is not None:
+            header["delta"] = delta
+        yield (json.dumps(header)[:-1] + ',"images":[').encode()
+
+        separator = ""
+        for match_id, (img_width, img_height) in image_sizes.items():
+            has_detection = select(Detection.id).outerjoin(
+                Track, Track.id == Detection.track_id
+            ).where(Detection.frame_id == Frame.id, *filters).exists()
+            query = select(Frame.id, Frame.frame_number).where(
+                Frame.match_id == match_id, has_detection, *frame_filters(match_id)
+            ).order_by(Frame.frame_number).execution_options(yield_per=COCO_FETCH_SIZE)
+
+            for partition in db.connection().execute(query).partitions():
+                images = [
+                    COCO_IMAGE % (frame_id, match_id, frame_number, img_width, img_height, match_id, frame_number)
+                    for frame_id, frame_number in partition
+                ]
+                yield (separator + ",".join(images)).encode()
+                separator = ","
+
+        yield b'],"annotations":['
+
+        separator = ""
+        for match_id, (img_width, img_height) in image_sizes.items():
+            query = select(
+                Detection.id,
+                Frame.id,
+                func.coalesce(Track.corrected_detection_class, Detection.ai_detection_class),
+                func.coalesce(Track.corrected_team, Detection.ai_team),
+                func.coalesce(Track.is_corrected, False),
+                Detection.bbox_x1, Detection.bbox_y1, Detection.bbox_x2, Detection.bbox_y2,
+                Detection.confidence,
+            ).join(
+                Frame, Frame.id == Detection.frame_id
+            ).outerjoin(
+                Track, Track.id == Detection.track_id
+            ).where(
+                Frame.match_id == match_id, *filters, *frame_filters(match_id)
+            ).order_by(Frame.frame_number, Detection.id).execution_options(yield_per=COCO_FETCH_SIZE)
+
+            for partition in db.connection().execute(query).partitions():
+                annotations = _coco_annotations(partition, img_width, img_height)
+                if annotations:
+                    yield (separator + ",".join(annotations)).encode()
+                    separator = ","
+
+        yield b"]}"
+    finally:
+        db.close()
+
+
+def coco_export_response(db: Session, match_ids: List[int], corrected_only: bool = True,
+                         min_confidence: float = 0.0, filename: Optional[str] = None,
+                         base_export: Optional[TrainingExport] = None,
+                         changes: Optional[DeltaChanges] = None) -> StreamingResponse:
+    """
+    Validate the matches of a COCO export and stream it (see stream_coco).
+
+    With base_export and changes (a delta training export), only the frames
+    the changes touch are exported, and the document carries a "delta"
+    manifest listing them per match: the training side replaces those
+    frames' images and annotations in the base dataset.
+
+    Raises HTTPException 404 if any match does not exist.
+    """
+    matches = {m.id: m for m in db.query(Match).filter(Match.id.in_(match_ids)).all()}
+    missing = [match_id for match_id in match_ids if match_id not in matches]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Matches not found: {missing}"
+        )
+
+    image_sizes = {match_id: coco_image_size(db, matches[match_id]) for match_id in dict.fromkeys(match_ids)}
+    info = {
+        "description": "Football Tracker detections",
+        "version": "1.0",
+        "date_created": datetime.utcnow().isoformat(),
+        "matches": [
+            {"match_id": match_id, "match_name": match_display_name(matches[match_id])}
+            for match_id in image_sizes
+        ],
+        "export_settings": {
+            "corrected_only": corrected_only,
+            "min_confidence": min_confidence,
+        },
+    }
+
+    frames = delta = None
+    if changes is not None:
+        frames = {match_id: sorted(changes.match_frames(match_id)) for match_id in image_sizes}
+        delta = delta_manifest(
+            base_export, changes,
+            export_settings=info["export_settings"],
+            # Frame numbers whose annotations changed; touched frames that
+            # are not among the images have no annotations any more
+            frames={str(match_id): numbers for match_id, numbers in frames.items()},
+        )
+
+    if filename is None:
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        if len(image_sizes) == 1:
+            filename = f"football_tracker_match{match_ids[0]}_coco_{timestamp}.json"
+        else:
+            filename = f"football_tracker_{len(image_sizes)}matches_coco_{timestamp}.json"
+
+    return StreamingResponse(
+        stream_coco(image_sizes, corrected_only, min_confidence, info, frames=frames, delta=delta),
+        media_type="application/json",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@router.get("/matches/{match_id}/export/coco")
+async def export_coco_dataset(
+    match_id: int,
+    corrected_only: bool = Query(True, description="Export only human-corrected detections"),
+    min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export match detections as a COCO detection dataset (JSON).
+
+    Images are the frames with selected detections (file names as in the
+    YOLO export), categories the YOLO classes with ids starting at 1, and
+    annotation bboxes are [x, y, width, height] in pixels. The file is
+    streamed while it is read from the database.
+    """
+    return coco_export_response(db, [match_id], corrected_only=corrected_only, min_confidence=min_confidence)
+
+
+@router.get("/export/coco")
+async def export_coco_matches(
+    match_ids: List[int] = Query(..., description="Matches to include"),
+    corrected_only: bool = Query(True, description="Export only human-corrected detections"),
+    min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export the detections of several matches as one COCO dataset.
+
+    Same layout as the single-match COCO export; image and annotation ids
+    are unique across matches.
+    """
+    return coco_export_response(db, match_ids, corrected_only=corrected_only, min_confidence=min_confidence)
+
+
 @router.get("/export/class-mapping")
 async def get_class_mapping(
     current_user: User = Depends(get_current_user)
@@ -457,7 +1191,7 @@ async def export_event_corrections(
     # Calculate statistics
     stats = {
         "match_id": match_id,
-        "match_name": f"{match.home_team_name} vs {match.away_team_name}",
+        "match_name": match_display_name(match),
         "export_date": datetime.utcnow().isoformat(),
         "total_events": len(all_events),
         "verified_events": sum(1 for e in all_events if e["is_verified"]),
@@ -490,7 +1224,6 @@ async def export_event_corrections(
             }
 
     # Create ZIP
-    import json
     zip_buffer = io.BytesIO()
 
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
@@ -510,20 +1243,11 @@ async def export_event_corrections(
     )
 
 
-@router.get("/matches/{match_id}/export/all")
-async def export_all_corrections(
-    match_id: int,
-    include_images: bool = Query(False, description="Include frame images (large file)"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+def build_all_corrections_archive(db: Session, match_id: int,
+                                  include_images: bool = False) -> ExportArchive:
     """
-    Export all corrections (detections in YOLO format + events in JSON).
-
-    Creates a comprehensive ZIP with:
-    - detections/ (YOLO format)
-    - events/ (JSON format)
-    - summary.json
+    Load the corrected detections and verified events of a match and return
+    the "export all" archive. See export_all_corrections for the layout.
     """
     from app.models.events import Event
 
@@ -535,15 +1259,12 @@ async def export_all_corrections(
         )
 
     video_path = VIDEO_DIR / match.video_filename if match.video_filename else None
-    img_width, img_height = (1920, 1080)  # Default
+    img_width, img_height = DEFAULT_IMAGE_SIZE
     if video_path and video_path.exists():
-        img_width, img_height = get_video_dimensions(video_path)
+        img_width, img_height = get_video_dimensions(db, match) or DEFAULT_IMAGE_SIZE
+    else:
+        video_path = None
 
-    # Get corrected detections
-    detections = db.query(Detection).join(Frame).filter(
-        Frame.match_id == match_id,
-        Detection.is_corrected == True
-    ).all()
 
     # Get verified events
     events = db.query(Event).filter(
@@ -552,48 +1273,49 @@ async def export_all_corrections(
         Event.is_deleted == False
     ).all()
 
-    # Create ZIP
-    import json
-    zip_buffer = io.BytesIO()
+    # Detection labels (YOLO format) of corrected tracks, only frames with exported boxes
+    labels = load_yolo_labels(db, match_id, img_width, img_height, corrected_only=True)
+    detection_count = len(labels.class_ids)
+    frames_data = {frame_id: data for frame_id, data in labels.frames.items() if data["labels"]}
+
+    # Events JSON
+    events_data = [{
+        "id": e.id,
+        "event_type": str(e.event_type) if e.event_type else None,
+        "timestamp_ms": e.timestamp_ms,
+        "frame_start": e.frame_start,
+        "is_correct": e.is_correct,
+        "corrected_type": e.corrected_type,
+        "ai_confidence": float(e.ai_confidence) if e.ai_confidence else None,
+    } for e in events]
+
+    # Summary
+    summary = {
+        "match_id": match_id,
+        "match_name": match_display_name(match),
+        "export_date": datetime.utcnow().isoformat(),
+        "detections": {
+            "total_corrected": detection_count,
+            "frames_exported": len(frames_data),
+        },
+        "events": {
+            "total_verified": len(events),
+            "correct": sum(1 for e in events if e.is_correct),
+            "incorrect": sum(1 for e in events if not e.is_correct),
+        }
+    }
 
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        # Detection labels (YOLO format)
-        frames_exported = set()
-        detection_count = 0
-
-        frames_data = {}
-        for det in detections:
-            frame = det.frame
-            if frame.id not in frames_data:
-                frames_data[frame.id] = {
-                    "frame_number": frame.frame_number,
-                    "detections": []
-                }
-
-            class_name = det.corrected_class or det.ai_detection_class
-            if class_name and class_name in CLASS_MAPPING:
-                class_id = CLASS_MAPPING[class_name]
-                x_center, y_center, width, height = normalize_bbox(
-                    float(det.bbox_x1), float(det.bbox_y1),
-                    float(det.bbox_x2), float(det.bbox_y2),
-                    img_width, img_height
-                )
-                frames_data[frame.id]["detections"].append(
-                    f"{class_id} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}"
-                )
-                detection_count += 1
-
-        for frame_id, data in frames_data.items():
-            if data["detections"]:
-                base_name = f"match{match_id}_frame{data['frame_number']:06d}"
-                label_content = "\n".join(data["detections"])
-                zf.writestr(f"detections/labels/{base_name}.txt", label_content)
-                frames_exported.add(frame_id)
-
-                if include_images and video_path and video_path.exists():
-                    img_bytes = extract_frame_image(video_path, data["frame_number"])
-                    if img_bytes:
-                        zf.writestr(f"detections/images/{base_name}.jpg", img_bytes)
+    def archive_entries(progress=None):
+        # Frames in video order, so the video is decoded once
+        frame_items = frame_images(video_path, frames_data, include_images)
+        for frames_done, (frame_num, frame_id, img_bytes) in enumerate(frame_items, 1):
+            base_name = f"match{match_id}_frame{frame_num:06d}"
+            label_content = frames_data[frame_id]["labels"]
+            yield f"detections/labels/{base_name}.txt", label_content.encode(), zipfile.ZIP_DEFLATED
+            if img_bytes:
+                yield f"detections/images/{base_name}.jpg", img_bytes, zipfile.ZIP_STORED
+            if progress:
+                progress(frames_done)
 
         # data.yaml for detections
         data_yaml = {
@@ -602,45 +1324,265 @@ async def export_all_corrections(
             "val": "images",
             "names": CLASS_NAMES
         }
-        zf.writestr("detections/data.yaml", yaml.dump(data_yaml, default_flow_style=False))
+        yield "detections/data.yaml", yaml.dump(data_yaml, default_flow_style=False).encode(), zipfile.ZIP_DEFLATED
 
-        # Events JSON
-        events_data = [{
-            "id": e.id,
-            "event_type": str(e.event_type) if e.event_type else None,
-            "timestamp_ms": e.timestamp_ms,
-            "frame_start": e.frame_start,
-            "is_correct": e.is_correct,
-            "corrected_type": e.corrected_type,
-            "ai_confidence": float(e.ai_confidence) if e.ai_confidence else None,
-        } for e in events]
+        yield "events/events.json", json.dumps(events_data, indent=2).encode(), zipfile.ZIP_DEFLATED
+        yield "summary.json", json.dumps(summary, indent=2).encode(), zipfile.ZIP_DEFLATED
 
-        zf.writestr("events/events.json", json.dumps(events_data, indent=2))
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    return ExportArchive(f"all_corrections_match{match_id}_{timestamp}.zip", len(frames_data), archive_entries)
 
-        # Summary
-        summary = {
-            "match_id": match_id,
-            "match_name": f"{match.home_team_name} vs {match.away_team_name}",
-            "export_date": datetime.utcnow().isoformat(),
-            "detections": {
-                "total_corrected": detection_count,
-                "frames_exported": len(frames_exported),
-            },
-            "events": {
-                "total_verified": len(events),
-                "correct": sum(1 for e in events if e.is_correct),
-                "incorrect": sum(1 for e in events if not e.is_correct),
-            }
-        }
-        zf.writestr("summary.json", json.dumps(summary, indent=2))
 
-    zip_buffer.seek(0)
+@router.get("/matches/{match_id}/export/all")
+async def export_all_corrections(
+    match_id: int,
+    include_images: bool = Query(False, description="Include frame images (large file)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export all corrections (detections in YOLO format + events in JSON).
 
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    filename = f"all_corrections_match{match_id}_{timestamp}.zip"
+    Creates a comprehensive ZIP with:
+    - detections/ (YOLO format)
+    - events/ (JSON format)
+    - summary.json
+    """
+    return build_all_corrections_archive(db, match_id, include_images=include_images).response()
+
+
+# ============================================================================
+# BACKGROUND EXPORT JOBS
+# ============================================================================
+
+register_builder("yolo", build_yolo_archive)
+register_builder("all", build_all_corrections_archive)
+register_builder("yolo_dataset", build_yolo_dataset_archive)
+
+# Bytes read per chunk when serving export files
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=start-end" header into inclusive (start, end).
+
+    Returns (0, size - 1) for headers that should be ignored (other units,
+    malformed or multiple ranges) and None if the range is unsatisfiable.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return 0, size - 1
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return 0, size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _file_chunks(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
 
+
+def file_range_response(path: Path, request: Request, media_type: str = "application/zip") -> Response:
+    """
+    Serve a file with HTTP Range support (206 Partial Content), so clients can
+    resume interrupted downloads. If-Range with a stale ETag gets the full file.
+    """
+    stat = path.stat()
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": f"attachment; filename={path.name}",
+    }
+
+    start, end = 0, size - 1
+    status_code = status.HTTP_200_OK
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and size > 0 and (if_range is None or if_range == etag):
+        byte_range = parse_byte_range(range_header, size)
+        if byte_range is None:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"},
+            )
+        start, end = byte_range
+        if (start, end) != (0, size - 1):
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(max(0, end - start + 1))
     return StreamingResponse(
-        zip_buffer,
-        media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        _file_chunks(path, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def _get_match_or_404(db: Session, match_id: int) -> Match:
+    match = db.query(Match).filter(Match.id == match_id).first()
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found"
+        )
+    return match
+
+
+@router.post("/matches/{match_id}/export/yolo/jobs", response_model=TrainingExportResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+async def submit_yolo_export_job(
+    match_id: int,
+    corrected_only: bool = Query(True, description="Export only human-corrected detections"),
+    min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    train_split: float = Query(0.8, ge=0.5, le=0.95, description="Training set ratio (remainder is validation)"),
+    include_images: bool = Query(True, description="Include frame images in export"),
+    image_size: Optional[int] = Query(None, ge=32, le=8192, description="Downscale images so the longest side is at most this many pixels"),
+    since_export_id: Optional[int] = Query(None, description="Delta: only frames touched by corrections since this TrainingExport"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Queue a YOLO export (same options and archive as export_yolo_dataset) to
+    be built in the background.
+
+    Poll GET /jobs/{id} for status and progress; once completed, download
+    the archive from GET /jobs/{id}/download.
+    """
+    _get_match_or_404(db, match_id)
+    if since_export_id is not None:
+        get_base_export(db, since_export_id)
+    export = TrainingExport(
+        export_type=ExportType.DETECTION,
+        export_format=ExportFormat.YOLO,
+        match_ids=[match_id],
+        created_by_user_id=current_user.id,
+    )
+    return submit_export_job(
+        db, export, "yolo", match_id,
+        corrected_only=corrected_only, min_confidence=min_confidence, train_split=train_split,
+        include_images=include_images, image_size=image_size, since_export_id=since_export_id,
+    )
+
+
+@router.post("/matches/{match_id}/export/all/jobs", response_model=TrainingExportResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+async def submit_all_corrections_export_job(
+    match_id: int,
+    include_images: bool = Query(False, description="Include frame images (large file)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue an "export all" archive (see export_all_corrections) to be built in the background."""
+    _get_match_or_404(db, match_id)
+    export = TrainingExport(
+        export_type=ExportType.ALL,
+        export_format=ExportFormat.YOLO,
+        match_ids=[match_id],
+        created_by_user_id=current_user.id,
+    )
+    return submit_export_job(db, export, "all", match_id, include_images=include_images)
+
+
+@router.post("/export/yolo/jobs", response_model=TrainingExportResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+async def submit_yolo_dataset_export_job(
+    match_ids: List[int] = Query(..., description="Matches to include"),
+    corrected_only: bool = Query(True, description="Export only human-corrected detections"),
+    min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
+    train_split: float = Query(0.8, ge=0.5, le=0.95, description="Training set ratio (remainder is validation)"),
+    split_by: Literal["frame", "match"] = Query("frame", description="Split individual frames, or whole matches to avoid leakage"),
+    include_images: bool = Query(True, description="Include frame images in export"),
+    image_size: Optional[int] = Query(None, ge=32, le=8192, description="Downscale images so the longest side is at most this many pixels"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a multi-match YOLO dataset (see export_yolo_multi_match_dataset) to be built in the background."""
+    match_ids = list(dict.fromkeys(match_ids))
+    for match_id in match_ids:
+        _get_match_or_404(db, match_id)
+    export = TrainingExport(
+        export_type=ExportType.DETECTION,
+        export_format=ExportFormat.YOLO,
+        match_ids=match_ids,
+        created_by_user_id=current_user.id,
+    )
+    return submit_export_job(
+        db, export, "yolo_dataset", match_ids,
+        corrected_only=corrected_only, min_confidence=min_confidence, train_split=train_split,
+        split_by=split_by, include_images=include_images, image_size=image_size,
     )
+
+
+def _get_export_job_or_404(db: Session, export_id: int) -> TrainingExport:
+    export = db.query(TrainingExport).filter(
+        TrainingExport.id == export_id,
+        TrainingExport.status.isnot(None)
+    ).first()
+    if not export:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    return export
+
+
+@router.get("/jobs/{export_id}", response_model=TrainingExportResponse)
+async def get_export_job(
+    export_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Status of an export job; progress_done / progress_total count frames written."""
+    return _get_export_job_or_404(db, export_id)
+
+
+@router.get("/jobs/{export_id}/download")
+async def download_export_job(
+    export_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download a completed export job's archive.
+
+    Supports Range requests, so interrupted downloads can be resumed
+    (e.g. curl -C -).
+    """
+    export = _get_export_job_or_404(db, export_id)
+    if export.status != ExportStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is {export.status.value}"
+        )
+
+    path = Path(export.file_path)
+    if not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export file no longer exists"
+        )
+    return file_range_response(path, request)
@@ -0,0 +1,267 @@
+"""
+Football Tracker - Frame Image Router
+Video frames and timeline thumbnails for the detection review UI.
+
+Decoded frames are kept in the shared VideoReaderPool (app/video.py). After
+each request the neighbouring frames are decoded in the background, reading
+ahead in the direction the analyst is stepping, so the next request is
+usually served from memory.
+"""
+
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Literal, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import FileResponse, JSONResponse, Response
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database import get_db
+from app.models.team import Match
+from app.models.user import User
+from app.auth import get_current_user, get_current_user_or_token_param, require_analyst
+from app.change_version import etag_matches
+from app.frame_cache import video_identity
+from app.models.training import ExportStatus
+from app.sprites import (
+    load_sprite_index, sheet_path, sprite_job, sprite_job_status, submit_sprite_job
+)
+from app.video import get_video_pool, match_video_metadata, match_video_path, process_image
+
+router = APIRouter()
+
+# Frames decoded ahead when consecutive frames are requested
+READAHEAD_FRAMES = 8
+
+# Frames around a random-access request that are decoded in the background
+NEIGHBOUR_FRAMES = 2
+
+# Frame images only change if the video file does
+CACHE_MAX_AGE = 24 * 60 * 60
+
+IMAGE_MEDIA_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+# Prefetching runs on one thread: batches decode sequentially on pooled
+# handles, and one batch at a time keeps the decoder from competing with
+# requests
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-prefetch")
+
+# (video path, frame number) -> prefetch batch decoding it. Batches are
+# registered under the lock before their worker can remove them.
+_inflight: Dict[Tuple[str, int], Future] = {}
+_inflight_lock = threading.Lock()
+
+# match_id -> last frame number requested (event loop only)
+_last_requested: Dict[int, int] = {}
+
+
+def prefetch_frames(frame_number: int, previous: Optional[int], total_frames: int) -> List[int]:
+    """
+    Frames to decode after serving frame_number: the next READAHEAD_FRAMES
+    when stepping forward, the previous ones when stepping backward, and the
+    NEIGHBOUR_FRAMES on either side after a jump.
+    """
+    step = frame_number - previous if previous is not None else None
+    if step is not None and 0 < step <= 2:
+        numbers = range(frame_number + 1, frame_number + 1 + READAHEAD_FRAMES)
+    elif step is not None and -2 <= step < 0:
+        numbers = range(frame_number - READAHEAD_FRAMES, frame_number)
+    else:
+        numbers = [n for n in range(frame_number - NEIGHBOUR_FRAMES, frame_number + NEIGHBOUR_FRAMES + 1)
+                   if n != frame_number]
+    return [n for n in numbers if 0 <= n and (not total_frames or n < total_frames)]
+
+
+def _run_prefetch(video_path, frame_numbers: List[int]):
+    try:
+        get_video_pool().prefetch(video_path, frame_numbers)
+    finally:
+        with _inflight_lock:
+            for frame_number in frame_numbers:
+                _inflight.pop((str(video_path), frame_number), None)
+
+
+def schedule_prefetch(video_path, frame_numbers: List[int]):
+    """Decode frame_numbers into the pool's frame LRU in the background."""
+    with _inflight_lock:
+        pending = [n for n in frame_numbers if (str(video_path), n) not in _inflight]
+        if not pending:
+            return
+        future = _prefetch_executor.submit(_run_prefetch, video_path, pending)
+        for frame_number in pending:
+            _inflight[(str(video_path), frame_number)] = future
+
+
+def shutdown_prefetch():
+    _prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_match_video(db: Session, match_id: int):
+    """(match, video path); 404 if the match or its video file does not exist."""
+    match = db.query(Match).filter(Match.id == match_id).first()
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found"
+        )
+
+    video_path = match_video_path(match)
+    if video_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match has no video file"
+        )
+    return match, video_path
+
+
+def sprite_version(index: dict) -> str:
+    """Short id of one build of a match's sprites, used in sheet URLs and ETags."""
+    return hashlib.sha1(f"{index['video_identity']}:{index['generated_at']}".encode()).hexdigest()[:16]
+
+
+@router.get("/matches/{match_id}/frames/{frame_number}/image")
+async def get_frame_image(
+    request: Request,
+    match_id: int,
+    frame_number: int = Path(..., ge=0),
+    max_size: Optional[int] = Query(None, ge=32, le=8192, description="Downscale so the longest side is at most this many pixels"),
+    image_format: Literal["jpeg", "webp"] = Query("jpeg", alias="format", description="Image encoding"),
+    quality: int = Query(85, ge=1, le=100, description="JPEG / WebP quality"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_or_token_param)
+):
+    """
+    Get the video frame image for a frame number.
+
+    Accepts the access token as ?token= as well, so the image URL can be used
+    directly in an <img> element. Responses carry an ETag and may be cached
+    by the client; repeat requests with If-None-Match get 304 without
+    decoding. Probing and decoding run off the event loop, and neighbouring
+    frames are prefetched into the server's frame cache.
+    """
+    match, video_path = get_match_video(db, match_id)
+
+    def probe():
+        return match_video_metadata(db, match), video_identity(video_path)
+
+    metadata, identity = await run_in_threadpool(probe)
+    total_frames = metadata.frame_count if metadata else 0
+    if total_frames and frame_number >= total_frames:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Frame {frame_number} is past the end of the video ({total_frames} frames)"
+        )
+
+    # The image depends only on the video content and the options
+    version = f"{identity}:{frame_number}:{max_size}:{image_format}:{quality}"
+    etag = '"' + hashlib.sha1(version.encode()).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={CACHE_MAX_AGE}"}
+
+    previous = _last_requested.get(match_id)
+    _last_requested[match_id] = frame_number
+
+    if etag_matches(request, etag):
+        schedule_prefetch(video_path, prefetch_frames(frame_number, previous, total_frames))
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Frame already being prefetched: wait for it instead of decoding it twice
+    inflight = _inflight.get((str(video_path), frame_number))
+    if inflight is not None:
+        await asyncio.wrap_future(inflight)
+
+    def render() -> Optional[bytes]:
+        image = get_video_pool().read_frame(video_path, frame_number)
+        if image is None:
+            return None
+        return process_image(image, quality, max_size, image_format=image_format)
+
+    data = await run_in_threadpool(render)
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Could not read frame {frame_number}"
+        )
+
+    schedule_prefetch(video_path, prefetch_frames(frame_number, previous, total_frames))
+    return Response(content=data, media_type=IMAGE_MEDIA_TYPES[image_format], headers=headers)
+
+
+@router.get("/matches/{match_id}/sprites")
+async def get_sprites(
+    request: Request,
+    match_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the timeline thumbnail index of a match.
+
+    Returns the sprite index (see app/sprites.py) with a URL per sheet. If the
+    sheets have not been generated yet, or were generated from a different
+    video, a background job is queued and 202 with its progress is returned;
+    poll until the index is ready.
+    """
+    _, video_path = get_match_video(db, match_id)
+
+    index = await run_in_threadpool(load_sprite_index, match_id, video_path)
+    if index is None:
+        job = sprite_job(match_id)
+        if job is None or job.status == ExportStatus.COMPLETED:
+            job = submit_sprite_job(match_id)
+        if job.status == ExportStatus.FAILED:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Thumbnail generation failed: {job.error_message}"
+            )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=sprite_job_status(job))
+
+    version = sprite_version(index)
+    for sheet in index["sheets"]:
+        url = request.url_for("get_sprite_sheet", match_id=match_id, sheet=sheet["sheet"])
+        sheet["url"] = str(url.include_query_params(v=version))
+    return {**index, "status": ExportStatus.COMPLETED.value}
+
+
+@router.post("/matches/{match_id}/sprites", status_code=status.HTTP_202_ACCEPTED)
+async def generate_sprites(
+    match_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_analyst)
+):
+    """(Re)generate the timeline thumbnails of a match in the background."""
+    get_match_video(db, match_id)
+    return sprite_job_status(submit_sprite_job(match_id))
+
+
+@router.get("/matches/{match_id}/sprites/{sheet}")
+async def get_sprite_sheet(
+    request: Request,
+    match_id: int,
+    sheet: int = Path(..., ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get one thumbnail sprite sheet (JPEG).
+
+    Sheet URLs from the index carry the build version, so sheets are cached
+    by the client until the sprites are regenerated.
+    """
+    _, video_path = get_match_video(db, match_id)
+
+    index = await run_in_threadpool(load_sprite_index, match_id, video_path)
+    path = sheet_path(match_id, sheet)
+    if index is None or sheet >= len(index["sheets"]) or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sprite sheet not found"
+        )
+
+    etag = f'"{sprite_version(index)}-{sheet}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={CACHE_MAX_AGE}"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
@@ -11,6 +11,8 @@ from app.schemas.team import (
     MatchPlayerCreate, MatchPlayerUpdate, MatchPlayerResponse
 )
 from app.auth import get_current_user, require_analyst
+from app.change_version import bump_match_version
+from app.payload_cache import invalidate_frames
 
 router = APIRouter(prefix="/matches", tags=["Matches"])
 
@@ -113,8 +115,11 @@ async def update_match(
     for key, value in match_data.model_dump(exclude_unset=True).items():
         setattr(match, key, value)
 
+    bump_match_version(db, match.id)
     db.commit()
     db.refresh(match)
+    # fps and total_frames are part of frame payloads
+    invalidate_frames(match.id)
 
     # Reload with relationships
     match = db.query(Match).options(
@@ -138,6 +143,7 @@ async def delete_match(
 
     db.delete(match)
     db.commit()
+    invalidate_frames(match_id)
     return {"message": "Match deleted"}
 
 
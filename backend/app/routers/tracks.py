@@ -1,6 +1,6 @@
 """Tracks router."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.tracking import Track, Detection, Frame, TeamSide, DetectionClass
@@ -9,12 +9,16 @@ from app.models.user import User
 from app.models.corrections import Correction, CorrectionType
 from app.schemas.tracking import TrackResponse, TrackUpdate, TrackListResponse, DetectionResponse
 from app.auth import get_current_user, require_analyst
+from app.change_version import bump_match_version, etag_headers, etag_matches, match_etag, not_modified
+from app.payload_cache import invalidate_track
 
 router = APIRouter(prefix="/matches/{match_id}/tracks", tags=["Tracks"])
 
 
 @router.get("", response_model=List[TrackListResponse])
 async def list_tracks(
+    request: Request,
+    response: Response,
     match_id: int,
     team: Optional[TeamSide] = Query(None, description="Filter by team"),
     detection_class: Optional[DetectionClass] = Query(None, description="Filter by class"),
@@ -24,12 +28,17 @@ async def list_tracks(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List tracks in a match."""
+    """List tracks in a match (with an ETag from the match's change version)."""
     # Verify match exists
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
+    etag = match_etag(request, match_id, match.data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+
     query = db.query(Track).filter(Track.match_id == match_id)
 
     if team:
@@ -154,6 +163,7 @@ async def update_track(
     if "is_reviewed" not in update_data:
         track.is_reviewed = True
 
+    bump_match_version(db, track.match_id)
     db.commit()
 
     # Create correction record
@@ -170,9 +180,11 @@ async def update_track(
             corrected_value=corrected_values,
         )
         db.add(correction)
+        bump_match_version(db, track.match_id)
         db.commit()
 
     db.refresh(track)
+    invalidate_track(track)
 
     return TrackResponse(
         id=track.id,
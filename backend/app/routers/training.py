@@ -17,6 +17,7 @@ from app.models.team import Match
 from app.models.user import User, UserRole
 from app.schemas.training import TrainingExportCreate, TrainingExportResponse
 from app.auth import get_current_user, require_admin
+from app.training_delta import get_base_export, collect_delta_changes, delta_manifest
 
 router = APIRouter(prefix="/training", tags=["Training"])
 
@@ -45,7 +46,17 @@ async def create_export(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Create a new training data export."""
+    """
+    Create a new training data export.
+
+    With since_export_id the export is a delta: it counts, marks and later
+    downloads only the corrections made since that export and the frames,
+    tracks and events they touch (see app/training_delta.py).
+    """
+    base = None
+    if export_data.since_export_id is not None:
+        base = get_base_export(db, export_data.since_export_id)
+
     # Get matches to include
     if export_data.match_ids:
         matches = db.query(Match).filter(Match.id.in_(export_data.match_ids)).all()
@@ -58,18 +69,28 @@ async def create_export(
         raise HTTPException(status_code=400, detail="No matches found for export")
 
     # Count data
-    correction_count = db.query(func.count(Correction.id)).filter(
-        Correction.match_id.in_(match_ids),
-        Correction.used_in_training == False
-    ).scalar()
-
-    frame_count = db.query(func.count(Frame.id)).filter(
-        Frame.match_id.in_(match_ids)
-    ).scalar()
+    if base is None:
+        correction_count = db.query(func.count(Correction.id)).filter(
+            Correction.match_id.in_(match_ids),
+            Correction.used_in_training == False
+        ).scalar()
+
+        frame_count = db.query(func.count(Frame.id)).filter(
+            Frame.match_id.in_(match_ids)
+        ).scalar()
+
+        event_count = db.query(func.count(Event.id)).filter(
+            Event.match_id.in_(match_ids)
+        ).scalar()
+    else:
+        changes = collect_delta_changes(db, base, match_ids)
+        correction_count = len(changes.correction_ids)
+        frame_count = sum(len(frames) for frames in changes.frames.values())
+        event_count = len(changes.event_ids)
 
-    event_count = db.query(func.count(Event.id)).filter(
-        Event.match_id.in_(match_ids)
-    ).scalar()
+    export_config = export_data.export_config
+    if base is not None:
+        export_config = {**(export_config or {}), "since_export_id": base.id}
 
     # Get date range
     date_range = db.query(
@@ -87,7 +108,7 @@ async def create_export(
         event_count=event_count,
         data_start_date=datetime.combine(date_range[0], datetime.min.time()) if date_range[0] else None,
         data_end_date=datetime.combine(date_range[1], datetime.max.time()) if date_range[1] else None,
-        export_config=export_data.export_config,
+        export_config=export_config,
         notes=export_data.notes,
         created_by_user_id=current_user.id,
     )
@@ -97,10 +118,14 @@ async def create_export(
     db.refresh(export)
 
     # Mark corrections as used
-    db.query(Correction).filter(
+    unused = db.query(Correction).filter(
         Correction.match_id.in_(match_ids),
         Correction.used_in_training == False
-    ).update({Correction.used_in_training: True, Correction.training_export_id: export.id})
+    )
+    if base is not None:
+        unused = unused.filter(Correction.id.in_(changes.correction_ids))
+    unused.update({Correction.used_in_training: True, Correction.training_export_id: export.id},
+                  synchronize_session=False)
 
     db.commit()
 
@@ -134,6 +159,23 @@ async def download_export(
     if not export:
         raise HTTPException(status_code=404, detail="Export not found")
 
+    if export.export_format == ExportFormat.COCO:
+        # Detection dataset, streamed from the database; deltas only hold
+        # the frames their corrections touch
+        from app.routers.export import coco_export_response
+        config = export.export_config or {}
+        base = changes = None
+        if config.get("since_export_id") is not None:
+            base = get_base_export(db, config["since_export_id"])
+            changes = collect_delta_changes(db, base, export.match_ids or [], until=export.created_at)
+        return coco_export_response(
+            db, export.match_ids or [],
+            corrected_only=config.get("corrected_only", True),
+            min_confidence=config.get("min_confidence", 0.0),
+            filename=f"training_export_{export.id}.json",
+            base_export=base, changes=changes,
+        )
+
     # Generate export data based on type
     data = generate_export_data(db, export)
 
@@ -159,7 +201,13 @@ async def download_export(
 
 
 def generate_export_data(db: Session, export: TrainingExport) -> dict:
-    """Generate export data based on export type."""
+    """
+    Generate export data based on export type.
+
+    Delta exports include only the events, tracks and corrections changed
+    between their base export and their own creation, plus a "delta"
+    manifest listing the touched frames per match.
+    """
     match_ids = export.match_ids or []
 
     data = {
@@ -169,6 +217,20 @@ def generate_export_data(db: Session, export: TrainingExport) -> dict:
         "matches": [],
     }
 
+    changes = None
+    since_export_id = (export.export_config or {}).get("since_export_id")
+    if since_export_id is not None:
+        base = get_base_export(db, since_export_id)
+        changes = collect_delta_changes(db, base, match_ids, until=export.created_at)
+        data["delta"] = delta_manifest(
+            base, changes,
+            # Replace these matches' events / tracks in the base export by id;
+            # frames lists the frame numbers whose annotations changed
+            frames={str(m): sorted(changes.match_frames(m)) for m in match_ids},
+            track_ids=sorted(changes.track_ids),
+            event_ids=sorted(changes.event_ids),
+        )
+
     for match_id in match_ids:
         match = db.query(Match).filter(Match.id == match_id).first()
         if not match:
@@ -184,10 +246,13 @@ def generate_export_data(db: Session, export: TrainingExport) -> dict:
 
         if export.export_type in [ExportType.EVENT_DETECTION, ExportType.ALL]:
             # Include events with corrections
-            events = db.query(Event).filter(
+            events_query = db.query(Event).filter(
                 Event.match_id == match_id,
                 Event.is_deleted == False
-            ).all()
+            )
+            if changes is not None:
+                events_query = events_query.filter(Event.id.in_(changes.event_ids))
+            events = events_query.all()
 
             match_data["events"] = [
                 {
@@ -215,7 +280,10 @@ def generate_export_data(db: Session, export: TrainingExport) -> dict:
 
         if export.export_type in [ExportType.TRACKING, ExportType.TEAM_CLASSIFICATION, ExportType.ALL]:
             # Include tracks with corrections
-            tracks = db.query(Track).filter(Track.match_id == match_id).all()
+            tracks_query = db.query(Track).filter(Track.match_id == match_id)
+            if changes is not None:
+                tracks_query = tracks_query.filter(Track.id.in_(changes.track_ids))
+            tracks = tracks_query.all()
 
             match_data["tracks"] = [
                 {
@@ -236,10 +304,12 @@ def generate_export_data(db: Session, export: TrainingExport) -> dict:
             ]
 
         # Include corrections
-        corrections = db.query(Correction).filter(
-            Correction.match_id == match_id,
-            Correction.training_export_id == export.id
-        ).all()
+        corrections_query = db.query(Correction).filter(Correction.match_id == match_id)
+        if changes is not None:
+            corrections_query = corrections_query.filter(Correction.id.in_(changes.correction_ids))
+        else:
+            corrections_query = corrections_query.filter(Correction.training_export_id == export.id)
+        corrections = corrections_query.all()
 
         match_data["corrections"] = [
             {
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
-from app.models.training import ExportFormat, ExportType, MetricCategory
+from app.models.training import ExportFormat, ExportStatus, ExportType, MetricCategory
 
 
 class TrainingExportCreate(BaseModel):
@@ -10,6 +10,7 @@ class TrainingExportCreate(BaseModel):
     export_type: ExportType
     export_format: ExportFormat
     match_ids: Optional[List[int]] = None  # None = all matches
+    since_export_id: Optional[int] = None  # Delta: only changes since this export
     export_config: Optional[Dict[str, Any]] = None
     notes: Optional[str] = None
 
@@ -27,6 +28,11 @@ class TrainingExportResponse(BaseModel):
     data_end_date: Optional[datetime]
     file_path: Optional[str]
     file_size_bytes: Optional[int]
+    status: Optional[ExportStatus] = None
+    progress_done: int = 0
+    progress_total: int = 0
+    error_message: Optional[str] = None
+    completed_at: Optional[datetime] = None
     export_config: Optional[Dict[str, Any]]
     notes: Optional[str]
     created_by_user_id: Optional[int]
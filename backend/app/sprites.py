@@ -0,0 +1,224 @@
+"""
+Timeline thumbnail sprite sheets.
+
+The review timeline shows a thumbnail every settings.sprite_interval_seconds.
+A background job decodes the match video once, front to back, downscales the
+sampled frames to settings.sprite_tile_width and packs them row by row into
+JPEG sheets of sprite_columns x sprite_rows tiles.
+
+Sheets are written to settings.sprite_dir/match_<id>/ together with
+index.json, which maps frame ranges to sheets: tile i covers frames
+[i * interval_frames, (i + 1) * interval_frames), and sheet s holds tiles
+s * tiles_per_sheet onwards. The index records the video's identity, so
+sheets of a replaced video are rebuilt instead of served.
+
+Job state is kept in memory; sheets are on disk, so a restart only loses
+jobs still running, and requesting the sprites again requeues them.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.frame_cache import video_identity
+from app.models.team import Match
+from app.models.training import ExportStatus
+from app.video import SequentialFrameReader, encode_image, match_video_metadata, match_video_path
+
+INDEX_FILE = "index.json"
+SHEET_FILE = "sheet_{:04d}.jpg"
+SPRITE_QUALITY = 75
+
+
+@dataclass
+class SpriteJob:
+    """In-memory state of a match's sprite job (tiles done / total)."""
+    status: ExportStatus
+    progress_done: int = 0
+    progress_total: int = 0
+    error_message: Optional[str] = None
+
+
+_jobs: Dict[int, SpriteJob] = {}
+_jobs_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def sprite_dir(match_id: int) -> Path:
+    return Path(get_settings().sprite_dir) / f"match_{match_id}"
+
+
+def sheet_path(match_id: int, sheet: int) -> Path:
+    return sprite_dir(match_id) / SHEET_FILE.format(sheet)
+
+
+def sprite_tiles(fps: float, frame_count: int, interval_seconds: float):
+    """(frames per tile, number of tiles) for a video."""
+    interval_frames = max(1, round(fps * interval_seconds))
+    return interval_frames, (frame_count + interval_frames - 1) // interval_frames
+
+
+def build_sprites(video_path: Path, out_dir: Path, fps: float, frame_count: int,
+                  width: int, height: int, interval_seconds: float, tile_width: int,
+                  columns: int, rows: int,
+                  progress: Optional[Callable[[int], None]] = None) -> dict:
+    """
+    Write the sprite sheets of a video and its index to out_dir, in one
+    sequential decode. Returns the index. Frames that fail to decode leave
+    their tile black.
+    """
+    interval_frames, tile_count = sprite_tiles(fps, frame_count, interval_seconds)
+    tile_height = max(1, round(tile_width * height / width)) if width else tile_width
+    per_sheet = columns * rows
+
+    sheets = []
+    sheet_image = None
+
+    def write_sheet(sheet: int, tiles: int):
+        used_rows = (tiles + columns - 1) // columns
+        data = encode_image(sheet_image[:used_rows * tile_height], "jpeg", SPRITE_QUALITY)
+        (out_dir / SHEET_FILE.format(sheet)).write_bytes(data)
+        first_frame = sheet * per_sheet * interval_frames
+        sheets.append({
+            "sheet": sheet,
+            "first_frame": first_frame,
+            "last_frame": min(frame_count, first_frame + tiles * interval_frames) - 1,
+            "tiles": tiles,
+        })
+
+    with SequentialFrameReader(video_path) as reader:
+        frame_numbers = range(0, tile_count * interval_frames, interval_frames)
+        for tile, (_, image) in enumerate(reader.read(frame_numbers)):
+            sheet, position = divmod(tile, per_sheet)
+            if position == 0:
+                sheet_image = np.zeros((rows * tile_height, columns * tile_width, 3), dtype=np.uint8)
+            if image is not None:
+                row, column = divmod(position, columns)
+                sheet_image[row * tile_height:(row + 1) * tile_height,
+                            column * tile_width:(column + 1) * tile_width] = cv2.resize(
+                    image, (tile_width, tile_height), interpolation=cv2.INTER_AREA)
+            if position == per_sheet - 1 or tile == tile_count - 1:
+                write_sheet(sheet, position + 1)
+            if progress:
+                progress(tile + 1)
+
+    index = {
+        "video_identity": video_identity(video_path),
+        "generated_at": datetime.utcnow().isoformat(),
+        "fps": fps,
+        "frame_count": frame_count,
+        "interval_frames": interval_frames,
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "columns": columns,
+        "rows": rows,
+        "tiles_per_sheet": per_sheet,
+        "tile_count": tile_count,
+        "sheets": sheets,
+    }
+    (out_dir / INDEX_FILE).write_text(json.dumps(index))
+    return index
+
+
+def load_sprite_index(match_id: int, video_path: Path) -> Optional[dict]:
+    """The match's sprite index, None if not built or built from another video."""
+    try:
+        index = json.loads((sprite_dir(match_id) / INDEX_FILE).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if index.get("video_identity") != video_identity(video_path):
+        return None
+    return index
+
+
+def _replace_dir(tmp_dir: Path, target: Path):
+    """Swap a finished sprite directory in place of the previous one."""
+    stale = None
+    if target.exists():
+        stale = target.with_name(f"{target.name}.stale-{os.getpid()}-{threading.get_ident()}")
+        os.replace(target, stale)
+    os.replace(tmp_dir, target)
+    if stale is not None:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def run_sprite_job(match_id: int):
+    """Build a match's sprite sheets, recording progress on its SpriteJob."""
+    job = _jobs[match_id]
+    job.status = ExportStatus.RUNNING
+    settings = get_settings()
+    db = SessionLocal()
+    tmp_dir = None
+    try:
+        match = db.query(Match).filter(Match.id == match_id).first()
+        video_path = match_video_path(match) if match else None
+        metadata = match_video_metadata(db, match) if video_path else None
+        if metadata is None:
+            raise ValueError("Match has no readable video file")
+        fps = match.fps or metadata.fps
+
+        _, job.progress_total = sprite_tiles(fps, metadata.frame_count, settings.sprite_interval_seconds)
+
+        def progress(tiles_done: int):
+            job.progress_done = tiles_done
+
+        root = Path(settings.sprite_dir)
+        root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=root, prefix=f"match_{match_id}.tmp-"))
+        build_sprites(
+            video_path, tmp_dir, fps, metadata.frame_count, metadata.width, metadata.height,
+            settings.sprite_interval_seconds, settings.sprite_tile_width,
+            settings.sprite_columns, settings.sprite_rows, progress,
+        )
+        _replace_dir(tmp_dir, sprite_dir(match_id))
+        tmp_dir = None
+        job.status = ExportStatus.COMPLETED
+    except Exception as e:
+        job.status = ExportStatus.FAILED
+        job.error_message = f"{type(e).__name__}: {e}"
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        db.close()
+
+
+def submit_sprite_job(match_id: int) -> SpriteJob:
+    """Queue a sprite build for a match, unless one is already queued or running."""
+    global _executor
+    with _jobs_lock:
+        job = _jobs.get(match_id)
+        if job is not None and job.status in (ExportStatus.PENDING, ExportStatus.RUNNING):
+            return job
+        job = _jobs[match_id] = SpriteJob(status=ExportStatus.PENDING)
+        if _executor is None:
+            # One job at a time: each one is a full decode of a match video
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sprite-job")
+        _executor.submit(run_sprite_job, match_id)
+    return job
+
+
+def sprite_job(match_id: int) -> Optional[SpriteJob]:
+    return _jobs.get(match_id)
+
+
+def sprite_job_status(job: SpriteJob) -> dict:
+    return {**asdict(job), "status": job.status.value}
+
+
+def shutdown_sprite_jobs():
+    global _executor
+    with _jobs_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
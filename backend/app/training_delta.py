@@ -0,0 +1,122 @@
+"""
+Delta (incremental) training exports.
+
+A delta export contains only what changed since a base TrainingExport: the
+corrections created after it (Correction.created_at) that are not part of it
+(Correction.training_export_id), and the frames, tracks and events those
+corrections touch. A correction touches:
+
+- its frame_number, and the frame of its detection_id;
+- for track corrections, every frame the track has a detection in, since
+  the labels of all of them change;
+- its event_id.
+
+Each delta carries a manifest (see delta_manifest) naming the base export,
+so the training side can apply deltas to the previous dataset in order.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session
+
+from app.models.corrections import Correction
+from app.models.tracking import Detection, Frame
+from app.models.training import TrainingExport
+
+DELTA_FORMAT = "football_tracker_delta"
+DELTA_FORMAT_VERSION = 1
+MANIFEST_FILE = "delta_manifest.json"
+
+
+@dataclass
+class DeltaChanges:
+    """Entities touched by the corrections of a delta."""
+    correction_ids: List[int] = field(default_factory=list)
+    frames: Dict[int, Set[int]] = field(default_factory=dict)  # match_id -> frame numbers
+    track_ids: Set[int] = field(default_factory=set)  # Track primary keys
+    event_ids: Set[int] = field(default_factory=set)
+
+    def match_frames(self, match_id: int) -> Set[int]:
+        return self.frames.get(match_id, set())
+
+
+def get_base_export(db: Session, export_id: int) -> TrainingExport:
+    """The TrainingExport a delta is taken against; 404 if it does not exist."""
+    base = db.query(TrainingExport).filter(TrainingExport.id == export_id).first()
+    if not base:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Base export {export_id} not found"
+        )
+    return base
+
+
+def delta_corrections(db: Session, base: TrainingExport, match_ids: Optional[List[int]] = None,
+                      until: Optional[datetime] = None) -> Query:
+    """Corrections created after base (and up to until, if given) that base does not include."""
+    query = db.query(Correction).filter(
+        Correction.created_at > base.created_at,
+        or_(Correction.training_export_id.is_(None), Correction.training_export_id != base.id),
+    )
+    if until is not None:
+        query = query.filter(Correction.created_at <= until)
+    if match_ids is not None:
+        query = query.filter(Correction.match_id.in_(match_ids))
+    return query
+
+
+def collect_delta_changes(db: Session, base: TrainingExport, match_ids: Optional[List[int]] = None,
+                          until: Optional[datetime] = None) -> DeltaChanges:
+    """Resolve the corrections of a delta to the frames, tracks and events they touch."""
+    changes = DeltaChanges()
+    rows = delta_corrections(db, base, match_ids, until).with_entities(
+        Correction.id, Correction.match_id, Correction.track_id, Correction.event_id,
+        Correction.frame_number, Correction.detection_id,
+    ).order_by(Correction.id).all()
+
+    detection_ids = set()
+    for correction_id, match_id, track_id, event_id, frame_number, detection_id in rows:
+        changes.correction_ids.append(correction_id)
+        if frame_number is not None:
+            changes.frames.setdefault(match_id, set()).add(frame_number)
+        if track_id is not None:
+            changes.track_ids.add(track_id)
+        if event_id is not None:
+            changes.event_ids.add(event_id)
+        if detection_id is not None:
+            detection_ids.add(detection_id)
+
+    # Frames whose labels changed through a track or detection correction
+    if changes.track_ids or detection_ids:
+        frame_rows = db.query(Frame.match_id, Frame.frame_number).join(
+            Detection, Detection.frame_id == Frame.id
+        ).filter(
+            or_(Detection.track_id.in_(changes.track_ids), Detection.id.in_(detection_ids))
+        ).distinct()
+        for match_id, frame_number in frame_rows:
+            if match_ids is None or match_id in match_ids:
+                changes.frames.setdefault(match_id, set()).add(frame_number)
+
+    return changes
+
+
+def delta_manifest(base: TrainingExport, changes: DeltaChanges, **contents) -> dict:
+    """
+    Manifest for a delta archive or document.
+
+    contents describe what the delta holds (e.g. updated / removed frames);
+    the training side replaces those entries of the base dataset and keeps
+    everything else.
+    """
+    return {
+        "format": DELTA_FORMAT,
+        "version": DELTA_FORMAT_VERSION,
+        "base_export_id": base.id,
+        "base_export_created_at": base.created_at.isoformat(),
+        "generated_at": datetime.utcnow().isoformat(),
+        "correction_ids": changes.correction_ids,
+        **contents,
+    }
@@ -0,0 +1,490 @@
+"""Frame extraction and image encoding for match videos."""
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.change_version import bump_match_version
+from app.config import get_settings
+from app.frame_cache import get_frame_cache, video_identity
+
+if TYPE_CHECKING:
+    # Not imported at runtime: encode pool workers import this module
+    from app.models.team import Match
+
+# JPEG quality used for exported frame images
+DEFAULT_JPEG_QUALITY = 95
+
+# Forward gaps longer than this many frames are crossed with a seek instead of
+# grabbing every frame in between (sparse exports, e.g. corrected frames only)
+MAX_GRAB_GAP = 500
+
+
+# Image format -> (file extension, OpenCV quality flag)
+IMAGE_ENCODINGS = {
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+}
+
+
+def encode_jpeg(image: np.ndarray, quality: int = DEFAULT_JPEG_QUALITY) -> Optional[bytes]:
+    """Encode a BGR image as JPEG bytes, None if encoding fails."""
+    return encode_image(image, "jpeg", quality)
+
+
+def encode_image(image: np.ndarray, image_format: str = "jpeg",
+                 quality: int = DEFAULT_JPEG_QUALITY) -> Optional[bytes]:
+    """Encode a BGR image in one of IMAGE_ENCODINGS, None if encoding fails."""
+    extension, quality_flag = IMAGE_ENCODINGS[image_format]
+    ok, buffer = cv2.imencode(extension, image, [quality_flag, quality])
+    return buffer.tobytes() if ok else None
+
+
+def process_image(image: np.ndarray, quality: int = DEFAULT_JPEG_QUALITY,
+                  max_size: Optional[int] = None,
+                  crop: Optional[Tuple[int, int, int, int]] = None,
+                  image_format: str = "jpeg") -> Optional[bytes]:
+    """
+    Crop to (x1, y1, x2, y2), downscale so the longest side is at most
+    max_size pixels, and encode (JPEG unless image_format says otherwise).
+    Runs in the encode pool workers.
+    """
+    if crop is not None:
+        x1, y1, x2, y2 = crop
+        image = image[max(0, y1):y2, max(0, x1):x2]
+        if image.size == 0:
+            return None
+    if max_size and max(image.shape[:2]) > max_size:
+        scale = max_size / max(image.shape[:2])
+        size = (max(1, round(image.shape[1] * scale)), max(1, round(image.shape[0] * scale)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    return encode_image(image, image_format, quality)
+
+
+# ============================================================================
+# ENCODE POOL
+# ============================================================================
+
+_encode_pool: Optional[ProcessPoolExecutor] = None
+_encode_pool_lock = threading.Lock()
+
+
+def encode_workers() -> int:
+    """Configured number of encode processes (settings.export_workers, 0 = CPU count)."""
+    workers = get_settings().export_workers
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _init_encode_worker():
+    # One OpenCV thread per process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+
+
+def get_encode_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by all exports of this server process, created on
+    first use. Workers are spawned rather than forked, since the server
+    process runs threads (event loop, thread pool) that fork does not copy.
+    """
+    global _encode_pool
+    with _encode_pool_lock:
+        if _encode_pool is None:
+            _encode_pool = ProcessPoolExecutor(
+                max_workers=encode_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_encode_worker,
+            )
+        return _encode_pool
+
+
+def shutdown_encode_pool():
+    global _encode_pool
+    with _encode_pool_lock:
+        if _encode_pool is not None:
+            _encode_pool.shutdown(wait=False, cancel_futures=True)
+            _encode_pool = None
+
+
+def encode_frames(frames: Iterable[Tuple[int, Optional[np.ndarray]]],
+                  quality: int = DEFAULT_JPEG_QUALITY,
+                  max_size: Optional[int] = None,
+                  workers: Optional[int] = None) -> Iterator[Tuple[int, Optional[bytes]]]:
+    """
+    Encode decoded (frame_number, image) pairs to (frame_number, JPEG bytes).
+
+    With more than one worker the images are handed to the shared process
+    pool, with at most 2 * workers frames in flight so memory stays bounded
+    while the decoder runs ahead. Results are yielded in input order,
+    whatever order the workers finish in. Images that are None stay None.
+    """
+    workers = workers or encode_workers()
+    if workers <= 1:
+        for frame_number, image in frames:
+            yield frame_number, process_image(image, quality, max_size) if image is not None else None
+        return
+
+    pool = get_encode_pool()
+    pending: Deque[Tuple[int, Optional[Future]]] = deque()
+    try:
+        for frame_number, image in frames:
+            future = pool.submit(process_image, image, quality, max_size) if image is not None else None
+            pending.append((frame_number, future))
+            if len(pending) >= 2 * workers:
+                done_number, done = pending.popleft()
+                yield done_number, done.result() if done else None
+
+        while pending:
+            done_number, done = pending.popleft()
+            yield done_number, done.result() if done else None
+    finally:
+        # Export abandoned (e.g. client disconnected): drop queued work
+        for _, future in pending:
+            if future:
+                future.cancel()
+
+
+@dataclass(frozen=True)
+class VideoMetadata:
+    """Probed properties of a video file."""
+    width: int
+    height: int
+    fps: float
+    frame_count: int
+
+
+class SequentialFrameReader:
+    """
+    Read many frames of one video with a single front-to-back decode.
+
+    Seeking with CAP_PROP_POS_FRAMES decodes from the previous keyframe on
+    every call, so reading N frames that way costs up to N keyframe
+    intervals of decoding. This reader sorts the requested frame numbers and
+    walks the video once, grab()-ing frames it does not need (no color
+    conversion or copy) and retrieve()-ing only the requested ones.
+
+    Usage:
+        with SequentialFrameReader(video_path) as reader:
+            for frame_number, image in reader.read(frame_numbers):
+                ...
+    """
+
+    def __init__(self, video_path: Path, max_grab_gap: int = MAX_GRAB_GAP):
+        self.video_path = Path(video_path)
+        self.max_grab_gap = max_grab_gap
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._position = 0  # Frame number the next grab() returns
+        self.frames_decoded = 0
+
+    def open(self):
+        if self._cap is None:
+            self._cap = cv2.VideoCapture(str(self.video_path))
+            self._position = 0
+        return self
+
+    def close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def metadata(self) -> VideoMetadata:
+        self.open()
+        return VideoMetadata(
+            width=int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(self._cap.get(cv2.CAP_PROP_FPS)),
+            frame_count=int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        )
+
+    def _seek(self, frame_number: int):
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        self._position = frame_number
+
+    def read(self, frame_numbers: Iterable[int]) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """
+        Yield (frame_number, image) in ascending frame order, one per distinct
+        requested frame. image is None for frames past the end of the video
+        or that fail to decode.
+        """
+        self.open()
+        for frame_number in sorted(set(frame_numbers)):
+            if frame_number < self._position or frame_number - self._position > self.max_grab_gap:
+                self._seek(frame_number)
+
+            # Skip to the requested frame without retrieving the ones in between
+            while self._position < frame_number:
+                if not self._cap.grab():
+                    break
+                self._position += 1
+                self.frames_decoded += 1
+
+            image = None
+            if self._position == frame_number and self._cap.grab():
+                self._position += 1
+                self.frames_decoded += 1
+                ok, image = self._cap.retrieve()
+                if not ok:
+                    image = None
+            yield frame_number, image
+
+
+# ============================================================================
+# VIDEO READER POOL
+# ============================================================================
+
+class VideoReaderPool:
+    """
+    Open capture handles, recently decoded frames and metadata of match
+    videos, shared by the requests and exports of this server process.
+
+    - reader(): a SequentialFrameReader for the video, taken from up to
+      handles_per_video idle handles (kept for the max_videos most recently
+      used videos) or opened if none is idle. Handles keep their position,
+      so reading just after the previous frame grabs forward, no seek.
+    - read_frame(): a decoded frame, from an LRU of frames bounded by
+      frame_cache_bytes (images are read-only and shared).
+    - metadata(): probed once per video.
+
+    Everything is keyed by path and modification time, so a replaced video
+    file is reopened and reprobed.
+    """
+
+    def __init__(self, handles_per_video: int = 2, max_videos: int = 8,
+                 frame_cache_bytes: int = 256 * 1024 * 1024):
+        self.handles_per_video = handles_per_video
+        self.max_videos = max_videos
+        self.frame_cache_bytes = frame_cache_bytes
+        self._lock = threading.Lock()
+        self._idle: "OrderedDict[Tuple[str, int], List[SequentialFrameReader]]" = OrderedDict()
+        self._frames: "OrderedDict[Tuple[str, int, int], np.ndarray]" = OrderedDict()
+        self._frame_bytes = 0
+        self._metadata: Dict[Tuple[str, int], VideoMetadata] = {}
+        self.frame_hits = 0
+        self.frame_misses = 0
+
+    @staticmethod
+    def _video_key(video_path: Path) -> Tuple[str, int]:
+        path = Path(video_path)
+        return str(path.resolve()), path.stat().st_mtime_ns
+
+    @contextmanager
+    def reader(self, video_path: Path) -> Iterator[SequentialFrameReader]:
+        """Borrow an open reader of video_path; it goes back to the pool on exit."""
+        key = self._video_key(video_path)
+        reader = None
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                reader = idle.pop()
+        if reader is None:
+            reader = SequentialFrameReader(video_path).open()
+
+        try:
+            yield reader
+        finally:
+            closing = []
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                self._idle.move_to_end(key)
+                if len(idle) < self.handles_per_video:
+                    idle.append(reader)
+                else:
+                    closing.append(reader)
+                while len(self._idle) > self.max_videos:
+                    _, readers = self._idle.popitem(last=False)
+                    closing.extend(readers)
+            for stale in closing:
+                stale.close()
+
+    def read_frame(self, video_path: Path, frame_number: int) -> Optional[np.ndarray]:
+        """Decoded BGR frame (read-only), None past the end of the video."""
+        key = (*self._video_key(video_path), frame_number)
+        with self._lock:
+            image = self._frames.get(key)
+            if image is not None:
+                self._frames.move_to_end(key)
+                self.frame_hits += 1
+                return image
+            self.frame_misses += 1
+
+        with self.reader(video_path) as reader:
+            _, image = next(reader.read([frame_number]))
+        if image is not None:
+            image.flags.writeable = False
+            self._put_frame(key, image)
+        return image
+
+    def prefetch(self, video_path: Path, frame_numbers: Iterable[int]) -> int:
+        """
+        Decode the frames not in the LRU yet, in one sequential pass over a
+        pooled handle, and add them. Returns the number of frames decoded.
+        """
+        video_key = self._video_key(video_path)
+        with self._lock:
+            missing = [n for n in frame_numbers if (*video_key, n) not in self._frames]
+        if not missing:
+            return 0
+
+        with self.reader(video_path) as reader:
+            for frame_number, image in reader.read(missing):
+                if image is not None:
+                    image.flags.writeable = False
+                    self._put_frame((*video_key, frame_number), image)
+        return len(missing)
+
+    def _put_frame(self, key: Tuple[str, int, int], image: np.ndarray):
+        if image.nbytes > self.frame_cache_bytes:
+            return
+        with self._lock:
+            if key in self._frames:
+                return
+            self._frames[key] = image
+            self._frame_bytes += image.nbytes
+            while self._frame_bytes > self.frame_cache_bytes:
+                _, evicted = self._frames.popitem(last=False)
+                self._frame_bytes -= evicted.nbytes
+
+    def metadata(self, video_path: Path) -> VideoMetadata:
+        key = self._video_key(video_path)
+        with self._lock:
+            metadata = self._metadata.get(key)
+        if metadata is None:
+            with self.reader(video_path) as reader:
+                metadata = reader.metadata()
+            with self._lock:
+                self._metadata[key] = metadata
+        return metadata
+
+    def close(self):
+        """Close all idle handles and drop cached frames."""
+        with self._lock:
+            readers = [reader for idle in self._idle.values() for reader in idle]
+            self._idle.clear()
+            self._frames.clear()
+            self._frame_bytes = 0
+        for reader in readers:
+            reader.close()
+
+
+_video_pool: Optional[VideoReaderPool] = None
+_video_pool_lock = threading.Lock()
+
+
+def get_video_pool() -> VideoReaderPool:
+    """The server process's VideoReaderPool, created from settings on first use."""
+    global _video_pool
+    with _video_pool_lock:
+        if _video_pool is None:
+            settings = get_settings()
+            _video_pool = VideoReaderPool(
+                handles_per_video=settings.video_pool_handles,
+                max_videos=settings.video_pool_max_videos,
+                frame_cache_bytes=settings.frame_lru_max_bytes,
+            )
+        return _video_pool
+
+
+def shutdown_video_pool():
+    global _video_pool
+    with _video_pool_lock:
+        if _video_pool is not None:
+            _video_pool.close()
+            _video_pool = None
+
+
+def match_video_path(match: "Match") -> Optional[Path]:
+    """Path of a match's video file, None if it has none or the file is missing."""
+    if not match.video_filename:
+        return None
+    video_path = Path(get_settings().video_dir) / match.video_filename
+    return video_path if video_path.exists() else None
+
+
+def match_video_metadata(db: Session, match: "Match") -> Optional[VideoMetadata]:
+    """
+    Metadata probed from a match's video, None if the video file is missing.
+
+    The probe goes through the pool's metadata cache, so a video is only
+    opened again once its file changes. The probe is authoritative: imports
+    store 1920x1080 whatever the video is, so the match's video_width and
+    video_height are overwritten when they differ, and total_frames is
+    filled in when unknown (bumping the match's data version, since frame
+    payloads include it).
+    """
+    video_path = match_video_path(match)
+    if video_path is None:
+        return None
+    metadata = get_video_pool().metadata(video_path)
+
+    updated = False
+    if metadata.width and metadata.height and (
+            (match.video_width, match.video_height) != (metadata.width, metadata.height)):
+        match.video_width, match.video_height = metadata.width, metadata.height
+        updated = True
+    if not match.total_frames and metadata.frame_count:
+        match.total_frames = metadata.frame_count
+        bump_match_version(db, match.id)
+        updated = True
+    if updated:
+        db.commit()
+    return metadata
+
+
+def _read_single_image(video_path: Path, frame_number: int, quality: int,
+                       max_size: Optional[int]) -> Optional[bytes]:
+    image = get_video_pool().read_frame(video_path, frame_number)
+    return process_image(image, quality, max_size) if image is not None else None
+
+
+def read_frame_images(video_path: Path, frame_numbers: Iterable[int],
+                      quality: int = DEFAULT_JPEG_QUALITY,
+                      max_size: Optional[int] = None,
+                      workers: Optional[int] = None,
+                      use_cache: bool = True) -> Iterator[Tuple[int, Optional[bytes]]]:
+    """
+    Yield (frame_number, JPEG bytes or None) in ascending frame order.
+
+    Frames already in the frame cache are read from it. The others are
+    decoded in one sequential pass, encoded on the encode pool and added to
+    the cache, so a repeat export only decodes frames it has not seen.
+    """
+    numbers = sorted(set(frame_numbers))
+    cache = get_frame_cache() if use_cache else None
+    pool = get_video_pool()
+    if cache is None:
+        with pool.reader(video_path) as reader:
+            yield from encode_frames(reader.read(numbers), quality, max_size, workers)
+        return
+
+    video_id = video_identity(video_path)
+    keys = {n: cache.key(video_id, n, quality, max_size) for n in numbers}
+    missing = [n for n in numbers if not cache.contains(keys[n])]
+    missing_set = set(missing)
+
+    with pool.reader(video_path) as reader:
+        encoded = encode_frames(reader.read(missing), quality, max_size, workers)
+        for frame_number in numbers:
+            if frame_number in missing_set:
+                _, data = next(encoded)
+                if data is not None:
+                    cache.put(keys[frame_number], data)
+            else:
+                data = cache.get(keys[frame_number])
+                if data is None:
+                    # Evicted since the lookup
+                    data = _read_single_image(video_path, frame_number, quality, max_size)
+            yield frame_number, data
@@ -0,0 +1,128 @@
+"""
+Compact binary wire format for frames and their detections.
+
+Clients that send `Accept: application/x-msgpack` get frame and frame window
+responses as one MessagePack map with column arrays instead of JSON objects
+per detection. Each column is a MessagePack bin holding a packed
+little-endian array:
+
+    format, version          "football_tracker_frames", 1
+    (endpoint fields)        e.g. match_id, from_frame, to_frame, total_frames
+    class_names              display class of each class code (JSON class_name)
+    teams                    team of each team code (JSON team)
+    frames:
+        id, frame_number, timestamp_ms     int32[F], id -1 = virtual frame
+                                           without a record
+        detection_offsets                  uint32[F + 1]; frame i owns
+                                           detections offsets[i]:offsets[i+1]
+    detections:
+        id, frame_id                       int32[D]
+        track_id                           int32[D], -1 = no track
+        bbox                               float32[D * 4], x1 y1 x2 y2 per detection
+        center                             float32[D * 2], x y per detection
+        confidence                         float32[D]
+        class_code, team_code              uint8[D]
+
+In NumPy, for example: np.frombuffer(doc["detections"]["bbox"], "<f4").reshape(-1, 4).
+The columns are built straight from query rows; no per-detection objects
+are created.
+
+Requires msgpack; without it these endpoints always answer in JSON.
+"""
+from typing import Any, Callable, List, Sequence
+
+import numpy as np
+from fastapi import Request
+
+from app.models.tracking import TeamSide
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/msgpack", "application/vnd.msgpack"}
+
+WIRE_FORMAT = "football_tracker_frames"
+WIRE_FORMAT_VERSION = 1
+
+CLASS_NAMES = ["team_a", "team_b", "ball", "referee", "linesman"]
+TEAMS = [team.value for team in TeamSide]
+
+_CLASS_CODES = {name: code for code, name in enumerate(CLASS_NAMES)}
+_TEAM_CODES = {team: code for code, team in enumerate(TeamSide)}
+
+
+def accepts_msgpack(request: Request) -> bool:
+    """True if the client asks for MessagePack (and the server can produce it)."""
+    if not MSGPACK_AVAILABLE:
+        return False
+    for item in request.headers.get("accept", "").split(","):
+        media_type, _, params = item.partition(";")
+        if media_type.strip().lower() in MSGPACK_MEDIA_TYPES:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def _column(values: Sequence, dtype: str) -> bytes:
+    return np.asarray(values, dtype=dtype).tobytes()
+
+
+def pack_frames(rows: List[Sequence[Any]], class_name: Callable[[Any, Any], str], **fields) -> bytes:
+    """
+    Encode frame / detection rows as a MessagePack document.
+
+    rows are (frame id, frame number, timestamp_ms, *DETECTION_COLUMNS)
+    ordered by frame, as returned by the outer join of frames to detections
+    (detection columns None for a frame without detections). class_name maps
+    (ai_detection_class, ai_team) to the display class. fields are added to
+    the top level of the document.
+    """
+    frame_ids: List[int] = []
+    frame_numbers: List[int] = []
+    timestamps: List[int] = []
+    offsets: List[int] = []
+    detection_rows = []
+    for row in rows:
+        if not frame_ids or frame_ids[-1] != row[0]:
+            frame_ids.append(row[0])
+            frame_numbers.append(row[1])
+            timestamps.append(row[2] or 0)
+            offsets.append(len(detection_rows))
+        if row[3] is not None:
+            detection_rows.append(row[3:])
+    offsets.append(len(detection_rows))
+
+    if detection_rows:
+        (ids, detection_frame_ids, track_ids, x1, y1, x2, y2, center_x, center_y,
+         confidences, classes, teams) = zip(*detection_rows)
+    else:
+        ids = detection_frame_ids = track_ids = x1 = y1 = x2 = y2 = ()
+        center_x = center_y = confidences = classes = teams = ()
+
+    doc = {
+        "format": WIRE_FORMAT,
+        "version": WIRE_FORMAT_VERSION,
+        **fields,
+        "class_names": CLASS_NAMES,
+        "teams": TEAMS,
+        "frames": {
+            "id": _column(frame_ids, "<i4"),
+            "frame_number": _column(frame_numbers, "<i4"),
+            "timestamp_ms": _column(timestamps, "<i4"),
+            "detection_offsets": _column(offsets, "<u4"),
+        },
+        "detections": {
+            "id": _column(ids, "<i4"),
+            "frame_id": _column(detection_frame_ids, "<i4"),
+            "track_id": _column([-1 if t is None else t for t in track_ids], "<i4"),
+            "bbox": np.column_stack([np.asarray(c, dtype="<f4") for c in (x1, y1, x2, y2)]).tobytes(),
+            "center": np.column_stack([np.asarray(c, dtype="<f4") for c in (center_x, center_y)]).tobytes(),
+            "confidence": _column(confidences, "<f4"),
+            "class_code": _column([_CLASS_CODES[class_name(c, t)] for c, t in zip(classes, teams)], "<u1"),
+            "team_code": _column([_TEAM_CODES[t] for t in teams], "<u1"),
+        },
+    }
+    return msgpack.packb(doc, use_bin_type=True)
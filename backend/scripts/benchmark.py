@@ -0,0 +1,396 @@
+"""
+Import/export throughput benchmark on a seeded synthetic match.
+
+Generates a match with scripts.synthetic_match, imports it, then drives the
+frame, stats and YOLO export endpoints through the real FastAPI app against
+the configured database (DATABASE_URL). Wall time, per-call latency and peak
+RSS of every step are written to a JSON file so runs can be compared.
+
+Usage:
+    python -m scripts.benchmark --minutes 10 --output bench_before.json
+    python -m scripts.benchmark --minutes 90 --import-mode columnar --with-images
+    python -m scripts.benchmark --compare bench_before.json bench_after.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine, SessionLocal, Base
+from app.models.team import Match
+from scripts.bulk_ingest import IngestStats
+from scripts.columnar import write_match_columns
+from scripts.synthetic_match import (
+    SyntheticMatchConfig, generate_match_columns, write_match_json, write_synthetic_video,
+)
+
+IMPORT_MODES = ("bulk", "stream", "columnar", "legacy")
+
+# Tables holding a match's data, children first
+MATCH_TABLES_SQL = [
+    "DELETE FROM detections WHERE frame_id IN (SELECT id FROM frames WHERE match_id = :m)",
+    "DELETE FROM ball_positions WHERE frame_id IN (SELECT id FROM frames WHERE match_id = :m)",
+    "DELETE FROM corrections WHERE match_id = :m",
+    "DELETE FROM events WHERE match_id = :m",
+    "DELETE FROM frames WHERE match_id = :m",
+    "DELETE FROM import_track_progress WHERE checkpoint_id IN "
+    "(SELECT id FROM import_checkpoints WHERE match_id = :m)",
+    "DELETE FROM tracks WHERE match_id = :m",
+    "DELETE FROM calibration_points WHERE calibration_id IN "
+    "(SELECT id FROM pitch_calibrations WHERE match_id = :m)",
+    "DELETE FROM pitch_calibrations WHERE match_id = :m",
+    "DELETE FROM accuracy_metrics WHERE match_id = :m",
+    "DELETE FROM match_players WHERE match_id = :m",
+    "DELETE FROM import_checkpoints WHERE match_id = :m",
+    "DELETE FROM matches WHERE id = :m",
+]
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process (Linux /proc), 0 if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _max_rss_bytes() -> int:
+    """Peak RSS of the process so far (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRss:
+    """Sample RSS in a background thread to get the peak of one benchmark step."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_bytes = 0
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, _current_rss_bytes())
+
+    def __enter__(self):
+        self.start_bytes = self.peak_bytes = _current_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, _current_rss_bytes())
+        if not self.peak_bytes:
+            self.peak_bytes = _max_rss_bytes()
+
+
+def _mb(n_bytes: int) -> float:
+    return round(n_bytes / (1024 * 1024), 1)
+
+
+def measure(fn: Callable[[], Any]) -> Dict[str, Any]:
+    """Run fn once; wall time and memory of the step."""
+    with PeakRss() as rss:
+        start = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 4),
+        "peak_rss_mb": _mb(rss.peak_bytes),
+        "rss_growth_mb": _mb(rss.peak_bytes - rss.start_bytes),
+        "value": value,
+    }
+
+
+def measure_calls(calls: List[Callable[[], int]]) -> Dict[str, Any]:
+    """Run each call once; latency distribution, bytes returned and memory."""
+    latencies = []
+    response_bytes = 0
+    with PeakRss() as rss:
+        start = time.perf_counter()
+        for call in calls:
+            t = time.perf_counter()
+            response_bytes += call()
+            latencies.append(time.perf_counter() - t)
+        seconds = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    return {
+        "calls": len(calls),
+        "seconds": round(seconds, 4),
+        "mean_ms": round(float(ms.mean()), 3) if len(ms) else None,
+        "p50_ms": round(float(np.percentile(ms, 50)), 3) if len(ms) else None,
+        "p95_ms": round(float(np.percentile(ms, 95)), 3) if len(ms) else None,
+        "max_ms": round(float(ms.max()), 3) if len(ms) else None,
+        "response_bytes": response_bytes,
+        "peak_rss_mb": _mb(rss.peak_bytes),
+        "rss_growth_mb": _mb(rss.peak_bytes - rss.start_bytes),
+    }
+
+
+# ============================================================================
+# STEPS
+# ============================================================================
+
+def import_match(db, mode: str, source: Path) -> Dict[str, Any]:
+    """Import the generated match with one of the importer modes."""
+    from scripts import import_tracker_data as importer
+
+    stats = IngestStats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "columnar":
+            match = importer.columnar_import_from_dir(db, str(source), stats=stats)
+        elif mode == "stream":
+            match = importer.stream_import_from_json_file(db, str(source), stats=stats)
+        elif mode == "bulk":
+            match = importer.bulk_import_from_json_file(db, str(source), stats=stats)
+        else:
+            match = importer.import_from_json_file(db, str(source))
+    return {
+        "match_id": match.id,
+        "tables": {
+            name: {"rows": int(rows), "seconds": round(seconds, 4),
+                   "rows_per_sec": round(rows / seconds) if seconds > 0 else None}
+            for name, (rows, seconds) in stats.tables.items()
+        },
+    }
+
+
+def delete_match(db, match_id: int):
+    for sql in MATCH_TABLES_SQL:
+        db.execute(text(sql), {"m": match_id})
+    db.commit()
+
+
+def _api_client():
+    """TestClient for the app with authentication replaced by an admin user."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.auth import get_current_user
+    from app.models.user import User, UserRole
+
+    user = User(id=0, email="benchmark@localhost", username="benchmark",
+                full_name="Benchmark", role=UserRole.ADMIN, is_active=True)
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+def _get(client, url: str, params: Dict[str, Any] = None) -> int:
+    response = client.get(url, params=params)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} -> {response.status_code}: {response.text[:200]}")
+    return len(response.content)
+
+
+def run_benchmark(config: SyntheticMatchConfig, import_mode: str = "bulk", samples: int = 50,
+                  page_size: int = 100, with_images: bool = False, keep: bool = False,
+                  workdir: Optional[str] = None) -> Dict[str, Any]:
+    """Run every benchmark step and return the results document."""
+    rng = np.random.default_rng(config.seed)
+    Base.metadata.create_all(bind=engine)
+    work = Path(workdir or tempfile.mkdtemp(prefix="ft_bench_"))
+    work.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, Any] = {}
+
+    # Generate
+    step = measure(lambda: generate_match_columns(config))
+    header, arrays = step.pop("value")
+    results["generate"] = step
+
+    source = work / ("match" if import_mode == "columnar" else "match.json")
+    step = measure(lambda: write_match_columns(source, header, arrays) if import_mode == "columnar"
+                   else write_match_json(header, arrays, source))
+    step.pop("value")
+    results["write_source"] = step
+
+    dataset = {
+        "track_points": int(len(arrays["points_frame_number"])),
+        "tracks": len(header["tracks"]),
+        "events": len(header.get("events", [])),
+        "ball_positions": int(len(arrays["ball_frame_number"])),
+        "source_bytes": sum(p.stat().st_size for p in ([source] if source.is_file() else source.iterdir())),
+    }
+    del arrays
+
+    db = SessionLocal()
+    match_id = None
+    try:
+        # Import
+        step = measure(lambda: import_match(db, import_mode, source))
+        imported = step.pop("value")
+        match_id = imported["match_id"]
+        step["tables"] = imported["tables"]
+        step["track_points_per_sec"] = round(dataset["track_points"] / step["seconds"]) if step["seconds"] else None
+        results["import"] = step
+
+        frame_numbers = [n for (n,) in db.execute(
+            text("SELECT frame_number FROM frames WHERE match_id = :m ORDER BY frame_number"), {"m": match_id}
+        )]
+        dataset["frames"] = len(frame_numbers)
+
+        video = work / "match.mp4"
+        step = measure(lambda: write_synthetic_video(video, config, None if with_images else 1))
+        step.pop("value")
+        results["write_video"] = step
+        db.query(Match).filter(Match.id == match_id).update({Match.video_filename: str(video)})
+        db.commit()
+
+        client = _api_client()
+        base = f"/matches/{match_id}"
+
+        skips = rng.integers(0, max(1, len(frame_numbers) - page_size), samples).tolist()
+        results["list_frames"] = measure_calls([
+            (lambda s=s: _get(client, f"/api/v1{base}/frames", {"skip": s, "limit": page_size})) for s in skips
+        ])
+
+        picks = rng.choice(frame_numbers, samples).tolist() if frame_numbers else []
+        results["get_frame_by_number"] = measure_calls([
+            (lambda n=n: _get(client, f"/api/v1{base}/frames/{n}")) for n in picks
+        ])
+
+        # Playback prefetch: 5 s of detections per request
+        window = max(1, round(config.fps * 5))
+        starts = rng.integers(0, max(1, len(frame_numbers) - window), samples).tolist()
+        results["get_frame_window"] = measure_calls([
+            (lambda s=s: _get(client, f"/api/v1{base}/frames", {"from": s, "to": s + window - 1})) for s in starts
+        ])
+
+        results["get_detection_stats"] = measure_calls([
+            (lambda: _get(client, f"/api/v1{base}/detection-stats")) for _ in range(3)
+        ])
+
+        results["export_yolo_dataset"] = measure_calls([
+            lambda: _get(client, f"/api/v1/export{base}/export/yolo",
+                         {"corrected_only": False, "include_images": with_images})
+        ])
+    finally:
+        if match_id is not None and not keep:
+            delete_match(db, match_id)
+        db.close()
+
+    return {
+        "benchmark": "import_export",
+        "created_at": datetime.utcnow().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": engine.dialect.name,
+        "config": dict(asdict(config), import_mode=import_mode, samples=samples,
+                       page_size=page_size, with_images=with_images),
+        "dataset": dataset,
+        "results": results,
+        "peak_rss_mb": _mb(_max_rss_bytes()),
+        "match_id": match_id if keep else None,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def _headline(result: Dict[str, Any]) -> Optional[float]:
+    """The number a step is judged by: mean latency for endpoints, seconds otherwise."""
+    return result.get("mean_ms", result.get("seconds"))
+
+
+def print_summary(doc: Dict[str, Any]):
+    print(f"Dataset: {doc['dataset']}")
+    for name, result in doc["results"].items():
+        unit = "ms/call" if "mean_ms" in result else "s"
+        print(f"  {name:<22} {_headline(result):>12.3f} {unit:<8} peak RSS {result['peak_rss_mb']:>8.1f} MB")
+
+
+def compare(before_path: str, after_path: str):
+    """Print the per-step change between two benchmark result files."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    if before["config"] != after["config"]:
+        print("Warning: runs used different configurations")
+    print(f"{'step':<22} {'before':>12} {'after':>12} {'change':>8}   {'RSS before':>10} {'RSS after':>10}")
+    for name, new in after["results"].items():
+        old = before["results"].get(name)
+        if not old:
+            continue
+        a, b = _headline(old), _headline(new)
+        change = f"{b / a:7.2f}x" if a else "    n/a"
+        print(f"{name:<22} {a:>12.3f} {b:>12.3f} {change}   {old['peak_rss_mb']:>10.1f} {new['peak_rss_mb']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import and export throughput on a synthetic match")
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=25.0)
+    parser.add_argument("--players", type=int, default=22, help="Players on the pitch per frame")
+    parser.add_argument("--events-per-minute", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--import-mode", choices=IMPORT_MODES, default="bulk")
+    parser.add_argument("--samples", type=int, default=50,
+                        help="Calls to list_frames and get_frame_by_number")
+    parser.add_argument("--with-images", action="store_true",
+                        help="Render a full-length video and include frame images in the YOLO export")
+    parser.add_argument("--keep", action="store_true", help="Keep the imported match")
+    parser.add_argument("--workdir", help="Directory for generated files (default: temporary)")
+    parser.add_argument("--output", "-o", help="Results JSON path (default: benchmark_<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="Compare two results files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    config = SyntheticMatchConfig(
+        minutes=args.minutes, fps=args.fps, players=args.players,
+        events_per_minute=args.events_per_minute, seed=args.seed,
+    )
+    doc = run_benchmark(config, import_mode=args.import_mode, samples=args.samples,
+                        with_images=args.with_images, keep=args.keep, workdir=args.workdir)
+
+    output = args.output or f"benchmark_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w") as f:
+        json.dump(doc, f, indent=2)
+    print_summary(doc)
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""
+Bulk ingestion helpers for football_tracker_v2 imports.
+
+Rows are streamed into PostgreSQL with COPY ... FROM STDIN (or batched
+multi-row INSERTs on other databases), one transaction per table, and the
+throughput of every table is recorded so each import can report rows/sec.
+
+Used by scripts/import_tracker_data.py (--bulk, --stream, --columnar-dir).
+"""
+
+import csv
+import io
+import math
+import time
+from datetime import datetime
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.team import Match
+from app.models.tracking import Frame, TeamSide, DetectionClass
+
+# Rows per INSERT statement when COPY is not available
+INSERT_BATCH_SIZE = 5000
+
+# Rows converted from arrays to Python values at a time
+ARRAY_CHUNK_SIZE = 100000
+
+# Columns written for each table. Python-side model defaults do not apply to
+# COPY, so every NOT NULL column is listed explicitly.
+FRAME_COLUMNS = ("match_id", "frame_number", "timestamp_ms", "created_at")
+
+TRACK_COLUMNS = (
+    "match_id", "track_id", "ai_team", "ai_detection_class", "ai_jersey_number",
+    "first_frame", "last_frame", "total_detections",
+    "is_reviewed", "is_corrected", "created_at", "updated_at",
+)
+
+DETECTION_COLUMNS = (
+    "frame_id", "track_id",
+    "bbox_x1", "bbox_y1", "bbox_x2", "bbox_y2",
+    "center_x", "center_y", "foot_x", "foot_y",
+    "pitch_x", "pitch_y", "confidence",
+    "ai_detection_class", "ai_team", "created_at",
+)
+
+BALL_POSITION_COLUMNS = (
+    "frame_id", "pixel_x", "pixel_y", "pitch_x", "pitch_y", "confidence",
+    "is_visible", "is_in_play", "is_corrected",
+)
+
+
+# ============================================================================
+# FIELD MAPPING
+# ============================================================================
+
+def team_side_from_str(team_str: Optional[str]) -> TeamSide:
+    """Map a tracker_v2 team string to TeamSide."""
+    if team_str == "home":
+        return TeamSide.HOME
+    elif team_str == "away":
+        return TeamSide.AWAY
+    elif team_str == "referee":
+        return TeamSide.REFEREE
+    return TeamSide.UNKNOWN
+
+
+def detection_class_from_str(class_str: Optional[str]) -> DetectionClass:
+    """Map a tracker_v2 detection class string to DetectionClass."""
+    if class_str == "ball":
+        return DetectionClass.BALL
+    elif class_str == "referee":
+        return DetectionClass.REFEREE
+    elif class_str == "goalkeeper":
+        return DetectionClass.GOALKEEPER
+    return DetectionClass.PLAYER
+
+
+def frame_timestamp_ms(frame_number: int, fps: float, timestamp: Optional[float] = None) -> int:
+    """Frame timestamp in milliseconds, from the point timestamp (seconds) or fps."""
+    if timestamp is not None:
+        return int(round(float(timestamp) * 1000))
+    return int(frame_number * 1000 / fps)
+
+
+def detection_values(point: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a tracker_v2 track point to Detection column values.
+
+    tracker_v2 boxes are {x, y, width, height} in pixels; the foot position is
+    the bottom center of the box.
+    """
+    bbox = point.get("bbox", {})
+    x1 = float(bbox.get("x", 0))
+    y1 = float(bbox.get("y", 0))
+    x2 = x1 + float(bbox.get("width", 0))
+    y2 = y1 + float(bbox.get("height", 0))
+    center_x = (x1 + x2) / 2
+
+    return {
+        "bbox_x1": x1,
+        "bbox_y1": y1,
+        "bbox_x2": x2,
+        "bbox_y2": y2,
+        "center_x": center_x,
+        "center_y": (y1 + y2) / 2,
+        "foot_x": center_x,
+        "foot_y": y2,
+        "pitch_x": point.get("pitch_x"),
+        "pitch_y": point.get("pitch_y"),
+        "confidence": point.get("confidence", 0.5),
+    }
+
+
+def ball_position_values(point: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a tracker_v2 ball point to BallPosition column values."""
+    return {
+        "pixel_x": point.get("x", 0),
+        "pixel_y": point.get("y", 0),
+        "pitch_x": point.get("pitch_x"),
+        "pitch_y": point.get("pitch_y"),
+        "confidence": point.get("confidence", 0.5),
+        "is_visible": point.get("is_visible", True),
+    }
+
+
+# ============================================================================
+# ROW BUILDERS
+# ============================================================================
+
+def track_row(match_id: int, track_data: Dict[str, Any], now: datetime,
+              frame_numbers: Optional[np.ndarray] = None) -> tuple:
+    """
+    Build a TRACK_COLUMNS row for a tracker_v2 track.
+
+    frame_numbers holds the frame numbers of the track's points when they are
+    not in track_data["points"] (columnar imports).
+    """
+    if frame_numbers is None:
+        frame_numbers = [p.get("frame_number", 0) for p in track_data.get("points") or []]
+    first_frame = track_data.get("start_frame")
+    last_frame = track_data.get("end_frame")
+    if first_frame is None:
+        first_frame = int(min(frame_numbers, default=0))
+    if last_frame is None:
+        last_frame = int(max(frame_numbers, default=0))
+
+    return (
+        match_id,
+        track_data.get("track_id"),
+        team_side_from_str(track_data.get("team", "unknown")).name,
+        detection_class_from_str(track_data.get("detection_class", "player")).name,
+        track_data.get("jersey_number"),
+        first_frame,
+        last_frame,
+        len(frame_numbers),
+        False,
+        False,
+        now,
+        now,
+    )
+
+
+def detection_row(frame_id: int, track_pk: int, ai_class: DetectionClass,
+                  ai_team: TeamSide, point: Dict[str, Any], now: datetime) -> tuple:
+    """Build a DETECTION_COLUMNS row for a tracker_v2 track point."""
+    values = detection_values(point)
+    return (
+        frame_id,
+        track_pk,
+        values["bbox_x1"], values["bbox_y1"], values["bbox_x2"], values["bbox_y2"],
+        values["center_x"], values["center_y"], values["foot_x"], values["foot_y"],
+        values["pitch_x"], values["pitch_y"], values["confidence"],
+        ai_class.name,
+        ai_team.name,
+        now,
+    )
+
+
+def ball_position_row(frame_id: int, point: Dict[str, Any]) -> tuple:
+    """Build a BALL_POSITION_COLUMNS row for a tracker_v2 ball point."""
+    values = ball_position_values(point)
+    return (
+        frame_id,
+        values["pixel_x"], values["pixel_y"],
+        values["pitch_x"], values["pitch_y"],
+        values["confidence"],
+        values["is_visible"],
+        True,
+        False,
+    )
+
+
+def detection_rows_from_arrays(frame_ids: np.ndarray, track_pks: np.ndarray,
+                               ai_classes: np.ndarray, ai_teams: np.ndarray,
+                               bbox: np.ndarray, pitch: np.ndarray,
+                               confidence: np.ndarray, now: datetime):
+    """
+    DETECTION_COLUMNS rows from per-point arrays (bbox is x, y, width, height).
+
+    Box geometry is computed with NumPy one ARRAY_CHUNK_SIZE slice at a time,
+    so memory-mapped inputs are only paged in chunk by chunk. Unknown pitch
+    positions stay NaN; write the rows with nan_as_null=True.
+    """
+    for start in range(0, len(frame_ids), ARRAY_CHUNK_SIZE):
+        end = start + ARRAY_CHUNK_SIZE
+        box = np.asarray(bbox[start:end], dtype=np.float64)
+        x1, y1 = box[:, 0], box[:, 1]
+        x2, y2 = x1 + box[:, 2], y1 + box[:, 3]
+        center_x = ((x1 + x2) / 2).tolist()
+        yield from zip(
+            frame_ids[start:end].tolist(), track_pks[start:end].tolist(),
+            x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist(),
+            center_x, ((y1 + y2) / 2).tolist(), center_x, y2.tolist(),
+            pitch[start:end, 0].tolist(), pitch[start:end, 1].tolist(),
+            confidence[start:end].tolist(),
+            ai_classes[start:end].tolist(), ai_teams[start:end].tolist(),
+            repeat(now),
+        )
+
+
+def ball_position_rows_from_arrays(frame_ids: np.ndarray, xy: np.ndarray, pitch: np.ndarray,
+                                   confidence: np.ndarray, visible: np.ndarray):
+    """BALL_POSITION_COLUMNS rows from per-point arrays; write with nan_as_null=True."""
+    for start in range(0, len(frame_ids), ARRAY_CHUNK_SIZE):
+        end = start + ARRAY_CHUNK_SIZE
+        yield from zip(
+            frame_ids[start:end].tolist(),
+            xy[start:end, 0].tolist(), xy[start:end, 1].tolist(),
+            pitch[start:end, 0].tolist(), pitch[start:end, 1].tolist(),
+            confidence[start:end].tolist(), visible[start:end].tolist(),
+            repeat(True), repeat(False),
+        )
+
+
+# ============================================================================
+# COPY / MULTI-ROW INSERT
+# ============================================================================
+
+class _CsvRowStream:
+    """Read-only file object that CSV-encodes rows lazily for COPY FROM STDIN."""
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self.count = 0
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) + self._buffer.tell() < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self.count += 1
+
+        self._pending += self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+        if size < 0:
+            chunk, self._pending = self._pending, ""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def copy_rows(db: Session, table_name: str, columns: Sequence[str],
+              rows: Iterable[Sequence[Any]], nan_as_null: bool = False) -> int:
+    """
+    Write rows into a table in the session's current transaction.
+
+    PostgreSQL gets a single streaming COPY (None is written as NULL, enum
+    columns expect member names). Other databases fall back to multi-row
+    INSERTs of INSERT_BATCH_SIZE rows. With nan_as_null, float NaN values
+    are stored as NULL too. Returns the number of rows written.
+
+    rows is consumed while the COPY is open, so it must not touch the session
+    (including expired ORM attributes such as match.id after a commit).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        stream = _CsvRowStream(rows)
+        options = "FORMAT csv, NULL 'nan'" if nan_as_null else "FORMAT csv"
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH ({options})",
+                stream,
+            )
+        finally:
+            cursor.close()
+        return stream.count
+
+    table = Base.metadata.tables[table_name]
+    count = 0
+    batch = []
+    for row in rows:
+        if nan_as_null:
+            row = [None if isinstance(v, float) and math.isnan(v) else v for v in row]
+        batch.append(dict(zip(columns, row)))
+        if len(batch) >= INSERT_BATCH_SIZE:
+            db.execute(table.insert(), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+class IngestStats:
+    """Rows written and wall time per table, for throughput reporting."""
+
+    def __init__(self):
+        self.tables: Dict[str, List[float]] = {}
+
+    def record(self, table_name: str, rows: int, seconds: float):
+        entry = self.tables.setdefault(table_name, [0, 0.0])
+        entry[0] += rows
+        entry[1] += seconds
+
+    def report(self) -> str:
+        lines = ["Ingest throughput:"]
+        for table_name, (rows, seconds) in self.tables.items():
+            rate = rows / seconds if seconds > 0 else 0.0
+            lines.append(f"  {table_name:<16} {int(rows):>10} rows  {seconds:8.2f}s  {rate:12.0f} rows/sec")
+        return "\n".join(lines)
+
+
+def load_table(db: Session, stats: IngestStats, table_name: str,
+               columns: Sequence[str], rows: Iterable[Sequence[Any]],
+               nan_as_null: bool = False) -> int:
+    """Write rows into one table in its own transaction and record throughput."""
+    start = time.perf_counter()
+    try:
+        count = copy_rows(db, table_name, columns, rows, nan_as_null=nan_as_null)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    stats.record(table_name, count, time.perf_counter() - start)
+    return count
+
+
+# ============================================================================
+# FRAMES
+# ============================================================================
+
+class FrameIndex:
+    """
+    Frame number -> frames.id for one match, creating missing frames in bulk.
+
+    With max_cached set, the cache is dropped whenever it grows past that many
+    frames and lookups fall back to the database, so memory stays bounded for
+    streaming imports regardless of match length.
+    """
+
+    def __init__(self, match: Match, max_cached: Optional[int] = None):
+        self.match_id = match.id
+        self.fps = float(match.fps) if match.fps else 25.0
+        self.max_cached = max_cached
+        self.ids: Dict[int, int] = {}
+
+    def _load(self, db: Session, frame_numbers: List[int]):
+        """Cache IDs of existing frames among the sorted frame_numbers."""
+        wanted = set(frame_numbers)
+        rows = db.query(Frame.frame_number, Frame.id).filter(
+            Frame.match_id == self.match_id,
+            Frame.frame_number.between(frame_numbers[0], frame_numbers[-1])
+        )
+        for frame_number, frame_id in rows:
+            if frame_number in wanted:
+                self.ids[frame_number] = frame_id
+
+    def ensure(self, db: Session, stats: IngestStats,
+               timestamps: Dict[int, Optional[float]]):
+        """
+        Make sure a frame row exists for every frame number in timestamps.
+
+        timestamps maps frame_number -> timestamp in seconds (or None to derive
+        it from fps). All missing frames are written in a single COPY, and
+        self.ids holds every requested frame number afterwards.
+        """
+        if self.max_cached is not None and len(self.ids) > self.max_cached:
+            self.ids.clear()
+
+        missing = sorted(n for n in timestamps if n not in self.ids)
+        if not missing:
+            return
+
+        self._load(db, missing)
+        missing = [n for n in missing if n not in self.ids]
+        if not missing:
+            return
+
+        now = datetime.utcnow()
+        match_id, fps = self.match_id, self.fps
+        rows = (
+            (match_id, n, frame_timestamp_ms(n, fps, timestamps[n]), now)
+            for n in missing
+        )
+        load_table(db, stats, "frames", FRAME_COLUMNS, rows)
+        self._load(db, missing)
+
+
+def collect_frame_timestamps(tracks_data: Iterable[Dict[str, Any]],
+                             ball_data: Iterable[Dict[str, Any]]) -> Dict[int, Optional[float]]:
+    """Every frame number referenced by track points and ball positions."""
+    timestamps: Dict[int, Optional[float]] = {}
+    for track_data in tracks_data:
+        for point in track_data.get("points") or []:
+            frame_num = point.get("frame_number", 0)
+            if timestamps.get(frame_num) is None:
+                timestamps[frame_num] = point.get("timestamp")
+    for point in ball_data:
+        frame_num = point.get("frame_number", 0)
+        if timestamps.get(frame_num) is None:
+            timestamps[frame_num] = point.get("timestamp")
+    return timestamps
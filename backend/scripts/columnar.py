@@ -0,0 +1,151 @@
+"""
+Columnar binary interchange format for football_tracker_v2 match exports.
+
+A match is a directory holding one .npy file per column plus header.json:
+
+    match_0412/
+        header.json               match header, track metadata, events, calibration
+        points_frame_number.npy   int32   (N,)   track points, grouped by track in header order
+        points_timestamp.npy      float64 (N,)   seconds, NaN = derive from fps
+        points_bbox.npy           float64 (N, 4) x, y, width, height in pixels
+        points_confidence.npy     float64 (N,)
+        points_pitch.npy          float64 (N, 2) pitch x, y in meters, NaN = unknown
+        ball_frame_number.npy     int32   (M,)
+        ball_timestamp.npy        float64 (M,)
+        ball_xy.npy               float64 (M, 2) pixel position
+        ball_pitch.npy            float64 (M, 2)
+        ball_confidence.npy       float64 (M,)
+        ball_visible.npy          bool    (M,)
+
+header.json carries the same top-level keys as the JSON format, except that
+each entry of "tracks" has a "points" count instead of a points list and
+"ball_positions" is omitted. Arrays are plain .npy so readers can memory-map
+them instead of parsing per-point objects.
+
+Written by scripts/export_from_tracker_v2.py (--format columnar) and read by
+scripts/import_tracker_data.py (--columnar-dir).
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+FORMAT_NAME = "tracker_v2_columnar"
+FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+
+# Column name -> (dtype, number of components per row; 1 = flat array)
+POINT_COLUMNS = {
+    "points_frame_number": ("int32", 1),
+    "points_timestamp": ("float64", 1),
+    "points_bbox": ("float64", 4),
+    "points_confidence": ("float64", 1),
+    "points_pitch": ("float64", 2),
+}
+
+BALL_COLUMNS = {
+    "ball_frame_number": ("int32", 1),
+    "ball_timestamp": ("float64", 1),
+    "ball_xy": ("float64", 2),
+    "ball_pitch": ("float64", 2),
+    "ball_confidence": ("float64", 1),
+    "ball_visible": ("bool", 1),
+}
+
+COLUMNS = {**POINT_COLUMNS, **BALL_COLUMNS}
+
+
+def is_columnar_dir(path) -> bool:
+    return (Path(path) / HEADER_FILE).is_file()
+
+
+def empty_columns(n_points: int, n_ball: int) -> Dict[str, np.ndarray]:
+    """Allocate every column, NaN-filled where a value may be missing."""
+    arrays = {}
+    for name, (dtype, width) in COLUMNS.items():
+        rows = n_points if name in POINT_COLUMNS else n_ball
+        shape = (rows,) if width == 1 else (rows, width)
+        arrays[name] = np.full(shape, np.nan) if dtype == "float64" else np.zeros(shape, dtype=dtype)
+    return arrays
+
+
+def _number(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+def columns_from_match_dict(data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Split a JSON-format match dict into a columnar header and arrays."""
+    tracks = data.get("tracks") or []
+    ball = data.get("ball_positions") or []
+    arrays = empty_columns(sum(len(t.get("points") or []) for t in tracks), len(ball))
+
+    header = {k: v for k, v in data.items() if k not in ("tracks", "ball_positions")}
+    header["tracks"] = []
+
+    i = 0
+    for track in tracks:
+        points = track.get("points") or []
+        meta = {k: v for k, v in track.items() if k != "points"}
+        meta["points"] = len(points)
+        header["tracks"].append(meta)
+        for point in points:
+            bbox = point.get("bbox", {})
+            arrays["points_frame_number"][i] = point.get("frame_number", 0)
+            arrays["points_timestamp"][i] = _number(point.get("timestamp"))
+            arrays["points_bbox"][i] = (
+                bbox.get("x", 0), bbox.get("y", 0), bbox.get("width", 0), bbox.get("height", 0)
+            )
+            arrays["points_confidence"][i] = point.get("confidence", 0.5)
+            arrays["points_pitch"][i] = (_number(point.get("pitch_x")), _number(point.get("pitch_y")))
+            i += 1
+
+    for j, point in enumerate(ball):
+        arrays["ball_frame_number"][j] = point.get("frame_number", 0)
+        arrays["ball_timestamp"][j] = _number(point.get("timestamp"))
+        arrays["ball_xy"][j] = (point.get("x", 0), point.get("y", 0))
+        arrays["ball_pitch"][j] = (_number(point.get("pitch_x")), _number(point.get("pitch_y")))
+        arrays["ball_confidence"][j] = point.get("confidence", 0.5)
+        arrays["ball_visible"][j] = point.get("is_visible", True)
+
+    return header, arrays
+
+
+def write_match_columns(out_dir, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> Path:
+    """Write a columnar match directory; header["tracks"] point counts must match the arrays."""
+    out_dir = Path(out_dir)
+    n_points = sum(t.get("points", 0) for t in header.get("tracks", []))
+    if len(arrays["points_frame_number"]) != n_points:
+        raise ValueError(
+            f"Track point counts add up to {n_points}, arrays hold {len(arrays['points_frame_number'])}"
+        )
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, (dtype, _) in COLUMNS.items():
+        np.save(out_dir / f"{name}.npy", np.ascontiguousarray(arrays[name], dtype=dtype))
+
+    header = dict(header, format=FORMAT_NAME, version=FORMAT_VERSION)
+    with open(out_dir / HEADER_FILE, "w") as f:
+        json.dump(header, f, indent=2)
+    return out_dir
+
+
+def read_match_columns(path) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Read a columnar match directory; arrays are memory-mapped read-only."""
+    path = Path(path)
+    with open(path / HEADER_FILE) as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"{path} is not a {FORMAT_NAME} directory")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"{path} uses format version {header['version']}, "
+                         f"this importer reads up to {FORMAT_VERSION}")
+
+    arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in COLUMNS}
+    return header, arrays
+
+
+def track_point_counts(header: Dict[str, Any]) -> List[int]:
+    return [t.get("points", 0) for t in header.get("tracks", [])]
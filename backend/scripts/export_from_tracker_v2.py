@@ -6,6 +6,8 @@ into JSON format that can be imported into the annotation tool.
 
 Usage:
     python -m scripts.export_from_tracker_v2 --output /path/to/output.json
+    python -m scripts.export_from_tracker_v2 --demo --format columnar --output /path/to/match_dir
+    python -m scripts.export_from_tracker_v2 --from-json match.json --format columnar --output match_dir
 """
 
 import argparse
@@ -15,6 +17,8 @@ from pathlib import Path
 from dataclasses import asdict
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
 # Add football_tracker_v2 to path
 TRACKER_V2_PATH = Path(__file__).parent.parent.parent.parent / "football_tracker_v2"
 sys.path.insert(0, str(TRACKER_V2_PATH))
@@ -32,6 +36,9 @@ except ImportError as e:
     print(f"Warning: Could not import football_tracker_v2 models: {e}")
     TRACKER_AVAILABLE = False
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts.columnar import columns_from_match_dict, empty_columns, write_match_columns
+
 
 def dataclass_to_dict(obj) -> Dict[str, Any]:
     """Convert a dataclass to dictionary, handling nested objects."""
@@ -54,6 +61,19 @@ def dataclass_to_dict(obj) -> Dict[str, Any]:
     return obj
 
 
+def convert_track_meta(track: 'Track') -> Dict[str, Any]:
+    """Track fields of the import format, without points."""
+    return {
+        "track_id": track.track_id,
+        "team": track.team,
+        "detection_class": "player",  # Default, can be enhanced
+        "jersey_number": None,  # Would need jersey recognition
+        "confidence": track.identity_confidence,
+        "start_frame": track.start_frame,
+        "end_frame": track.end_frame,
+    }
+
+
 def convert_track(track: 'Track') -> Dict[str, Any]:
     """Convert a Track object to import format."""
     points = []
@@ -76,16 +96,9 @@ def convert_track(track: 'Track') -> Dict[str, Any]:
 
         points.append(point_data)
 
-    return {
-        "track_id": track.track_id,
-        "team": track.team,
-        "detection_class": "player",  # Default, can be enhanced
-        "jersey_number": None,  # Would need jersey recognition
-        "confidence": track.identity_confidence,
-        "start_frame": track.start_frame,
-        "end_frame": track.end_frame,
-        "points": points,
-    }
+    result = convert_track_meta(track)
+    result["points"] = points
+    return result
 
 
 def convert_event(event: 'Event') -> Dict[str, Any]:
@@ -163,23 +176,7 @@ def convert_match_data(
 ) -> Dict[str, Any]:
     """Convert full match data to import format."""
 
-    result = {
-        "home_team": {
-            "name": home_team.name if home_team else "Home Team",
-            "primary_color": home_team.kit_color if home_team else "#FF0000",
-            "secondary_color": "#FFFFFF",
-        },
-        "away_team": {
-            "name": away_team.name if away_team else "Away Team",
-            "primary_color": away_team.kit_color if away_team else "#0000FF",
-            "secondary_color": "#FFFFFF",
-        },
-        "match_date": match_date or "2024-01-01",
-        "fps": fps,
-        "total_frames": total_frames,
-        "video_width": 1920,
-        "video_height": 1080,
-    }
+    result = convert_match_header(home_team, away_team, match_date, fps, total_frames)
 
     # Convert tracks
     if tracks:
@@ -213,6 +210,89 @@ def convert_match_data(
     return result
 
 
+def convert_match_header(
+    home_team: 'Team',
+    away_team: 'Team',
+    match_date: str = None,
+    fps: float = 25.0,
+    total_frames: int = 0,
+) -> Dict[str, Any]:
+    """Match-level fields of the import format."""
+    return {
+        "home_team": {
+            "name": home_team.name if home_team else "Home Team",
+            "primary_color": home_team.kit_color if home_team else "#FF0000",
+            "secondary_color": "#FFFFFF",
+        },
+        "away_team": {
+            "name": away_team.name if away_team else "Away Team",
+            "primary_color": away_team.kit_color if away_team else "#0000FF",
+            "secondary_color": "#FFFFFF",
+        },
+        "match_date": match_date or "2024-01-01",
+        "fps": fps,
+        "total_frames": total_frames,
+        "video_width": 1920,
+        "video_height": 1080,
+    }
+
+
+def _pitch(position) -> tuple:
+    return (position.x, position.y) if position else (np.nan, np.nan)
+
+
+def convert_match_columns(
+    home_team: 'Team',
+    away_team: 'Team',
+    tracks: List['Track'],
+    events: List['Event'],
+    calibration: Optional['Calibration'] = None,
+    ball_track: Optional['BallTrack'] = None,
+    match_date: str = None,
+    fps: float = 25.0,
+    total_frames: int = 0,
+):
+    """
+    Convert full match data to the columnar format (see scripts/columnar.py).
+
+    Track and ball points are written straight into preallocated arrays
+    instead of one dict per point. Returns (header, arrays).
+    """
+    header = convert_match_header(home_team, away_team, match_date, fps, total_frames)
+    tracks = tracks or []
+    ball_points = ball_track.points if ball_track and ball_track.points else []
+    arrays = empty_columns(sum(len(t.points) for t in tracks), len(ball_points))
+
+    header["tracks"] = []
+    i = 0
+    for track in tracks:
+        meta = convert_track_meta(track)
+        meta["points"] = len(track.points)
+        header["tracks"].append(meta)
+        for point in track.points:
+            arrays["points_frame_number"][i] = point.frame_number
+            arrays["points_timestamp"][i] = point.timestamp
+            arrays["points_bbox"][i] = (point.bbox.x, point.bbox.y, point.bbox.width, point.bbox.height)
+            arrays["points_confidence"][i] = point.confidence
+            arrays["points_pitch"][i] = _pitch(point.pitch_position)
+            i += 1
+
+    for j, point in enumerate(ball_points):
+        arrays["ball_frame_number"][j] = point.frame_number
+        arrays["ball_timestamp"][j] = point.timestamp
+        arrays["ball_xy"][j] = (point.bbox.x + point.bbox.width // 2, point.bbox.y + point.bbox.height // 2)
+        arrays["ball_pitch"][j] = _pitch(point.pitch_position)
+        arrays["ball_confidence"][j] = point.confidence
+        arrays["ball_visible"][j] = True
+
+    if events:
+        header["events"] = [convert_event(e) for e in events]
+    if calibration:
+        header["calibration"] = convert_calibration(calibration)
+
+    return header, arrays
+
+
 def create_demo_export():
     """Create a demo export with realistic sample data."""
     return {
@@ -351,27 +431,46 @@ def create_demo_export():
     }
 
 
+def write_export(data: Dict[str, Any], output: str, fmt: str):
+    """Write a JSON-format match dict as JSON or as a columnar directory."""
+    if fmt == "columnar":
+        header, arrays = columns_from_match_dict(data)
+        write_match_columns(output, header, arrays)
+        print(f"Columnar export saved to {output}/")
+        print(f"Import it with: python -m scripts.import_tracker_data --columnar-dir {output}")
+    else:
+        with open(output, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"Export saved to {output}")
+        print(f"Import it with: python -m scripts.import_tracker_data --json-file {output}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Export football_tracker_v2 data to import format")
-    parser.add_argument("--output", "-o", default="tracker_export.json", help="Output JSON file path")
+    parser.add_argument("--output", "-o", default="tracker_export.json",
+                        help="Output JSON file path (a directory for --format columnar)")
     parser.add_argument("--demo", action="store_true", help="Create demo export with sample data")
+    parser.add_argument("--format", choices=["json", "columnar"], default="json",
+                        help="json: one nested JSON file; columnar: directory of .npy arrays + header.json")
+    parser.add_argument("--from-json", help="Convert an existing JSON export instead of tracker output")
 
     args = parser.parse_args()
 
     if args.demo:
-        data = create_demo_export()
-        with open(args.output, 'w') as f:
-            json.dump(data, f, indent=2)
-        print(f"Demo export saved to {args.output}")
-        print(f"Import it with: python -m scripts.import_tracker_data --json-file {args.output}")
+        write_export(create_demo_export(), args.output, args.format)
+        return
+
+    if args.from_json:
+        with open(args.from_json) as f:
+            write_export(json.load(f), args.output, args.format)
         return
 
     if not TRACKER_AVAILABLE:
         print("football_tracker_v2 not available. Use --demo to create sample data.")
         return
 
-    # If tracker is available, you would load your data here
-    # For now, create demo data
+    # If tracker is available, you would load your data here and pass it to
+    # convert_match_data (json) or convert_match_columns (columnar)
     print("No match data provided. Use --demo for sample data.")
 
 
@@ -0,0 +1,121 @@
+"""
+Checkpoint bookkeeping for resumable tracker_v2 imports.
+
+Every batch of imported rows is committed in the same transaction as the
+matching ImportCheckpoint update, so after a crash the checkpoint describes
+exactly what is in the database. The mark_* / record_* helpers only modify
+the checkpoint and its progress rows in the session; the caller's next
+commit persists them.
+
+Per-track progress is one ImportTrackProgress row per track, so a batch
+updates one row instead of rewriting the progress of every track.
+
+Used by scripts/import_tracker_data.py (--resume).
+"""
+
+import os
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.imports import ImportCheckpoint, ImportTrackProgress
+from app.models.team import Match
+
+
+def _source_identity(json_path: str):
+    """Absolute path, size and mtime of an import source file."""
+    stat = os.stat(json_path)
+    return os.path.abspath(json_path), stat.st_size, stat.st_mtime
+
+
+def create_checkpoint(db: Session, json_path: str, match: Match) -> ImportCheckpoint:
+    """Start a checkpoint for a new import of json_path into match."""
+    path, size, mtime = _source_identity(json_path)
+    checkpoint = ImportCheckpoint(
+        match_id=match.id,
+        source_path=path,
+        source_size=size,
+        source_mtime=mtime,
+        completed_sections=[],
+    )
+    db.add(checkpoint)
+    db.commit()
+    db.refresh(checkpoint)
+    return checkpoint
+
+
+def find_resumable_checkpoint(db: Session, json_path: str) -> Optional[ImportCheckpoint]:
+    """
+    Latest checkpoint for json_path, or None if it was never imported.
+
+    A finished checkpoint means the file is already imported. One for an
+    older version of the file is ignored if it finished (the new version is
+    a fresh import) and raises ValueError if it did not, since its committed
+    progress would no longer line up with the file's contents.
+    """
+    path, size, mtime = _source_identity(json_path)
+    checkpoint = db.query(ImportCheckpoint).filter(
+        ImportCheckpoint.source_path == path
+    ).order_by(ImportCheckpoint.id.desc()).first()
+
+    if checkpoint and (checkpoint.source_size != size or checkpoint.source_mtime != mtime):
+        if checkpoint.is_complete:
+            return None
+        raise ValueError(
+            f"{json_path} changed since import of match {checkpoint.match_id} started; "
+            "delete that match or import without --resume"
+        )
+    return checkpoint
+
+
+def section_done(checkpoint: ImportCheckpoint, section: str) -> bool:
+    return section in (checkpoint.completed_sections or [])
+
+
+def mark_section(checkpoint: ImportCheckpoint, section: str):
+    if not section_done(checkpoint, section):
+        checkpoint.completed_sections = list(checkpoint.completed_sections or []) + [section]
+
+
+def track_progress(db: Session, checkpoint: ImportCheckpoint, tracker_id: Any) -> Optional[ImportTrackProgress]:
+    """Progress of a track, or None if no run has created it yet."""
+    return db.query(ImportTrackProgress).filter(
+        ImportTrackProgress.checkpoint_id == checkpoint.id,
+        ImportTrackProgress.tracker_track_id == str(tracker_id)
+    ).first()
+
+
+def record_track_batch(db: Session, checkpoint: ImportCheckpoint, tracker_id: Any, track_pk: int,
+                       points: int, last_frame: Optional[int]):
+    """Record that the first `points` points of a track are in the database."""
+    progress = track_progress(db, checkpoint, tracker_id)
+    if progress is None:
+        progress = ImportTrackProgress(
+            checkpoint_id=checkpoint.id,
+            tracker_track_id=str(tracker_id),
+            track_id=track_pk,
+        )
+        db.add(progress)
+        db.flush()
+    progress.points = points
+    progress.last_frame = last_frame
+
+
+def mark_track_done(db: Session, checkpoint: ImportCheckpoint, tracker_id: Any):
+    progress = track_progress(db, checkpoint, tracker_id)
+    if progress is not None:
+        progress.is_complete = True
+
+
+def resumed_track_ids(db: Session, checkpoint: ImportCheckpoint) -> dict:
+    """tracker_v2 track_id -> tracks.id for every track the checkpoint has seen."""
+    track_ids = {}
+    for key, track_pk in db.query(ImportTrackProgress.tracker_track_id, ImportTrackProgress.track_id).filter(
+        ImportTrackProgress.checkpoint_id == checkpoint.id
+    ):
+        try:
+            tracker_id = int(key)
+        except ValueError:
+            tracker_id = key
+        track_ids[tracker_id] = track_pk
+    return track_ids
@@ -7,25 +7,65 @@ system into the annotation tool's PostgreSQL database.
 Usage:
     python -m scripts.import_tracker_data --match-dir /path/to/match/output
     python -m scripts.import_tracker_data --json-file /path/to/data.json
+    python -m scripts.import_tracker_data --json-file /path/to/data.json --bulk
+    python -m scripts.import_tracker_data --json-file /path/to/data.json --stream
+    python -m scripts.import_tracker_data --match-dir /path/to/matchday --parallel 8
+    python -m scripts.import_tracker_data --json-file /path/to/data.json --stream --resume
+    python -m scripts.import_tracker_data --columnar-dir /path/to/match_dir
 """
 
 import argparse
+import contextlib
+import io
 import json
 import os
 import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+import numpy as np
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import Session, sessionmaker
+from app.change_version import bump_match_version
+from app.config import get_settings
 from app.database import engine, SessionLocal, Base
 from app.models.team import Team, Player, Match, MatchPlayer
-from app.models.tracking import Frame, Detection, Track, BallPosition, TeamSide, DetectionClass
+from app.models.tracking import Frame, Detection, Track, BallPosition
 from app.models.events import Event, EventType, EventCategory, BodyPart, PassHeight
-from app.models.calibration import PitchCalibration, CalibrationPoint
+from app.models.calibration import PitchCalibration, CalibrationPoint, CalibrationPointType
+from app.models.imports import ImportCheckpoint
+from scripts.bulk_ingest import (
+    IngestStats, FrameIndex, load_table, collect_frame_timestamps,
+    team_side_from_str, detection_class_from_str, frame_timestamp_ms,
+    detection_values, ball_position_values,
+    track_row, detection_row, ball_position_row,
+    detection_rows_from_arrays, ball_position_rows_from_arrays,
+    TRACK_COLUMNS, DETECTION_COLUMNS, BALL_POSITION_COLUMNS,
+)
+from scripts.import_checkpoints import (
+    create_checkpoint, find_resumable_checkpoint, section_done, mark_section,
+    track_progress, record_track_batch, mark_track_done, resumed_track_ids,
+)
+from scripts.columnar import HEADER_FILE, is_columnar_dir, read_match_columns, track_point_counts
+from scripts.track_aggregates import update_track_aggregates
+from scripts.json_stream import (
+    iter_match_records, IJSON_AVAILABLE,
+    HEADER, TRACK_START, TRACK_FIELD, TRACK_POINT, TRACK_END, EVENT, BALL_POSITION,
+)
+
+# Rows per batch for streaming imports
+DEFAULT_BATCH_SIZE = 5000
+
+# Frame IDs kept in memory during streaming imports before falling back to the DB
+STREAM_FRAME_CACHE = 50000
 
 # Mapping from tracker_v2 event types to our EventType enum
 EVENT_TYPE_MAP = {
@@ -34,30 +74,47 @@ EVENT_TYPE_MAP = {
     "tackle": EventType.TACKLE,
     "interception": EventType.INTERCEPTION,
     "clearance": EventType.CLEARANCE,
-    "duel": EventType.DUEL,
-    "sprint": EventType.SPRINT,
-    "pressing": EventType.PRESSING_TRIGGER,
+    "duel": EventType.GROUND_DUEL,
+    # EventType has no sprint (nor a physical category); a recovery run is the
+    # only run event, so tracker_v2 sprints are imported as recovery runs
+    "sprint": EventType.RECOVERY_RUN,
+    "pressing": EventType.PRESSURE,
     "reception": EventType.BALL_RECEIPT,
-    "possession_start": EventType.RECOVERY,
+    "possession_start": EventType.BALL_RECOVERY,
     "possession_end": EventType.DISPOSSESSED,
 }
 
 # Mapping for event categories
 EVENT_CATEGORY_MAP = {
-    "pass": EventCategory.PASS,
-    "shot": EventCategory.SHOT,
-    "tackle": EventCategory.DEFENSIVE,
-    "interception": EventCategory.DEFENSIVE,
-    "clearance": EventCategory.DEFENSIVE,
+    "pass": EventCategory.PASSING,
+    "shot": EventCategory.SHOOTING,
+    "tackle": EventCategory.DEFENDING,
+    "interception": EventCategory.DEFENDING,
+    "clearance": EventCategory.DEFENDING,
     "duel": EventCategory.DUEL,
-    "sprint": EventCategory.PHYSICAL,
-    "pressing": EventCategory.PHYSICAL,
-    "reception": EventCategory.BALL_CONTROL,
+    # Category of RECOVERY_RUN in EVENT_TYPES, so type and category agree
+    "sprint": EventCategory.DEFENDING,
+    "pressing": EventCategory.DEFENDING,
+    "reception": EventCategory.POSSESSION,
+    "possession_start": EventCategory.POSSESSION,
+    "possession_end": EventCategory.POSSESSION,
 }
 
 
+def lock_for_create(db: Session, key: str):
+    """
+    Serialise get-or-create of `key` across concurrent importers.
+
+    Takes a transaction-scoped PostgreSQL advisory lock, released by the
+    caller's next commit. No-op on other databases.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": zlib.crc32(key.encode())})
+
+
 def get_or_create_team(db: Session, name: str, short_name: str = None, primary_color: str = None, secondary_color: str = None) -> Team:
     """Get existing team or create new one."""
+    lock_for_create(db, f"team:{name}")
     team = db.query(Team).filter(Team.name == name).first()
     if not team:
         team = Team(
@@ -67,13 +124,14 @@ def get_or_create_team(db: Session, name: str, short_name: str = None, primary_c
             secondary_color=secondary_color or "#FFFFFF",
         )
         db.add(team)
-        db.commit()
-        db.refresh(team)
+    db.commit()
+    db.refresh(team)
     return team
 
 
 def get_or_create_player(db: Session, team_id: int, jersey_number: int, name: str = None) -> Player:
     """Get existing player or create new one."""
+    lock_for_create(db, f"player:{team_id}:{jersey_number}")
     player = db.query(Player).filter(
         Player.team_id == team_id,
         Player.jersey_number == jersey_number
@@ -87,8 +145,8 @@ def get_or_create_player(db: Session, team_id: int, jersey_number: int, name: st
             position="Unknown",
         )
         db.add(player)
-        db.commit()
-        db.refresh(player)
+    db.commit()
+    db.refresh(player)
     return player
 
 
@@ -149,28 +207,8 @@ def import_tracks(db: Session, match: Match, tracks_data: List[Dict[str, Any]])
 
     for track_data in tracks_data:
         tracker_id = track_data.get("track_id")
-
-        # Determine team side
-        team_str = track_data.get("team", "unknown")
-        if team_str == "home":
-            ai_team = TeamSide.HOME
-        elif team_str == "away":
-            ai_team = TeamSide.AWAY
-        elif team_str == "referee":
-            ai_team = TeamSide.REFEREE
-        else:
-            ai_team = TeamSide.UNKNOWN
-
-        # Determine detection class
-        class_str = track_data.get("detection_class", "player")
-        if class_str == "ball":
-            detection_class = DetectionClass.BALL
-        elif class_str == "referee":
-            detection_class = DetectionClass.REFEREE
-        elif class_str == "goalkeeper":
-            detection_class = DetectionClass.GOALKEEPER
-        else:
-            detection_class = DetectionClass.PLAYER
+        ai_team = team_side_from_str(track_data.get("team", "unknown"))
+        detection_class = detection_class_from_str(track_data.get("detection_class", "player"))
 
         track = Track(
             match_id=match.id,
@@ -178,7 +216,6 @@ def import_tracks(db: Session, match: Match, tracks_data: List[Dict[str, Any]])
             ai_team=ai_team,
             ai_detection_class=detection_class,
             ai_jersey_number=track_data.get("jersey_number"),
-            ai_confidence=track_data.get("confidence", 0.5),
             first_frame=track_data.get("start_frame", 0),
             last_frame=track_data.get("end_frame", 0),
         )
@@ -204,24 +241,19 @@ def import_tracks(db: Session, match: Match, tracks_data: List[Dict[str, Any]])
                 frame = Frame(
                     match_id=match.id,
                     frame_number=frame_num,
-                    timestamp=point.get("timestamp", frame_num / match.fps),
+                    timestamp_ms=frame_timestamp_ms(frame_num, match.fps, point.get("timestamp")),
                 )
                 db.add(frame)
                 db.commit()
                 db.refresh(frame)
 
             # Create detection
-            bbox = point.get("bbox", {})
             detection = Detection(
                 frame_id=frame.id,
                 track_id=track.id,
-                x=bbox.get("x", 0),
-                y=bbox.get("y", 0),
-                width=bbox.get("width", 0),
-                height=bbox.get("height", 0),
-                confidence=point.get("confidence", 0.5),
-                pitch_x=point.get("pitch_x"),
-                pitch_y=point.get("pitch_y"),
+                ai_detection_class=detection_class,
+                ai_team=ai_team,
+                **detection_values(point),
             )
             db.add(detection)
 
@@ -231,40 +263,35 @@ def import_tracks(db: Session, match: Match, tracks_data: List[Dict[str, Any]])
     return track_map
 
 
-def import_events(db: Session, match: Match, events_data: List[Dict[str, Any]], track_map: Dict[int, Track]):
-    """Import events from tracker_v2 format."""
+def import_events(db: Session, match: Match, events_data: List[Dict[str, Any]], track_ids: Dict[int, int]):
+    """Import events from tracker_v2 format.
+
+    track_ids maps tracker_v2 track IDs to tracks.id.
+    """
     event_count = 0
 
     for event_data in events_data:
         # Map event type
         event_type_str = event_data.get("event_type", "pass")
         event_type = EVENT_TYPE_MAP.get(event_type_str, EventType.PASS)
-        event_category = EVENT_CATEGORY_MAP.get(event_type_str, EventCategory.PASS)
+        event_category = EVENT_CATEGORY_MAP.get(event_type_str, EventCategory.PASSING)
 
         # Get player track if available
-        player_track_id = None
-        if "player_track_id" in event_data and event_data["player_track_id"] in track_map:
-            player_track_id = track_map[event_data["player_track_id"]].id
-
-        target_track_id = None
-        if "target_track_id" in event_data and event_data["target_track_id"] in track_map:
-            target_track_id = track_map[event_data["target_track_id"]].id
-
-        opponent_track_id = None
-        if "opponent_track_id" in event_data and event_data["opponent_track_id"] in track_map:
-            opponent_track_id = track_map[event_data["opponent_track_id"]].id
+        player_track_id = track_ids.get(event_data.get("player_track_id"))
+        target_track_id = track_ids.get(event_data.get("target_track_id"))
+        opponent_track_id = track_ids.get(event_data.get("opponent_track_id"))
 
         # Body part mapping
         body_part = None
         body_part_str = event_data.get("body_part")
         if body_part_str:
             body_part_map = {
-                "foot": BodyPart.FOOT,
+                "foot": BodyPart.OTHER,
                 "right_foot": BodyPart.RIGHT_FOOT,
                 "left_foot": BodyPart.LEFT_FOOT,
                 "head": BodyPart.HEAD,
             }
-            body_part = body_part_map.get(body_part_str, BodyPart.FOOT)
+            body_part = body_part_map.get(body_part_str, BodyPart.OTHER)
 
         # Pass height mapping
         pass_height = None
@@ -302,8 +329,10 @@ def import_events(db: Session, match: Match, events_data: List[Dict[str, Any]],
         db.add(event)
         event_count += 1
 
+    bump_match_version(db, match.id)
     db.commit()
     print(f"Imported {event_count} events")
+    return event_count
 
 
 def import_ball_positions(db: Session, match: Match, ball_data: List[Dict[str, Any]]):
@@ -321,7 +350,7 @@ def import_ball_positions(db: Session, match: Match, ball_data: List[Dict[str, A
             frame = Frame(
                 match_id=match.id,
                 frame_number=frame_num,
-                timestamp=point.get("timestamp", frame_num / match.fps),
+                timestamp_ms=frame_timestamp_ms(frame_num, match.fps, point.get("timestamp")),
             )
             db.add(frame)
             db.commit()
@@ -329,12 +358,7 @@ def import_ball_positions(db: Session, match: Match, ball_data: List[Dict[str, A
 
         ball_pos = BallPosition(
             frame_id=frame.id,
-            x=point.get("x", 0),
-            y=point.get("y", 0),
-            pitch_x=point.get("pitch_x"),
-            pitch_y=point.get("pitch_y"),
-            confidence=point.get("confidence", 0.5),
-            is_visible=point.get("is_visible", True),
+            **ball_position_values(point),
         )
         db.add(ball_pos)
 
@@ -354,19 +378,27 @@ def import_calibration(db: Session, match: Match, calibration_data: Dict[str, An
         homography_matrix=homography,
         pitch_length=calibration_data.get("pitch_length", 105.0),
         pitch_width=calibration_data.get("pitch_width", 68.0),
-        is_active=True,
+        is_valid=homography is not None,
     )
 
     db.add(calibration)
-    db.commit()
-    db.refresh(calibration)
+    db.flush()
 
     # Import calibration points
     points = calibration_data.get("points", [])
     for point in points:
+        type_str = point.get("type", "custom")
+        try:
+            point_type = CalibrationPointType(type_str)
+            custom_label = None
+        except ValueError:
+            point_type = CalibrationPointType.CUSTOM
+            custom_label = type_str
+
         cal_point = CalibrationPoint(
             calibration_id=calibration.id,
-            point_type=point.get("type", "custom"),
+            point_type=point_type,
+            custom_label=custom_label,
             pixel_x=point.get("pixel_x", 0),
             pixel_y=point.get("pixel_y", 0),
             pitch_x=point.get("pitch_x", 0),
@@ -395,7 +427,7 @@ def import_from_json_file(db: Session, json_path: str):
 
     # Import events
     if "events" in data:
-        import_events(db, match, data["events"], track_map)
+        import_events(db, match, data["events"], {k: t.id for k, t in track_map.items()})
 
     # Import ball positions
     if "ball_positions" in data:
@@ -405,10 +437,640 @@ def import_from_json_file(db: Session, json_path: str):
     if "calibration" in data:
         import_calibration(db, match, data["calibration"])
 
+    update_track_aggregates(db, match.id, match.fps)
+    print("Computed track aggregates")
+
+    print(f"\nImport complete! Match ID: {match.id}")
+    return match
+
+
+def import_track_aggregates(db: Session, match: Match, stats: IngestStats,
+                            checkpoint: ImportCheckpoint):
+    """Fill distance, speed, sprint and confidence aggregates of the match's tracks."""
+    if section_done(checkpoint, "track_aggregates"):
+        return
+    start = time.perf_counter()
+    mark_section(checkpoint, "track_aggregates")
+    count = update_track_aggregates(db, match.id, match.fps)
+    stats.record("track_aggregates", count, time.perf_counter() - start)
+
+
+def bulk_import_tracking(db: Session, match: Match, tracks_data: List[Dict[str, Any]],
+                         ball_data: List[Dict[str, Any]], stats: IngestStats,
+                         checkpoint: Optional[ImportCheckpoint] = None) -> Dict[int, int]:
+    """
+    Bulk-load frames, tracks, detections and ball positions for a match.
+
+    All frames referenced by track points and ball positions are created in one
+    pass first, then each table is streamed in with COPY in its own transaction.
+    With a checkpoint, each table is marked done in the same transaction and
+    tables already marked are skipped. Returns a map of tracker_v2 track_id ->
+    tracks.id.
+    """
+    now = datetime.utcnow()
+    match_id = match.id
+
+    # Existing frames are reused, so this is safe to repeat on resume
+    frames = FrameIndex(match)
+    frames.ensure(db, stats, collect_frame_timestamps(tracks_data, ball_data))
+
+    def load_section(section, table_name, columns, rows):
+        if checkpoint is not None:
+            if section_done(checkpoint, section):
+                return
+            mark_section(checkpoint, section)
+        load_table(db, stats, table_name, columns, rows)
+
+    load_section("tracks", "tracks", TRACK_COLUMNS,
+                 (track_row(match_id, t, now) for t in tracks_data))
+    track_ids = dict(
+        db.query(Track.track_id, Track.id).filter(Track.match_id == match_id).all()
+    )
+
+    def detection_rows():
+        for track_data in tracks_data:
+            track_pk = track_ids[track_data.get("track_id")]
+            ai_team = team_side_from_str(track_data.get("team", "unknown"))
+            ai_class = detection_class_from_str(track_data.get("detection_class", "player"))
+            for point in track_data.get("points") or []:
+                frame_id = frames.ids[point.get("frame_number", 0)]
+                yield detection_row(frame_id, track_pk, ai_class, ai_team, point, now)
+
+    load_section("detections", "detections", DETECTION_COLUMNS, detection_rows())
+
+    load_section("ball_positions", "ball_positions", BALL_POSITION_COLUMNS,
+                 (ball_position_row(frames.ids[p.get("frame_number", 0)], p) for p in ball_data))
+
+    return track_ids
+
+
+def start_checkpointed_import(db: Session, source_path: str, header: Dict[str, Any],
+                              resume: bool):
+    """
+    Create the match and checkpoint for a bulk import, or pick them up on resume.
+
+    Returns (match, checkpoint); checkpoint.is_complete means the source was
+    already imported and there is nothing left to do.
+    """
+    checkpoint = find_resumable_checkpoint(db, source_path) if resume else None
+    if checkpoint is not None and checkpoint.is_complete:
+        print(f"Already imported as match {checkpoint.match_id}")
+        return checkpoint.match, checkpoint
+    elif checkpoint is not None:
+        match = checkpoint.match
+        print(f"Resuming import into match {match.id} (done: {', '.join(checkpoint.completed_sections) or 'nothing'})")
+        return match, checkpoint
+
+    match = import_match_from_json(db, header)
+    return match, create_checkpoint(db, source_path, match)
+
+
+def finish_checkpointed_import(db: Session, match: Match, data: Dict[str, Any],
+                               track_ids: Dict[int, int], stats: IngestStats,
+                               checkpoint: ImportCheckpoint):
+    """Import events, calibration and track aggregates, then close the checkpoint."""
+    if "events" in data and not section_done(checkpoint, "events"):
+        start = time.perf_counter()
+        mark_section(checkpoint, "events")
+        import_events(db, match, data["events"], track_ids)
+        stats.record("events", len(data["events"]), time.perf_counter() - start)
+
+    if "calibration" in data and not section_done(checkpoint, "calibration"):
+        mark_section(checkpoint, "calibration")
+        import_calibration(db, match, data["calibration"])
+
+    import_track_aggregates(db, match, stats, checkpoint)
+
+    checkpoint.is_complete = True
+    db.commit()
+
+    print(stats.report())
+    print(f"\nImport complete! Match ID: {match.id}")
+
+
+def bulk_import_from_json_file(db: Session, json_path: str,
+                               stats: Optional[IngestStats] = None,
+                               resume: bool = False) -> Match:
+    """
+    Import all data from a JSON file using the bulk COPY path.
+
+    Progress is checkpointed per table; with resume, an unfinished import of
+    the same file continues into its existing match instead of starting over,
+    and a finished one is not imported again.
+    """
+    print(f"Loading data from {json_path}...")
+
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    stats = stats if stats is not None else IngestStats()
+    match, checkpoint = start_checkpointed_import(db, json_path, data, resume)
+    if checkpoint.is_complete:
+        return match
+
+    track_ids = bulk_import_tracking(
+        db, match, data.get("tracks", []), data.get("ball_positions", []), stats, checkpoint
+    )
+    finish_checkpointed_import(db, match, data, track_ids, stats, checkpoint)
+    return match
+
+
+def columnar_import_tracking(db: Session, match: Match, header: Dict[str, Any],
+                             arrays: Dict[str, np.ndarray], stats: IngestStats,
+                             checkpoint: ImportCheckpoint) -> Dict[int, int]:
+    """
+    Bulk-load frames, tracks, detections and ball positions from columnar arrays.
+
+    Same tables and checkpoint sections as bulk_import_tracking, but frame
+    IDs, track IDs and box geometry are resolved with NumPy over the whole
+    (memory-mapped) columns instead of per-point dicts.
+    """
+    now = datetime.utcnow()
+    match_id = match.id
+    tracks_meta = header.get("tracks", [])
+    counts = np.array(track_point_counts(header), dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    point_frames = np.asarray(arrays["points_frame_number"], dtype=np.int64)
+    ball_frames = np.asarray(arrays["ball_frame_number"], dtype=np.int64)
+
+    # Every referenced frame, with the first known timestamp of each
+    all_frames = np.concatenate((point_frames, ball_frames))
+    all_times = np.concatenate((arrays["points_timestamp"], arrays["ball_timestamp"]))
+    timestamps: Dict[int, Optional[float]] = dict.fromkeys(np.unique(all_frames).tolist())
+    timed = ~np.isnan(all_times)
+    numbers, first = np.unique(all_frames[timed], return_index=True)
+    timestamps.update(zip(numbers.tolist(), all_times[timed][first].tolist()))
+
+    frames = FrameIndex(match)
+    frames.ensure(db, stats, timestamps)
+    frame_keys = np.array(sorted(frames.ids), dtype=np.int64)
+    frame_values = np.array([frames.ids[n] for n in frame_keys.tolist()], dtype=np.int64)
+
+    def frame_ids_for(numbers: np.ndarray) -> np.ndarray:
+        return frame_values[np.searchsorted(frame_keys, numbers)]
+
+    def load_section(section, table_name, columns, rows, nan_as_null=True):
+        if section_done(checkpoint, section):
+            return
+        mark_section(checkpoint, section)
+        load_table(db, stats, table_name, columns, rows, nan_as_null=nan_as_null)
+
+    load_section("tracks", "tracks", TRACK_COLUMNS, (
+        track_row(match_id, meta, now, point_frames[offsets[i]:offsets[i + 1]])
+        for i, meta in enumerate(tracks_meta)
+    ), nan_as_null=False)
+    track_ids = dict(
+        db.query(Track.track_id, Track.id).filter(Track.match_id == match_id).all()
+    )
+
+    labels = [
+        (detection_class_from_str(t.get("detection_class", "player")).name,
+         team_side_from_str(t.get("team", "unknown")).name)
+        for t in tracks_meta
+    ]
+    load_section("detections", "detections", DETECTION_COLUMNS, detection_rows_from_arrays(
+        frame_ids_for(point_frames),
+        np.repeat(np.array([track_ids[t.get("track_id")] for t in tracks_meta], dtype=np.int64), counts),
+        np.repeat(np.array([c for c, _ in labels], dtype=object), counts),
+        np.repeat(np.array([team for _, team in labels], dtype=object), counts),
+        arrays["points_bbox"], arrays["points_pitch"], arrays["points_confidence"], now,
+    ))
+
+    load_section("ball_positions", "ball_positions", BALL_POSITION_COLUMNS, ball_position_rows_from_arrays(
+        frame_ids_for(ball_frames),
+        arrays["ball_xy"], arrays["ball_pitch"], arrays["ball_confidence"], arrays["ball_visible"],
+    ))
+
+    return track_ids
+
+
+def columnar_import_from_dir(db: Session, match_dir: str,
+                             stats: Optional[IngestStats] = None,
+                             resume: bool = False) -> Match:
+    """
+    Import a columnar match directory written by export_from_tracker_v2 --format columnar.
+
+    The arrays are memory-mapped and streamed into COPY chunk by chunk, so no
+    per-point Python objects are built. Checkpointing and resume work as for
+    bulk_import_from_json_file, keyed on the directory's header.json.
+    """
+    print(f"Loading columnar data from {match_dir}...")
+
+    header, arrays = read_match_columns(match_dir)
+    stats = stats if stats is not None else IngestStats()
+    match, checkpoint = start_checkpointed_import(db, os.path.join(match_dir, HEADER_FILE), header, resume)
+    if checkpoint.is_complete:
+        return match
+
+    track_ids = columnar_import_tracking(db, match, header, arrays, stats, checkpoint)
+    finish_checkpointed_import(db, match, header, track_ids, stats, checkpoint)
+    return match
+
+
+class StreamImporter:
+    """
+    Writes streamed match records to the database in fixed-size batches.
+
+    Consumes the records of scripts.json_stream.iter_match_records, so only
+    one batch of track points, events or ball positions is held at a time.
+    Detections and ball positions go through the same COPY path as --bulk.
+
+    Every batch commits together with an ImportCheckpoint update. Passing the
+    checkpoint of an interrupted import resumes it: records already committed
+    are skipped and the rest are written into the same match and tracks.
+    """
+
+    def __init__(self, db: Session, json_path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 stats: Optional[IngestStats] = None,
+                 checkpoint: Optional[ImportCheckpoint] = None):
+        self.db = db
+        self.json_path = json_path
+        self.batch_size = batch_size
+        self.stats = stats if stats is not None else IngestStats()
+        self.checkpoint = checkpoint
+        self.header: Dict[str, Any] = {}
+        self.match: Optional[Match] = None
+        self.match_id: Optional[int] = None
+        self.frames: Optional[FrameIndex] = None
+        self.track_ids: Dict[int, int] = {}  # tracker_v2 track_id -> tracks.id
+
+        # Track currently being read
+        self._track: Dict[str, Any] = {}
+        self._track_pk: Optional[int] = None
+        self._track_labels = None  # (ai_detection_class, ai_team) written to its detections
+        self._track_points = 0
+        self._track_frames = None  # (first, last) frame seen in its points
+        self._track_resolved = False  # checkpoint progress looked up for this track
+        self._track_skip = 0  # points already committed by an earlier run
+        self._track_done = False  # track fully committed by an earlier run
+
+        # Flat arrays: items seen in the file, and items an earlier run committed
+        self._events_seen = 0
+        self._ball_seen = 0
+        self._events_skip = checkpoint.events_done if checkpoint else 0
+        self._ball_skip = checkpoint.ball_positions_done if checkpoint else 0
+
+        # Pending batches
+        self._points: List[Dict[str, Any]] = []
+        self._events: List[Dict[str, Any]] = []
+        self._ball: List[Dict[str, Any]] = []
+
+    def run(self, records) -> Match:
+        """Import every record and return the created (or resumed) match."""
+        for kind, key, value in records:
+            if kind == HEADER:
+                self.header[key] = value
+                continue
+
+            if self.match is None:
+                self._create_match()
+
+            if kind == TRACK_START:
+                self._start_track()
+            elif kind == TRACK_FIELD:
+                self._track[key] = value
+            elif kind == TRACK_POINT:
+                if not self._track_resolved:
+                    self._resolve_track()
+                if self._track_done:
+                    continue
+                if self._track_skip:
+                    self._track_skip -= 1
+                    continue
+                self._points.append(value)
+                if len(self._points) >= self.batch_size:
+                    self._flush_points()
+            elif kind == TRACK_END:
+                if not self._track_resolved:
+                    self._resolve_track()
+                if not self._track_done:
+                    self._finish_track()
+            elif kind == EVENT:
+                self._events_seen += 1
+                if self._events_seen <= self._events_skip:
+                    continue
+                self._events.append(value)
+                if len(self._events) >= self.batch_size:
+                    self._flush_events()
+            elif kind == BALL_POSITION:
+                self._ball_seen += 1
+                if self._ball_seen <= self._ball_skip:
+                    continue
+                self._ball.append(value)
+                if len(self._ball) >= self.batch_size:
+                    self._flush_ball()
+
+        if self.match is None:
+            self._create_match()
+        self._flush_events()
+        self._flush_ball()
+
+        if self.header.get("calibration") and not section_done(self.checkpoint, "calibration"):
+            mark_section(self.checkpoint, "calibration")
+            import_calibration(self.db, self.match, self.header["calibration"])
+
+        import_track_aggregates(self.db, self.match, self.stats, self.checkpoint)
+
+        self.checkpoint.is_complete = True
+        self.db.commit()
+        return self.match
+
+    def _create_match(self):
+        if self.checkpoint is not None:
+            self.match = self.checkpoint.match
+            self.track_ids = resumed_track_ids(self.db, self.checkpoint)
+            print(f"Resuming import into match {self.match.id}")
+        else:
+            self.match = import_match_from_json(self.db, self.header)
+            self.checkpoint = create_checkpoint(self.db, self.json_path, self.match)
+        self.match_id = self.match.id
+        self.frames = FrameIndex(self.match, max_cached=STREAM_FRAME_CACHE)
+
+    def _start_track(self):
+        self._track = {}
+        self._track_pk = None
+        self._track_labels = None
+        self._track_points = 0
+        self._track_frames = None
+        self._track_resolved = False
+        self._track_skip = 0
+        self._track_done = False
+
+    def _resolve_track(self):
+        """Pick up the current track's progress from the checkpoint, if any."""
+        self._track_resolved = True
+        progress = track_progress(self.db, self.checkpoint, self._track.get("track_id"))
+        if progress is not None and progress.is_complete:
+            self._track_done = True
+            return
+
+        if progress is not None:
+            self._track_pk = progress.track_id
+            self._track_labels = self._labels()
+            self._track_points = self._track_skip = progress.points
+            if progress.points:
+                self._track_frames = tuple(self.db.query(
+                    func.min(Frame.frame_number), func.max(Frame.frame_number)
+                ).join(Detection, Detection.frame_id == Frame.id).filter(
+                    Detection.track_id == self._track_pk
+                ).one())
+
+    def _labels(self):
+        return (
+            detection_class_from_str(self._track.get("detection_class", "player")),
+            team_side_from_str(self._track.get("team", "unknown")),
+        )
+
+    def _insert_track(self):
+        """Create the current track from the fields read so far."""
+        start = time.perf_counter()
+        ai_class, ai_team = self._labels()
+        tracker_id = self._track.get("track_id")
+        track = Track(
+            match_id=self.match_id,
+            track_id=tracker_id,
+            ai_team=ai_team,
+            ai_detection_class=ai_class,
+            ai_jersey_number=self._track.get("jersey_number"),
+            first_frame=self._track.get("start_frame", 0),
+            last_frame=self._track.get("end_frame", 0),
+            total_detections=0,
+        )
+        self.db.add(track)
+        self.db.flush()
+        record_track_batch(self.db, self.checkpoint, tracker_id, track.id, 0, None)
+        self.db.commit()
+        self._track_pk = track.id
+        self._track_labels = (ai_class, ai_team)
+        self.track_ids[tracker_id] = track.id
+        self.stats.record("tracks", 1, time.perf_counter() - start)
+
+    def _flush_points(self):
+        if self._track_pk is None:
+            self._insert_track()
+        if not self._points:
+            return
+
+        timestamps: Dict[int, Optional[float]] = {}
+        for point in self._points:
+            frame_num = point.get("frame_number", 0)
+            if timestamps.get(frame_num) is None:
+                timestamps[frame_num] = point.get("timestamp")
+        self.frames.ensure(self.db, self.stats, timestamps)
+
+        now = datetime.utcnow()
+        frame_ids = self.frames.ids
+        ai_class, ai_team = self._track_labels
+        rows = [
+            detection_row(frame_ids[p.get("frame_number", 0)], self._track_pk, ai_class, ai_team, p, now)
+            for p in self._points
+        ]
+
+        first, last = min(timestamps), max(timestamps)
+        if self._track_frames:
+            first = min(first, self._track_frames[0])
+            last = max(last, self._track_frames[1])
+
+        record_track_batch(self.db, self.checkpoint, self._track.get("track_id"), self._track_pk,
+                           self._track_points + len(self._points), last)
+        load_table(self.db, self.stats, "detections", DETECTION_COLUMNS, rows)
+
+        self._track_frames = (first, last)
+        self._track_points += len(self._points)
+        self._points = []
+
+    def _finish_track(self):
+        """Flush remaining points and apply track fields that followed its points."""
+        self._flush_points()
+
+        start = time.perf_counter()
+        ai_class, ai_team = self._labels()
+        first, last = self._track_frames or (0, 0)
+        self.db.query(Track).filter(Track.id == self._track_pk).update({
+            Track.ai_team: ai_team,
+            Track.ai_detection_class: ai_class,
+            Track.ai_jersey_number: self._track.get("jersey_number"),
+            Track.first_frame: self._track.get("start_frame", first),
+            Track.last_frame: self._track.get("end_frame", last),
+            Track.total_detections: self._track_points,
+        }, synchronize_session=False)
+
+        if (ai_class, ai_team) != self._track_labels:
+            self.db.query(Detection).filter(Detection.track_id == self._track_pk).update({
+                Detection.ai_detection_class: ai_class,
+                Detection.ai_team: ai_team,
+            }, synchronize_session=False)
+
+        mark_track_done(self.db, self.checkpoint, self._track.get("track_id"))
+        self.db.commit()
+        self.stats.record("tracks", 0, time.perf_counter() - start)
+        self.track_ids[self._track.get("track_id")] = self._track_pk
+
+    def _flush_events(self):
+        if not self._events:
+            return
+        start = time.perf_counter()
+        self.checkpoint.events_done = self._events_seen
+        count = import_events(self.db, self.match, self._events, self.track_ids)
+        self.stats.record("events", count, time.perf_counter() - start)
+        self._events = []
+
+    def _flush_ball(self):
+        if not self._ball:
+            return
+        timestamps: Dict[int, Optional[float]] = {}
+        for point in self._ball:
+            frame_num = point.get("frame_number", 0)
+            if timestamps.get(frame_num) is None:
+                timestamps[frame_num] = point.get("timestamp")
+        self.frames.ensure(self.db, self.stats, timestamps)
+
+        frame_ids = self.frames.ids
+        rows = [ball_position_row(frame_ids[p.get("frame_number", 0)], p) for p in self._ball]
+        self.checkpoint.ball_positions_done = self._ball_seen
+        load_table(self.db, self.stats, "ball_positions", BALL_POSITION_COLUMNS, rows)
+        self._ball = []
+
+
+def stream_import_from_json_file(db: Session, json_path: str,
+                                 batch_size: int = DEFAULT_BATCH_SIZE,
+                                 stats: Optional[IngestStats] = None,
+                                 resume: bool = False) -> Match:
+    """
+    Import a JSON file incrementally with flat memory use.
+
+    The file is parsed with ijson and track points, events and ball positions
+    are written in batches of batch_size, so peak memory does not grow with
+    the length of the match. With resume, an unfinished import of the same
+    file continues from its last committed batch, and a finished one is not
+    imported again.
+    """
+    print(f"Streaming data from {json_path}...")
+
+    checkpoint = find_resumable_checkpoint(db, json_path) if resume else None
+    if checkpoint is not None and checkpoint.is_complete:
+        print(f"Already imported as match {checkpoint.match_id}")
+        return checkpoint.match
+
+    importer = StreamImporter(db, json_path, batch_size=batch_size, stats=stats, checkpoint=checkpoint)
+    with open(json_path, 'rb') as f:
+        match = importer.run(iter_match_records(f))
+
+    print(importer.stats.report())
     print(f"\nImport complete! Match ID: {match.id}")
     return match
 
 
+# ============================================================================
+# DIRECTORY IMPORTS
+# ============================================================================
+
+# Session factory of the current import worker process
+_worker_sessions = None
+
+
+def _init_import_worker():
+    """Give each worker process its own engine instead of the parent's pool."""
+    global _worker_sessions
+    engine.dispose(close=False)
+    worker_engine = create_engine(get_settings().db_url, pool_pre_ping=True, pool_size=1, max_overflow=0)
+    _worker_sessions = sessionmaker(autocommit=False, autoflush=False, bind=worker_engine)
+
+
+def _import_match_file(json_path: str, stream: bool, batch_size: int,
+                       resume: bool = False) -> Dict[str, Any]:
+    """Import one match file in a worker; returns a result summary for the parent."""
+    sessions = _worker_sessions or SessionLocal
+    db = sessions()
+    stats = IngestStats()
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            if is_columnar_dir(json_path):
+                match = columnar_import_from_dir(db, json_path, stats=stats, resume=resume)
+            elif stream:
+                match = stream_import_from_json_file(db, json_path, batch_size=batch_size,
+                                                     stats=stats, resume=resume)
+            else:
+                match = bulk_import_from_json_file(db, json_path, stats=stats, resume=resume)
+        return {
+            "path": json_path,
+            "match_id": match.id,
+            "seconds": time.perf_counter() - start,
+            "tables": stats.tables,
+        }
+    except Exception as e:
+        db.rollback()
+        return {
+            "path": json_path,
+            "error": f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}",
+            "seconds": time.perf_counter() - start,
+            "tables": stats.tables,
+        }
+    finally:
+        db.close()
+
+
+def import_directory(match_dir: str, parallel: int = 1, stream: bool = False,
+                     batch_size: int = DEFAULT_BATCH_SIZE, resume: bool = False) -> List[Dict[str, Any]]:
+    """
+    Import every *.json match file and columnar match directory in a directory.
+
+    With parallel > 1 the files are fanned out to a process pool, one match
+    per worker at a time, each worker with its own engine and session. Teams
+    and players shared between matches are deduplicated by get_or_create_*.
+    With resume, interrupted matches continue from their checkpoints and
+    matches already imported completely are skipped.
+    Prints per-match progress and an aggregate throughput summary.
+    """
+    paths = sorted(
+        str(p) for p in Path(match_dir).iterdir()
+        if (p.suffix == ".json" and p.is_file()) or is_columnar_dir(p)
+    )
+    if not paths:
+        print(f"No .json match files or columnar match directories found in {match_dir}")
+        return []
+
+    workers = max(1, min(parallel, len(paths)))
+    print(f"Importing {len(paths)} matches from {match_dir} with {workers} worker(s)...")
+
+    results = []
+    totals = IngestStats()
+    start = time.perf_counter()
+
+    def report(result):
+        results.append(result)
+        for table_name, (rows, seconds) in result["tables"].items():
+            totals.record(table_name, rows, seconds)
+        name = Path(result["path"]).name
+        prefix = f"[{len(results)}/{len(paths)}] {name}"
+        if "error" in result:
+            print(f"{prefix}: FAILED after {result['seconds']:.1f}s - {result['error']}")
+        else:
+            print(f"{prefix}: match {result['match_id']} in {result['seconds']:.1f}s")
+
+    if workers == 1:
+        for path in paths:
+            report(_import_match_file(path, stream, batch_size, resume))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_import_worker) as pool:
+            futures = [pool.submit(_import_match_file, path, stream, batch_size, resume) for path in paths]
+            for future in as_completed(futures):
+                report(future.result())
+
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for r in results if "error" in r)
+    total_rows = sum(rows for rows, _ in totals.tables.values())
+
+    print()
+    print(totals.report())
+    print(f"\n{len(results) - failed} matches imported, {failed} failed in {elapsed:.1f}s "
+          f"({total_rows / elapsed if elapsed > 0 else 0:.0f} rows/sec overall)")
+    return results
+
+
 def create_sample_export_format():
     """Create a sample JSON export format for reference."""
     sample = {
@@ -496,7 +1158,22 @@ def create_sample_export_format():
 def main():
     parser = argparse.ArgumentParser(description="Import football_tracker_v2 data")
     parser.add_argument("--json-file", help="Path to JSON file to import")
+    parser.add_argument("--columnar-dir", help="Columnar match directory to import (header.json + .npy arrays)")
+    parser.add_argument("--match-dir",
+                        help="Directory of match JSON files and/or columnar match directories to import "
+                             "(uses the COPY path)")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="Worker processes for --match-dir")
     parser.add_argument("--create-sample", action="store_true", help="Create sample JSON format file")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Bulk-load tracking data with COPY and report rows/sec per table")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse the JSON file incrementally and load it in fixed-size batches")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Rows per batch for --stream")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue interrupted imports from their checkpoints and skip finished ones "
+                             "(uses the COPY path unless --stream is given)")
 
     args = parser.parse_args()
 
@@ -508,17 +1185,34 @@ def main():
         print(f"Sample format saved to {output_path}")
         return
 
-    if not args.json_file:
-        print("Please provide --json-file or use --create-sample")
+    if not args.json_file and not args.columnar_dir and not args.match_dir:
+        print("Please provide --json-file, --columnar-dir, --match-dir or use --create-sample")
+        return
+
+    if args.stream and not IJSON_AVAILABLE:
+        print("ijson not available. Install it with: pip install ijson")
         return
 
     # Create database tables
     Base.metadata.create_all(bind=engine)
 
+    if args.match_dir:
+        import_directory(args.match_dir, parallel=args.parallel, stream=args.stream,
+                         batch_size=args.batch_size, resume=args.resume)
+        return
+
     # Create session and import
     db = SessionLocal()
     try:
-        import_from_json_file(db, args.json_file)
+        if args.columnar_dir:
+            columnar_import_from_dir(db, args.columnar_dir, resume=args.resume)
+        elif args.stream:
+            stream_import_from_json_file(db, args.json_file, batch_size=args.batch_size,
+                                         resume=args.resume)
+        elif args.bulk or args.resume:
+            bulk_import_from_json_file(db, args.json_file, resume=args.resume)
+        else:
+            import_from_json_file(db, args.json_file)
     finally:
         db.close()
 
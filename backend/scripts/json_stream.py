@@ -0,0 +1,118 @@
+"""
+Incremental reader for football_tracker_v2 match JSON files.
+
+Walks a match export with ijson instead of json.load, so a multi-GB file is
+never materialised as Python objects. Only one track point, event or ball
+position is built at a time; everything else in the file is streamed past.
+
+Used by scripts/import_tracker_data.py (--stream).
+"""
+
+from typing import Any, BinaryIO, Iterator, Tuple
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Record kinds yielded by iter_match_records
+HEADER = "header"  # (HEADER, key, value) - top-level scalar/object, e.g. fps, calibration
+TRACK_START = "track_start"  # (TRACK_START, None, None)
+TRACK_FIELD = "track_field"  # (TRACK_FIELD, key, value) - track attribute other than points
+TRACK_POINT = "track_point"  # (TRACK_POINT, None, point)
+TRACK_END = "track_end"  # (TRACK_END, None, None)
+EVENT = "event"  # (EVENT, None, event)
+BALL_POSITION = "ball_position"  # (BALL_POSITION, None, point)
+
+_ITEM_KINDS = {
+    "events": EVENT,
+    "ball_positions": BALL_POSITION,
+}
+
+Record = Tuple[str, Any, Any]
+
+
+def _build_value(first: Tuple[str, str, Any], events: Iterator) -> Any:
+    """Build the JSON value that starts with event `first`, consuming its events."""
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    _, event, value = first
+    while True:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            return builder.value
+        _, event, value = next(events)
+
+
+def _iter_array(events: Iterator) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Yield the first event of each item of the array that starts next.
+
+    The caller must consume each item completely before advancing. A null
+    value in place of the array yields nothing.
+    """
+    _, event, _ = next(events)
+    if event != "start_array":
+        return
+    for item_start in events:
+        if item_start[1] == "end_array":
+            return
+        yield item_start
+
+
+def _iter_track(first: Tuple[str, str, Any], events: Iterator) -> Iterator[Record]:
+    """Yield the records of one track object, streaming its points."""
+    if first[1] != "start_map":
+        # Not a track object - skip it
+        _build_value(first, events)
+        return
+
+    yield (TRACK_START, None, None)
+    for _, event, key in events:
+        if event == "end_map":
+            break
+        # event == "map_key"
+        if key == "points":
+            for item_start in _iter_array(events):
+                yield (TRACK_POINT, None, _build_value(item_start, events))
+        else:
+            yield (TRACK_FIELD, key, _build_value(next(events), events))
+    yield (TRACK_END, None, None)
+
+
+def iter_match_records(f: BinaryIO) -> Iterator[Record]:
+    """
+    Walk a tracker_v2 match export and yield flat records in file order.
+
+    `tracks` (and each track's `points`), `events` and `ball_positions` are
+    streamed item by item; every other top-level key is yielded as a single
+    HEADER record. Importers rely on the layout written by
+    export_from_tracker_v2: match header keys first, then tracks before events.
+    """
+    if not IJSON_AVAILABLE:
+        raise RuntimeError("ijson is required for streaming imports (pip install ijson)")
+
+    events = iter(ijson.parse(f, use_float=True))
+
+    _, event, _ = next(events)
+    if event != "start_map":
+        raise ValueError("Match file must contain a JSON object")
+
+    for _, event, key in events:
+        if event == "end_map":
+            return
+        # event == "map_key"
+        if key == "tracks":
+            for item_start in _iter_array(events):
+                yield from _iter_track(item_start, events)
+        elif key in _ITEM_KINDS:
+            kind = _ITEM_KINDS[key]
+            for item_start in _iter_array(events):
+                yield (kind, None, _build_value(item_start, events))
+        else:
+            yield (HEADER, key, _build_value(next(events), events))
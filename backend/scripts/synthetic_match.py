@@ -0,0 +1,358 @@
+"""
+Seeded synthetic match generator for import/export benchmarks.
+
+Generates a full tracker_v2 match (tracks with fragmented IDs, ball, events,
+calibration) of any length directly as columnar arrays, and writes it as
+JSON (streamed track by track) or as a columnar directory. The same seed and
+settings always produce the same match.
+
+Usage:
+    python -m scripts.synthetic_match --minutes 90 --output match.json
+    python -m scripts.synthetic_match --minutes 10 --players 22 --format columnar --output match_dir
+"""
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.columnar import empty_columns, write_match_columns
+
+PITCH_LENGTH = 105.0
+PITCH_WIDTH = 68.0
+
+EVENT_TYPES = [
+    "pass", "pass", "pass", "pass", "reception", "reception", "duel", "pressing",
+    "tackle", "interception", "clearance", "sprint", "shot",
+    "possession_start", "possession_end",
+]
+
+
+@dataclass
+class SyntheticMatchConfig:
+    """Size and shape of a generated match."""
+    minutes: float = 10.0
+    fps: float = 25.0
+    players: int = 22  # outfield players + goalkeepers on the pitch
+    referees: int = 1
+    events_per_minute: float = 20.0
+    mean_track_seconds: float = 30.0  # average length before the tracker loses an ID
+    dropout: float = 0.03  # share of frames a visible object is not detected
+    ball_visibility: float = 0.85
+    width: int = 1920
+    height: int = 1080
+    seed: int = 0
+
+    @property
+    def total_frames(self) -> int:
+        return int(round(self.minutes * 60 * self.fps))
+
+
+def _walk(rng: np.random.Generator, frames: int, objects: int, fps: float,
+          speed_sigma: float, persistence: float) -> np.ndarray:
+    """
+    Random walks on the pitch, shape (frames, objects, 2), in meters.
+
+    Velocity is an AR(1) process (per-second persistence), so runs build up
+    and fade instead of jittering; objects bounce off the touchlines.
+    """
+    a = persistence ** (1.0 / fps)
+    noise = rng.normal(0.0, speed_sigma * math.sqrt(1 - a * a), size=(frames, objects, 2))
+    bounds = np.array([PITCH_LENGTH, PITCH_WIDTH])
+
+    pos = np.empty((frames, objects, 2))
+    p = rng.uniform(0, 1, size=(objects, 2)) * bounds
+    v = rng.normal(0.0, speed_sigma, size=(objects, 2))
+    for f in range(frames):
+        v = a * v + noise[f]
+        p = p + v / fps
+        low, high = p < 0, p > bounds
+        p = np.where(low, -p, np.where(high, 2 * bounds - p, p))
+        v = np.where(low | high, -v, v)
+        pos[f] = p
+    return pos
+
+
+def _to_pixels(pitch: np.ndarray, width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fake broadcast camera: pitch (x, y) -> foot pixel (u, v) and box height."""
+    depth = pitch[..., 1] / PITCH_WIDTH  # 0 = far touchline, 1 = near
+    scale = 0.55 + 0.45 * depth
+    u = width / 2 + (pitch[..., 0] - PITCH_LENGTH / 2) / PITCH_LENGTH * width * scale
+    v = height * (0.3 + 0.65 * depth)
+    box_height = height * (0.05 + 0.06 * depth)
+    return np.stack((u, v), axis=-1), box_height
+
+
+def _segments(rng: np.random.Generator, frames: int, mean_frames: float):
+    """Split [0, frames) into track segments of exponentially distributed length."""
+    start = 0
+    while start < frames:
+        length = max(1, int(rng.exponential(mean_frames)))
+        yield start, min(frames, start + length)
+        start += length
+
+
+def generate_match_columns(config: SyntheticMatchConfig) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Generate a match as a columnar (header, arrays) pair."""
+    rng = np.random.default_rng(config.seed)
+    frames = config.total_frames
+    fps = config.fps
+    people = config.players + config.referees
+
+    pitch = _walk(rng, frames, people, fps, speed_sigma=3.0, persistence=0.6)
+    foot, box_height = _to_pixels(pitch, config.width, config.height)
+    detected = rng.random((frames, people)) >= config.dropout
+
+    # Who each object is: home half, away half, then referees
+    half = config.players // 2
+    roles = []
+    for i in range(people):
+        if i >= config.players:
+            roles.append(("referee", "referee", None))
+        else:
+            team = "home" if i < half else "away"
+            number = (i % half) + 1
+            roles.append((team, "goalkeeper" if number == 1 else "player", number))
+
+    # Cut every object's timeline into tracks
+    tracks = []  # (object index, start, end, points mask)
+    for i in range(people):
+        for start, end in _segments(rng, frames, config.mean_track_seconds * fps):
+            mask = detected[start:end, i]
+            if mask.any():
+                tracks.append((i, start, end, mask))
+
+    ball_pitch = _walk(rng, frames, 1, fps, speed_sigma=9.0, persistence=0.3)[:, 0]
+    ball_px, _ = _to_pixels(ball_pitch, config.width, config.height)
+    ball_seen = rng.random(frames) < config.ball_visibility
+    ball_frames = np.flatnonzero(ball_seen)
+
+    arrays = empty_columns(sum(int(m.sum()) for *_, m in tracks), len(ball_frames))
+    header: Dict[str, Any] = {
+        "home_team": {"name": "Benchmark Home", "primary_color": "#E31937", "secondary_color": "#FFFFFF"},
+        "away_team": {"name": "Benchmark Away", "primary_color": "#002B5C", "secondary_color": "#FFD700"},
+        "match_date": "2024-01-15",
+        "competition": "Synthetic",
+        "venue": f"seed {config.seed}",
+        "fps": fps,
+        "total_frames": frames,
+        "video_width": config.width,
+        "video_height": config.height,
+        "calibration": {
+            "pitch_length": PITCH_LENGTH,
+            "pitch_width": PITCH_WIDTH,
+            "homography_matrix": [[PITCH_LENGTH / config.width, 0.0, 0.0],
+                                  [0.0, PITCH_WIDTH / config.height, 0.0],
+                                  [0.0, 0.0, 1.0]],
+            "points": [
+                {"type": "center_spot", "pixel_x": config.width / 2, "pixel_y": config.height * 0.625,
+                 "pitch_x": PITCH_LENGTH / 2, "pitch_y": PITCH_WIDTH / 2},
+            ],
+        },
+        "tracks": [],
+    }
+
+    row = 0
+    track_spans = []  # (track_id, object index, start, end) for event players
+    for track_id, (i, start, end, mask) in enumerate(tracks, start=1):
+        team, detection_class, number = roles[i]
+        frame_numbers = np.arange(start, end)[mask]
+        n = len(frame_numbers)
+        rows = slice(row, row + n)
+
+        h = box_height[frame_numbers, i]
+        w = h * 0.4
+        arrays["points_frame_number"][rows] = frame_numbers
+        arrays["points_timestamp"][rows] = frame_numbers / fps
+        arrays["points_bbox"][rows] = np.column_stack((
+            np.round(foot[frame_numbers, i, 0] - w / 2, 1), np.round(foot[frame_numbers, i, 1] - h, 1),
+            np.round(w, 1), np.round(h, 1),
+        ))
+        arrays["points_confidence"][rows] = np.round(rng.uniform(0.45, 0.99, n), 3)
+        arrays["points_pitch"][rows] = np.round(pitch[frame_numbers, i], 2)
+        row += n
+
+        header["tracks"].append({
+            "track_id": track_id,
+            "team": team,
+            "detection_class": detection_class,
+            "jersey_number": number,
+            "confidence": round(float(rng.uniform(0.6, 0.99)), 3),
+            "start_frame": int(frame_numbers[0]),
+            "end_frame": int(frame_numbers[-1]),
+            "points": n,
+        })
+        if i < config.players:
+            track_spans.append((track_id, start, end))
+
+    arrays["ball_frame_number"][:] = ball_frames
+    arrays["ball_timestamp"][:] = ball_frames / fps
+    arrays["ball_xy"][:] = np.round(ball_px[ball_frames], 1)
+    arrays["ball_pitch"][:] = np.round(ball_pitch[ball_frames], 2)
+    arrays["ball_confidence"][:] = np.round(rng.uniform(0.3, 0.95, len(ball_frames)), 3)
+    arrays["ball_visible"][:] = True
+
+    header["events"] = _generate_events(rng, config, track_spans)
+    return header, arrays
+
+
+def _generate_events(rng: np.random.Generator, config: SyntheticMatchConfig, track_spans) -> list:
+    """Events at random frames, each by a player track active at that frame."""
+    frames = config.total_frames
+    count = int(round(config.minutes * config.events_per_minute))
+    if not count or not track_spans:
+        return []
+
+    spans = np.array([(start, end) for _, start, end in track_spans])
+    events = []
+    for frame in np.sort(rng.integers(0, frames, count)).tolist():
+        active = np.flatnonzero((spans[:, 0] <= frame) & (frame < spans[:, 1]))
+        if not len(active):
+            continue
+        player, target = rng.choice(active, 2) if len(active) > 1 else (active[0], active[0])
+        event_type = EVENT_TYPES[int(rng.integers(len(EVENT_TYPES)))]
+        start = rng.uniform(0, 1, 2) * (PITCH_LENGTH, PITCH_WIDTH)
+        end = np.clip(start + rng.normal(0, 15, 2), 0, (PITCH_LENGTH, PITCH_WIDTH))
+        event = {
+            "event_type": event_type,
+            "frame_number": frame,
+            "frame_end": min(frames - 1, frame + int(rng.integers(1, 2 * config.fps))),
+            "player_track_id": track_spans[player][0],
+            "start_x": round(float(start[0]), 2),
+            "start_y": round(float(start[1]), 2),
+            "is_successful": bool(rng.random() < 0.75),
+            "half": 1 if frame < frames / 2 else 2,
+            "confidence": round(float(rng.uniform(0.4, 0.95)), 3),
+        }
+        if event_type == "pass":
+            event.update({
+                "target_track_id": track_spans[target][0],
+                "end_x": round(float(end[0]), 2),
+                "end_y": round(float(end[1]), 2),
+                "body_part": "right_foot" if rng.random() < 0.7 else "left_foot",
+                "under_pressure": bool(rng.random() < 0.3),
+            })
+        events.append(event)
+    return events
+
+
+def _nullable(value: float):
+    return None if math.isnan(value) else value
+
+
+def write_match_json(header: Dict[str, Any], arrays: Dict[str, np.ndarray], path) -> Path:
+    """
+    Write a columnar match as a tracker_v2 JSON file.
+
+    Tracks are serialized one at a time, so the whole match never exists as
+    one nested dict. Keys are written in the order the importers expect.
+    """
+    path = Path(path)
+    meta = {k: v for k, v in header.items() if k not in ("tracks", "events", "format", "version")}
+    offsets = np.concatenate(([0], np.cumsum([t["points"] for t in header.get("tracks", [])])))
+
+    with open(path, "w") as f:
+        f.write(json.dumps(meta)[:-1])
+
+        f.write(', "tracks": [')
+        for k, track in enumerate(header.get("tracks", [])):
+            rows = slice(int(offsets[k]), int(offsets[k + 1]))
+            points = [
+                {
+                    "frame_number": frame,
+                    "timestamp": _nullable(ts),
+                    "bbox": {"x": x, "y": y, "width": w, "height": h},
+                    "confidence": conf,
+                    "pitch_x": _nullable(px),
+                    "pitch_y": _nullable(py),
+                }
+                for frame, ts, (x, y, w, h), conf, (px, py) in zip(
+                    arrays["points_frame_number"][rows].tolist(),
+                    arrays["points_timestamp"][rows].tolist(),
+                    arrays["points_bbox"][rows].tolist(),
+                    arrays["points_confidence"][rows].tolist(),
+                    arrays["points_pitch"][rows].tolist(),
+                )
+            ]
+            f.write(", " if k else "")
+            f.write(json.dumps(dict(track, points=points)))
+        f.write("]")
+
+        f.write(', "events": ')
+        f.write(json.dumps(header.get("events", [])))
+
+        f.write(', "ball_positions": [')
+        ball = zip(
+            arrays["ball_frame_number"].tolist(), arrays["ball_timestamp"].tolist(),
+            arrays["ball_xy"].tolist(), arrays["ball_pitch"].tolist(),
+            arrays["ball_confidence"].tolist(), arrays["ball_visible"].tolist(),
+        )
+        for k, (frame, ts, (x, y), (px, py), conf, visible) in enumerate(ball):
+            f.write(", " if k else "")
+            f.write(json.dumps({
+                "frame_number": frame, "timestamp": _nullable(ts), "x": x, "y": y,
+                "pitch_x": _nullable(px), "pitch_y": _nullable(py),
+                "confidence": conf, "is_visible": visible,
+            }))
+        f.write("]}")
+    return path
+
+
+def write_synthetic_video(path, config: SyntheticMatchConfig, frames: int = None) -> Path:
+    """
+    Write a placeholder match video (green pitch, frame counter) for export benchmarks.
+
+    frames defaults to the full match; a single frame is enough when only the
+    video dimensions are needed.
+    """
+    import cv2
+
+    frames = config.total_frames if frames is None else frames
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), config.fps,
+                             (config.width, config.height))
+    base = np.zeros((config.height, config.width, 3), dtype=np.uint8)
+    base[:] = (40, 140, 40)
+    for frame in range(frames):
+        img = base.copy()
+        cv2.putText(img, str(frame), (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        writer.write(img)
+    writer.release()
+    return Path(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic tracker_v2 match")
+    parser.add_argument("--output", "-o", required=True,
+                        help="Output JSON file (a directory for --format columnar)")
+    parser.add_argument("--format", choices=["json", "columnar"], default="json")
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=25.0)
+    parser.add_argument("--players", type=int, default=22, help="Players on the pitch per frame")
+    parser.add_argument("--referees", type=int, default=1)
+    parser.add_argument("--events-per-minute", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = SyntheticMatchConfig(
+        minutes=args.minutes, fps=args.fps, players=args.players, referees=args.referees,
+        events_per_minute=args.events_per_minute, seed=args.seed,
+    )
+    header, arrays = generate_match_columns(config)
+    if args.format == "columnar":
+        write_match_columns(args.output, header, arrays)
+    else:
+        write_match_json(header, arrays, args.output)
+    print(f"Synthetic match ({asdict(config)}): {len(arrays['points_frame_number'])} track points, "
+          f"{len(header['events'])} events -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Vectorized per-track aggregates: detections, confidence, distance, speed, sprints.
+
+Detections of a match are loaded as flat NumPy arrays (track, frame number,
+confidence, pitch position), sorted by track and frame, and reduced per track
+with bincount / ufunc.at instead of Python loops. The results are written back
+in one batched UPDATE per chunk of tracks.
+
+Runs at the end of every import in scripts/import_tracker_data.py, and on its
+own for matches imported before:
+
+Usage:
+    python -m scripts.track_aggregates --match-id 12
+    python -m scripts.track_aggregates --all
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.change_version import bump_match_version
+from app.database import SessionLocal
+from app.models.team import Match
+from app.models.tracking import Frame, Detection, Track
+
+# Speed above which a movement counts as a sprint (m/s)
+SPRINT_SPEED_MS = 7.0
+
+# Tracks whose detections are loaded and updated per query
+TRACKS_PER_CHUNK = 500
+
+# Detections fetched per round trip while filling the arrays
+FETCH_SIZE = 50000
+
+
+def compute_track_aggregates(track_pks: np.ndarray, frame_numbers: np.ndarray,
+                             confidence: np.ndarray, pitch_x: np.ndarray,
+                             pitch_y: np.ndarray, fps: float) -> Dict[str, np.ndarray]:
+    """
+    Reduce flat per-detection arrays to per-track aggregates.
+
+    pitch_x / pitch_y are NaN where a detection has no pitch position; only
+    steps between two consecutive positioned detections of the same track
+    count towards distance and speed. Speeds use the frame gap of each step
+    and fps, so skipped frames do not inflate them. A sprint is a run of
+    consecutive steps above SPRINT_SPEED_MS.
+
+    Returns arrays aligned with "track_id" (sorted unique track_pks).
+    """
+    order = np.lexsort((frame_numbers, track_pks))
+    track_pks = track_pks[order]
+    frame_numbers = frame_numbers[order]
+    pitch_x = pitch_x[order]
+    pitch_y = pitch_y[order]
+
+    tracks, idx, counts = np.unique(track_pks, return_inverse=True, return_counts=True)
+    n = len(tracks)
+
+    avg_confidence = np.bincount(idx, weights=confidence[order], minlength=n) / counts
+
+    # Steps between consecutive detections of the same track
+    dt = np.diff(frame_numbers).astype(np.float64) / fps
+    step_dist = np.hypot(np.diff(pitch_x), np.diff(pitch_y))
+    valid = (idx[1:] == idx[:-1]) & (dt > 0) & ~np.isnan(step_dist)
+
+    step_idx = idx[1:][valid]
+    step_dist = step_dist[valid]
+    dt = dt[valid]
+    speed = step_dist / dt
+
+    total_distance = np.bincount(step_idx, weights=step_dist, minlength=n)
+    total_time = np.bincount(step_idx, weights=dt, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_speed = np.where(total_time > 0, total_distance / total_time, np.nan)
+
+    max_speed = np.full(n, np.nan)
+    np.fmax.at(max_speed, step_idx, speed)
+
+    # A sprint starts on a fast step whose previous step (same track, adjacent) was not fast
+    fast = speed > SPRINT_SPEED_MS
+    valid_pos = np.flatnonzero(valid)
+    continues = np.zeros(len(fast), dtype=bool)
+    continues[1:] = (valid_pos[1:] == valid_pos[:-1] + 1) & (step_idx[1:] == step_idx[:-1])
+    prev_fast = np.zeros(len(fast), dtype=bool)
+    prev_fast[1:] = fast[:-1]
+    sprint_starts = fast & ~(continues & prev_fast)
+    sprint_count = np.bincount(step_idx[sprint_starts], minlength=n)
+
+    has_steps = total_time > 0
+    return {
+        "track_id": tracks,
+        "total_detections": counts,
+        "avg_confidence": avg_confidence,
+        "total_distance_m": np.where(has_steps, total_distance, np.nan),
+        "max_speed_ms": max_speed,
+        "avg_speed_ms": avg_speed,
+        "sprint_count": np.where(has_steps, sprint_count, -1),
+    }
+
+
+def _load_detection_arrays(db: Session, track_pks: List[int]):
+    """Flat (track, frame_number, confidence, pitch_x, pitch_y) arrays for tracks."""
+    query = select(
+        Detection.track_id, Frame.frame_number, Detection.confidence,
+        Detection.pitch_x, Detection.pitch_y,
+    ).join(Frame, Frame.id == Detection.frame_id).where(
+        Detection.track_id.in_(track_pks)
+    ).execution_options(yield_per=FETCH_SIZE)
+
+    # Core execution and plain tuples: building arrays from ORM rows is several times slower
+    chunks = []
+    for partition in db.connection().execute(query).partitions():
+        chunks.append(np.array([tuple(row) for row in partition], dtype=np.float64))
+    if not chunks:
+        return None
+    data = np.concatenate(chunks)
+    return (
+        data[:, 0].astype(np.int64), data[:, 1].astype(np.int64),
+        data[:, 2], data[:, 3], data[:, 4],
+    )
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def update_track_aggregates(db: Session, match_id: int, fps: Optional[float] = None) -> int:
+    """
+    Recompute and store the aggregates of every track of a match.
+
+    Tracks are processed TRACKS_PER_CHUNK at a time so memory stays bounded
+    for full matches; each chunk is one query and one batched UPDATE. Tracks
+    without detections get zero detections and empty stats. Commits and
+    returns the number of tracks updated.
+    """
+    if fps is None:
+        fps = db.query(Match.fps).filter(Match.id == match_id).scalar()
+    fps = float(fps) if fps else 25.0
+
+    track_pks = [pk for (pk,) in db.query(Track.id).filter(Track.match_id == match_id).order_by(Track.id)]
+
+    for start in range(0, len(track_pks), TRACKS_PER_CHUNK):
+        chunk = track_pks[start:start + TRACKS_PER_CHUNK]
+        values = {
+            pk: {
+                "id": pk, "total_detections": 0, "avg_confidence": None,
+                "total_distance_m": None, "max_speed_ms": None,
+                "avg_speed_ms": None, "sprint_count": None,
+            }
+            for pk in chunk
+        }
+
+        arrays = _load_detection_arrays(db, chunk)
+        if arrays is not None:
+            stats = compute_track_aggregates(*arrays, fps=fps)
+            for i, pk in enumerate(stats["track_id"].tolist()):
+                sprints = int(stats["sprint_count"][i])
+                values[pk].update({
+                    "total_detections": int(stats["total_detections"][i]),
+                    "avg_confidence": _nullable(stats["avg_confidence"][i]),
+                    "total_distance_m": _nullable(stats["total_distance_m"][i]),
+                    "max_speed_ms": _nullable(stats["max_speed_ms"][i]),
+                    "avg_speed_ms": _nullable(stats["avg_speed_ms"][i]),
+                    "sprint_count": sprints if sprints >= 0 else None,
+                })
+
+        db.execute(update(Track), list(values.values()))
+
+    bump_match_version(db, match_id)
+    db.commit()
+    return len(track_pks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute per-track aggregates from detections")
+    parser.add_argument("--match-id", type=int, action="append", help="Match to recompute (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Recompute every match")
+    args = parser.parse_args()
+
+    if not args.match_id and not args.all:
+        print("Please provide --match-id or --all")
+        return
+
+    db = SessionLocal()
+    try:
+        query = db.query(Match.id, Match.fps).order_by(Match.id)
+        if not args.all:
+            query = query.filter(Match.id.in_(args.match_id))
+        for match_id, fps in query.all():
+            count = update_track_aggregates(db, match_id, fps)
+            print(f"Match {match_id}: updated {count} tracks")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
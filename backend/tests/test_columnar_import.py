@@ -0,0 +1,91 @@
+"""
+Columnar import of a small match into the database from DATABASE_URL.
+
+The importer writes through PostgreSQL COPY, whose NULL handling is what
+these tests cover, so they are skipped unless DATABASE_URL points at a
+reachable PostgreSQL database with the schema created. The imported match
+and its teams are deleted afterwards.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal, engine
+from app.models.team import Match, Team
+from app.models.tracking import Track
+from scripts.columnar import columns_from_match_dict, write_match_columns
+from scripts.import_tracker_data import columnar_import_from_dir
+
+HOME_TEAM = "Columnar Import Test Home"
+AWAY_TEAM = "Columnar Import Test Away"
+
+
+def _point(frame_number: int) -> dict:
+    return {
+        "frame_number": frame_number,
+        "timestamp": frame_number / 25.0,
+        "bbox": {"x": 100 + frame_number, "y": 200, "width": 30, "height": 60},
+        "confidence": 0.9,
+        "pitch_x": None,
+        "pitch_y": None,
+    }
+
+
+def _match_data() -> dict:
+    return {
+        "home_team": {"name": HOME_TEAM},
+        "away_team": {"name": AWAY_TEAM},
+        "match_date": "2026-01-01",
+        "fps": 25.0,
+        "total_frames": 3,
+        "tracks": [
+            # tracker_v2 exports have no jersey number for most tracks
+            {"track_id": 1, "team": "home", "detection_class": "player", "jersey_number": None,
+             "points": [_point(0), _point(1), _point(2)]},
+            {"track_id": 2, "team": "away", "detection_class": "player", "jersey_number": 9,
+             "points": [_point(1), _point(2)]},
+        ],
+    }
+
+
+@pytest.fixture
+def db():
+    if engine.dialect.name != "postgresql":
+        pytest.skip("columnar imports are tested against PostgreSQL")
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1 FROM import_checkpoints LIMIT 1"))
+    except OperationalError:
+        pytest.skip("no PostgreSQL database with the schema at DATABASE_URL")
+    except Exception:
+        pytest.skip("database schema not created")
+
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    for team in session.query(Team).filter(Team.name.in_([HOME_TEAM, AWAY_TEAM])).all():
+        for match in session.query(Match).filter(
+            (Match.home_team_id == team.id) | (Match.away_team_id == team.id)
+        ).all():
+            session.delete(match)
+        session.flush()
+        session.delete(team)
+    session.commit()
+    session.close()
+
+
+def test_track_without_jersey_number(db, tmp_path):
+    header, arrays = columns_from_match_dict(_match_data())
+    match_dir = write_match_columns(tmp_path / "match", header, arrays)
+
+    match = columnar_import_from_dir(db, str(match_dir))
+
+    jerseys = dict(db.query(Track.track_id, Track.ai_jersey_number).filter(Track.match_id == match.id).all())
+    assert jerseys == {1: None, 2: 9}
+    counts = dict(db.query(Track.track_id, Track.total_detections).filter(Track.match_id == match.id).all())
+    assert counts == {1: 3, 2: 2}
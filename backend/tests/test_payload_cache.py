@@ -0,0 +1,84 @@
+"""
+Invalidation and generation checks of FramePayloadCache (app/payload_cache.py).
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.payload_cache import FramePayloadCache
+
+MATCH_ID = 1
+OTHER_MATCH_ID = 2
+
+
+def _cache_with_windows() -> FramePayloadCache:
+    cache = FramePayloadCache(max_bytes=1024)
+    for first, last in [(0, 99), (100, 199), (200, 299)]:
+        cache.put(MATCH_ID, ("window", first, last), b"x" * 10, first, last, cache.generation(MATCH_ID))
+    cache.put(OTHER_MATCH_ID, ("window", 0, 99), b"y" * 10, 0, 99, cache.generation(OTHER_MATCH_ID))
+    return cache
+
+
+def test_invalidate_drops_overlapping_ranges():
+    cache = _cache_with_windows()
+
+    cache.invalidate(MATCH_ID, 150, 210)
+
+    assert cache.get(MATCH_ID, ("window", 0, 99)) is not None
+    assert cache.get(MATCH_ID, ("window", 100, 199)) is None
+    assert cache.get(MATCH_ID, ("window", 200, 299)) is None
+    assert cache.get(OTHER_MATCH_ID, ("window", 0, 99)) is not None
+
+
+def test_invalidate_range_edges_are_inclusive():
+    cache = _cache_with_windows()
+
+    cache.invalidate(MATCH_ID, 99, 99)
+
+    assert cache.get(MATCH_ID, ("window", 0, 99)) is None
+    assert cache.get(MATCH_ID, ("window", 100, 199)) is not None
+
+
+def test_invalidate_whole_match():
+    cache = _cache_with_windows()
+
+    cache.invalidate(MATCH_ID)
+
+    for first, last in [(0, 99), (100, 199), (200, 299)]:
+        assert cache.get(MATCH_ID, ("window", first, last)) is None
+    assert cache.get(OTHER_MATCH_ID, ("window", 0, 99)) is not None
+
+
+def test_put_with_stale_generation_is_rejected():
+    cache = FramePayloadCache(max_bytes=1024)
+    generation = cache.generation(MATCH_ID)
+
+    # A write is committed and invalidated while the payload is being built
+    cache.invalidate(MATCH_ID, 10, 10)
+    cache.put(MATCH_ID, ("frame", 10), b"stale", 10, 10, generation)
+    assert cache.get(MATCH_ID, ("frame", 10)) is None
+
+    cache.put(MATCH_ID, ("frame", 10), b"fresh", 10, 10, cache.generation(MATCH_ID))
+    assert cache.get(MATCH_ID, ("frame", 10)) == b"fresh"
+
+
+def test_other_match_generation_is_independent():
+    cache = FramePayloadCache(max_bytes=1024)
+    generation = cache.generation(MATCH_ID)
+
+    cache.invalidate(OTHER_MATCH_ID)
+    cache.put(MATCH_ID, ("frame", 0), b"payload", 0, 0, generation)
+
+    assert cache.get(MATCH_ID, ("frame", 0)) == b"payload"
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = FramePayloadCache(max_bytes=25)
+    for frame_number in range(3):
+        cache.put(MATCH_ID, ("frame", frame_number), b"x" * 10, frame_number, frame_number,
+                  cache.generation(MATCH_ID))
+
+    assert cache.get(MATCH_ID, ("frame", 0)) is None
+    assert cache.get(MATCH_ID, ("frame", 1)) is not None
+    assert cache.get(MATCH_ID, ("frame", 2)) is not None
@@ -0,0 +1,96 @@
+"""
+MessagePack frame documents (app/wire_format.py) against the JSON frames
+built from the same rows.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.team import Match
+from app.models.tracking import DetectionClass, TeamSide
+from app.routers.detections import display_class, frames_from_rows, virtual_frame_row
+from app.wire_format import WIRE_FORMAT, pack_frames
+
+MATCH_ID = 7
+NO_DETECTION = (None,) * 12
+
+
+def _detection(detection_id, frame_id, track_id, x, detection_class, team):
+    return (detection_id, frame_id, track_id, x, 200.0, x + 30.0, 260.0, x + 15.0, 230.0, 0.75,
+            detection_class, team)
+
+
+def _rows():
+    match = Match(id=MATCH_ID, fps=25.0)
+    return [
+        (101, 10, 400, *_detection(1, 101, 5, 100.0, DetectionClass.PLAYER, TeamSide.HOME)),
+        (101, 10, 400, *_detection(2, 101, None, 300.0, DetectionClass.BALL, TeamSide.UNKNOWN)),
+        (102, 11, 440, *NO_DETECTION),
+        (103, 12, 480, *_detection(3, 103, 6, 500.0, DetectionClass.PLAYER, TeamSide.AWAY)),
+        virtual_frame_row(match, 13),
+    ]
+
+
+def _unpack(payload: bytes) -> dict:
+    return msgpack.unpackb(payload, raw=False)
+
+
+def test_frames_match_json():
+    rows = _rows()
+    doc = _unpack(pack_frames(rows, display_class, match_id=MATCH_ID, from_frame=10, to_frame=13))
+    frames = frames_from_rows(MATCH_ID, rows)
+
+    assert doc["format"] == WIRE_FORMAT
+    assert (doc["match_id"], doc["from_frame"], doc["to_frame"]) == (MATCH_ID, 10, 13)
+    columns = doc["frames"]
+    assert np.frombuffer(columns["id"], "<i4").tolist() == [f["id"] for f in frames] == [101, 102, 103, -1]
+    assert np.frombuffer(columns["frame_number"], "<i4").tolist() == [f["frame_number"] for f in frames]
+    assert np.frombuffer(columns["timestamp_ms"], "<i4").tolist() == [f["timestamp_ms"] for f in frames]
+
+    # Frames without detections (recorded or virtual) own an empty slice
+    offsets = np.frombuffer(columns["detection_offsets"], "<u4").tolist()
+    assert offsets == [0, 2, 2, 3, 3]
+    assert [offsets[i + 1] - offsets[i] for i in range(len(frames))] == [len(f["detections"]) for f in frames]
+
+
+def test_detections_match_json():
+    rows = _rows()
+    doc = _unpack(pack_frames(rows, display_class))
+    detections = doc["detections"]
+    expected = [d for frame in frames_from_rows(MATCH_ID, rows) for d in frame["detections"]]
+
+    assert np.frombuffer(detections["id"], "<i4").tolist() == [d["id"] for d in expected]
+    assert np.frombuffer(detections["frame_id"], "<i4").tolist() == [d["frame_id"] for d in expected]
+    assert np.frombuffer(detections["track_id"], "<i4").tolist() == [
+        -1 if d["track_id"] is None else d["track_id"] for d in expected
+    ]
+
+    bbox = np.frombuffer(detections["bbox"], "<f4").reshape(-1, 4)
+    assert bbox.tolist() == [[d["bbox"][k] for k in ("x1", "y1", "x2", "y2")] for d in expected]
+    center = np.frombuffer(detections["center"], "<f4").reshape(-1, 2)
+    assert center.tolist() == [[d["center_x"], d["center_y"]] for d in expected]
+    assert np.frombuffer(detections["confidence"], "<f4").tolist() == pytest.approx(
+        [d["confidence"] for d in expected]
+    )
+
+    class_codes = np.frombuffer(detections["class_code"], "<u1").tolist()
+    team_codes = np.frombuffer(detections["team_code"], "<u1").tolist()
+    assert [doc["class_names"][c] for c in class_codes] == [d["class_name"] for d in expected]
+    assert [doc["teams"][t] for t in team_codes] == [d["team"] for d in expected]
+
+
+def test_virtual_frame_only():
+    match = Match(id=MATCH_ID, fps=25.0)
+    doc = _unpack(pack_frames([virtual_frame_row(match, 50)], display_class, match_id=MATCH_ID))
+
+    assert np.frombuffer(doc["frames"]["id"], "<i4").tolist() == [-1]
+    assert np.frombuffer(doc["frames"]["frame_number"], "<i4").tolist() == [50]
+    assert np.frombuffer(doc["frames"]["timestamp_ms"], "<i4").tolist() == [2000]
+    assert np.frombuffer(doc["frames"]["detection_offsets"], "<u4").tolist() == [0, 0]
+    assert all(column == b"" for column in doc["detections"].values())
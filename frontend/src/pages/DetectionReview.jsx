@@ -369,7 +369,7 @@ export default function DetectionReview() {
   const token = localStorage.getItem('token');
   const apiUrl = import.meta.env.VITE_API_URL || 'http://localhost:8000';
   const imageUrl = currentFrame
-    ? `${apiUrl}/api/v1/matches/${matchId}/frame-by-number/${frameNumber}/image?token=${token}`
+    ? `${apiUrl}/api/v1/matches/${matchId}/frames/${frameNumber}/image?token=${token}`
     : null;
 
   console.log('[DetectionReview] Render - frameIndex:', currentFrameIndex, 'frameNumber:', frameNumber, 'detections:', frameData?.detections?.length);
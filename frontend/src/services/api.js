@@ -104,7 +104,7 @@ export const detectionsAPI = {
 
   getFrameImageUrl: (matchId, frameNumber) => {
     const token = localStorage.getItem('token');
-    return `${API_URL}/api/v1/matches/${matchId}/frame-by-number/${frameNumber}/image?token=${token}`;
+    return `${API_URL}/api/v1/matches/${matchId}/frames/${frameNumber}/image?token=${token}`;
   },
 
   updateDetection: async (detectionId, data) => {